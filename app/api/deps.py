@@ -4,22 +4,32 @@ from datetime import datetime, timezone
 
 from fastapi import Depends, HTTPException
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from sqlalchemy import select
-from sqlalchemy.orm import Session
-from typing import NamedTuple
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from typing import AsyncIterator, NamedTuple
 
-from app.core.database import SessionLocal
+from app.core import database
+from app.core.database import AsyncSessionLocal, SessionLocal
 from app.core import security
 from app.models import AuthSession
-from app.models.users import User
+from app.models.users import Role, User
+from app.services.session_cache import CachedSession, session_cache
 
 
 ALLOWED_ROLES = {"student", "lecturer", "admin"}
 auth_scheme = HTTPBearer(auto_error=False)
 
 
+class ActorUser(NamedTuple):
+    """Lightweight view of the authenticated user; carries no lazy ORM relationships."""
+
+    id: int
+    email: str
+    name: str
+
+
 class CurrentActor(NamedTuple):
-    user: User
+    user: ActorUser
     role: str
 
 
@@ -32,8 +42,78 @@ def get_db():
         db.close()
 
 
-def get_current_actor(
-    db: Session = Depends(get_db),
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    """Yield an asyncio database session tied to the request lifecycle."""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def get_read_db():
+    """Yield a session for read-only endpoints: the replica when configured and fresh enough, else the primary."""
+    factory = database.ReplicaSessionLocal if database.replica_monitor.replica_ok() else SessionLocal
+    db = factory()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_read_session_factory() -> async_sessionmaker[AsyncSession]:
+    """Pick the replica or primary async session factory for read-only work."""
+    if await database.replica_monitor.replica_ok_async():
+        return database.AsyncReplicaSessionLocal
+    return AsyncSessionLocal
+
+
+async def get_async_read_db(
+    factory: async_sessionmaker[AsyncSession] = Depends(get_async_read_session_factory),
+) -> AsyncIterator[AsyncSession]:
+    """Async counterpart of `get_read_db`; the auth session check always stays on the primary."""
+    async with factory() as db:
+        yield db
+
+
+async def _resolve_session(session_jti: str, user_id: int) -> CachedSession | None:
+    """Return the validated session for a JTI, consulting the in-process cache first.
+
+    On a miss the session, its user and the role are resolved in a single round trip on a
+    short-lived async session, so the connection is released before the route runs;
+    only live (unrevoked, unexpired) sessions owned by `user_id` produce a row.
+    """
+    cached = session_cache.get(session_jti)
+    if cached is not None:
+        return cached
+
+    stmt = (
+        select(AuthSession.expires_at, User.id, User.email, User.name, Role.code)
+        .join(User, User.id == AuthSession.user_id)
+        .join(Role, Role.id == User.role_id)
+        .where(
+            AuthSession.jti == session_jti,
+            AuthSession.user_id == user_id,
+            AuthSession.revoked_at.is_(None),
+            AuthSession.expires_at > func.now(),
+        )
+    )
+    async with AsyncSessionLocal() as db:
+        row = (await db.execute(stmt)).one_or_none()
+    if row is None:
+        return None
+
+    expires_at, resolved_user_id, email, name, role_code = row
+    entry = CachedSession(
+        user_id=resolved_user_id,
+        email=email,
+        name=name,
+        role=(role_code or "").lower(),
+        expires_at=expires_at,
+        revoked=False,
+    )
+    session_cache.put(session_jti, entry)
+    return entry
+
+
+async def get_current_actor(
     credentials: HTTPAuthorizationCredentials | None = Depends(auth_scheme),
 ) -> CurrentActor:
     """Resolve the current actor from a bearer access token."""
@@ -53,24 +133,21 @@ def get_current_actor(
     if not isinstance(session_jti, str):
         raise HTTPException(status_code=401, detail="Invalid token payload")
 
-    session = db.scalar(select(AuthSession).where(AuthSession.jti == session_jti))
+    entry = await _resolve_session(session_jti, user_id)
     now = datetime.now(timezone.utc)
     if (
-        session is None
-        or session.user_id != user_id
-        or session.revoked_at is not None
-        or session.expires_at <= now
+        entry is None
+        or entry.user_id != user_id
+        or entry.revoked
+        or entry.expires_at <= now
     ):
         raise HTTPException(status_code=401, detail="Invalid or expired session")
 
-    user = db.get(User, user_id)
-    if not user:
-        raise HTTPException(status_code=401, detail="User not found")
-
-    role = (getattr(user.role, "code", None) or "").lower()
+    role = entry.role
     if role not in ALLOWED_ROLES:
         raise HTTPException(status_code=403, detail="Role not permitted")
 
+    user = ActorUser(id=entry.user_id, email=entry.email, name=entry.name)
     return CurrentActor(user=user, role=role)
 
 
@@ -80,8 +157,8 @@ def require_admin(actor: CurrentActor = Depends(get_current_actor)) -> CurrentAc
     return actor
 
 
-def get_current_user(actor: CurrentActor = Depends(get_current_actor)) -> User:
-    """Compatibility helper where only the user object is needed."""
+def get_current_user(actor: CurrentActor = Depends(get_current_actor)) -> ActorUser:
+    """Compatibility helper where only the user record is needed."""
     return actor.user
 
 
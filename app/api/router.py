@@ -1,7 +1,9 @@
 from fastapi import APIRouter
 
 from app.api.routes import (
+    admin,
     auth,
+    calendar,
     fcm_tokens,
     groups,
     lessons,
@@ -28,6 +30,8 @@ api_router.include_router(subjects.router)
 api_router.include_router(rooms.router)
 api_router.include_router(lessons.router)
 api_router.include_router(plans.router)
+api_router.include_router(calendar.router)
 api_router.include_router(notifications.router)
 api_router.include_router(fcm_tokens.router)
 api_router.include_router(selections.router)
+api_router.include_router(admin.router)
@@ -0,0 +1,24 @@
+from fastapi import APIRouter, Depends
+
+from app.api import deps
+from app.core.database import pool_status
+from app.schemas.admin import AdminStats
+from app.services.calendar_service import feed_cache
+from app.services.next_lesson_service import next_lesson_index
+from app.services.timetable_cache import timetable_cache
+from app.services.session_cache import session_cache
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+
+@router.get("/stats", response_model=AdminStats)
+def read_stats(
+    _admin: deps.CurrentActor = Depends(deps.require_admin),
+):
+    return {
+        "session_cache": session_cache.stats(),
+        "calendar_cache": feed_cache.stats(),
+        "next_lesson_index": next_lesson_index.stats(),
+        "timetable_cache": timetable_cache.stats(),
+        "db_pools": pool_status(),
+    }
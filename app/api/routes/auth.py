@@ -64,4 +64,4 @@ def logout(
     db: Session = Depends(deps.get_db),
     actor: deps.CurrentActor = Depends(deps.get_current_actor),
 ):
-    auth_service.logout(db, actor.user, payload)
+    auth_service.logout(db, actor.user.id, payload)
@@ -0,0 +1,99 @@
+from email.utils import format_datetime, parsedate_to_datetime
+
+from fastapi import APIRouter, Depends, Header, Path, Query, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.api import deps
+from app.schemas.calendar import CalendarFeedToken
+from app.services import calendar_service, version_service
+from app.services.calendar_service import RenderedFeed
+from app.services.version_service import GROUP, LECTURER
+
+router = APIRouter(prefix="/calendar", tags=["calendar"])
+
+ICS_MEDIA_TYPE = "text/calendar; charset=utf-8"
+
+
+def _not_modified(feed: RenderedFeed, if_none_match: str | None, if_modified_since: str | None) -> bool:
+    """If-None-Match wins over If-Modified-Since when both are sent (RFC 9110 13.2.2)."""
+    if if_none_match:
+        return version_service.etag_matches(if_none_match, feed.etag)
+    if not if_modified_since:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    return since.tzinfo is not None and feed.last_modified <= since
+
+
+def _feed_response(feed: RenderedFeed, if_none_match: str | None, if_modified_since: str | None) -> Response:
+    headers = {
+        "ETag": feed.etag,
+        "Last-Modified": format_datetime(feed.last_modified, usegmt=True),
+        "Cache-Control": "private, no-cache",
+    }
+    if _not_modified(feed, if_none_match, if_modified_since):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=feed.body, media_type=ICS_MEDIA_TYPE, headers=headers)
+
+
+@router.post("/token", response_model=CalendarFeedToken, status_code=status.HTTP_201_CREATED)
+def issue_feed_token(
+    request: Request,
+    db: Session = Depends(deps.get_db),
+    actor: deps.CurrentActor = Depends(deps.get_current_actor),
+):
+    """Create or rotate the caller's feed token for `.ics` subscriptions."""
+    token = calendar_service.issue_feed_token(db, user_id=actor.user.id)
+    feed_url = request.url_for("read_my_calendar").include_query_params(token=token)
+    return {"token": token, "feed_url": str(feed_url)}
+
+
+@router.delete("/token", status_code=status.HTTP_204_NO_CONTENT)
+def revoke_feed_token(
+    db: Session = Depends(deps.get_db),
+    actor: deps.CurrentActor = Depends(deps.get_current_actor),
+):
+    calendar_service.revoke_feed_token(db, user_id=actor.user.id)
+
+
+@router.get("/me.ics", response_class=Response)
+async def read_my_calendar(
+    token: str = Query(..., description="Feed token from POST /calendar/token"),
+    if_none_match: str | None = Header(default=None),
+    if_modified_since: str | None = Header(default=None),
+    db: AsyncSession = Depends(deps.get_async_read_db),
+):
+    """The token owner's timetable: the selected group for students, own lessons otherwise."""
+    owner = await calendar_service.resolve_feed_token_async(db, token)
+    scope, entity_id = calendar_service.owner_scope(owner)
+    feed = await calendar_service.get_feed_async(db, scope=scope, entity_id=entity_id)
+    return _feed_response(feed, if_none_match, if_modified_since)
+
+
+@router.get("/groups/{group_id}.ics", response_class=Response)
+async def read_group_calendar(
+    group_id: int = Path(..., description="Group identifier"),
+    token: str = Query(..., description="Feed token from POST /calendar/token"),
+    if_none_match: str | None = Header(default=None),
+    if_modified_since: str | None = Header(default=None),
+    db: AsyncSession = Depends(deps.get_async_read_db),
+):
+    await calendar_service.resolve_feed_token_async(db, token)
+    feed = await calendar_service.get_feed_async(db, scope=GROUP, entity_id=group_id)
+    return _feed_response(feed, if_none_match, if_modified_since)
+
+
+@router.get("/lecturers/{lecturer_user_id}.ics", response_class=Response)
+async def read_lecturer_calendar(
+    lecturer_user_id: int = Path(..., description="Lecturer user identifier"),
+    token: str = Query(..., description="Feed token from POST /calendar/token"),
+    if_none_match: str | None = Header(default=None),
+    if_modified_since: str | None = Header(default=None),
+    db: AsyncSession = Depends(deps.get_async_read_db),
+):
+    await calendar_service.resolve_feed_token_async(db, token)
+    feed = await calendar_service.get_feed_async(db, scope=LECTURER, entity_id=lecturer_user_id)
+    return _feed_response(feed, if_none_match, if_modified_since)
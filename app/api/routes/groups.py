@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, Path, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.schemas.programs import Group, GroupCreate, GroupUpdate
@@ -9,15 +10,15 @@ router = APIRouter(prefix="/groups", tags=["groups"])
 
 
 @router.get("", response_model=list[Group])
-def list_groups(
+async def list_groups(
     program_id: int | None = Query(default=None),
     program_year_id: int | None = Query(default=None),
     specialization_id: int | None = Query(default=None),
     group_type: str | None = Query(default=None),
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_read_db),
     _actor: deps.CurrentActor = Depends(deps.get_current_actor),
 ):
-    return program_service.list_groups(
+    return await program_service.list_groups_async(
         db,
         program_id=program_id,
         program_year_id=program_year_id,
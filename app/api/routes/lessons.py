@@ -1,26 +1,249 @@
-from datetime import datetime
+from datetime import datetime, time, timedelta
 
-from fastapi import APIRouter, Depends, HTTPException, Path, Query, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Path, Query, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from sqlalchemy.orm import Session
 
 from app.api import deps
-from app.schemas.lessons import Lesson, LessonCreate, LessonSeriesCreate, LessonUpdate
-from app.services import lesson_service
+from app.core.config import get_settings
+from app.schemas.lessons import (
+    FreeSlot,
+    Lesson,
+    LessonBulkCreate,
+    LessonBulkResult,
+    LessonChanges,
+    LessonCompact,
+    LessonCreate,
+    LessonMaterialize,
+    LessonRecurrence,
+    LessonRecurrenceCreate,
+    LessonScope,
+    LessonSeriesConflictReport,
+    LessonSeriesCreate,
+    LessonUpdate,
+)
+from app.services import (
+    lesson_service,
+    next_lesson_service,
+    recurrence_service,
+    slot_service,
+    timetable_cache,
+    version_service,
+)
 from app.models.selections import StudentGroupSelection
 
 router = APIRouter(prefix="/lessons", tags=["lessons"])
 
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
 
 @router.get("", response_model=list[Lesson])
-def list_lessons(
+async def list_lessons(
+    response: Response,
     group_id: int | None = Query(default=None, description="Filter by group"),
+    lecturer_user_id: int | None = Query(default=None, description="Filter by lecturer"),
     date_from: datetime | None = Query(default=None, description="Start date filter"),
     date_to: datetime | None = Query(default=None, description="End date filter"),
-    db: Session = Depends(deps.get_db),
+    limit: int | None = Query(
+        default=None,
+        ge=1,
+        le=MAX_PAGE_SIZE,
+        description="Page size; enables keyset pagination ordered by (starts_at, id)",
+    ),
+    cursor: str | None = Query(
+        default=None, description="Opaque cursor from the X-Next-Cursor header of the previous page"
+    ),
+    if_none_match: str | None = Header(default=None),
+    db: AsyncSession = Depends(deps.get_async_read_db),
+    primary_db: AsyncSession = Depends(deps.get_async_db),
     _actor: deps.CurrentActor = Depends(deps.get_current_actor),
 ):
-    return lesson_service.list_lessons(db, group_id=group_id, date_from=date_from, date_to=date_to)
+    page_size = None
+    if limit is not None or cursor is not None:
+        page_size = limit or DEFAULT_PAGE_SIZE
+    fast_path = get_settings().lessons_json_fast_path
+
+    # Group/lecturer-scoped reads carry a strong ETag derived from data versions, so polling
+    # clients get a 304 without the lesson query running at all.
+    etag = await version_service.timetable_etag_async(
+        db,
+        group_id=group_id,
+        lecturer_user_id=lecturer_user_id,
+        date_from=date_from,
+        date_to=date_to,
+        limit=page_size,
+        cursor=cursor,
+        fast_path=fast_path,
+    )
+    headers: dict[str, str] = {}
+    if etag:
+        headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+        if version_service.etag_matches(if_none_match, etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    if (
+        group_id is not None
+        and lecturer_user_id is None
+        and page_size is None
+        and timetable_cache.covers(date_from, date_to)
+    ):
+        # Every student of a group asks for the same weeks: serve them from the week cache.
+        body = await lesson_service.list_group_lessons_cached_async(
+            primary_db, group_id=group_id, date_from=date_from, date_to=date_to
+        )
+        return Response(content=body, media_type="application/json", headers=headers)
+
+    if fast_path:
+        # Pre-encoded JSON built in Postgres; same shape as `list[Lesson]`.
+        body, next_cursor = await lesson_service.list_lessons_json_async(
+            db,
+            limit=page_size,
+            cursor=cursor,
+            group_id=group_id,
+            lecturer_user_id=lecturer_user_id,
+            date_from=date_from,
+            date_to=date_to,
+        )
+        if next_cursor:
+            headers["X-Next-Cursor"] = next_cursor
+        return Response(content=body, media_type="application/json", headers=headers)
+
+    response.headers.update(headers)
+    if page_size is None:
+        return await lesson_service.list_lessons_async(
+            db,
+            group_id=group_id,
+            lecturer_user_id=lecturer_user_id,
+            date_from=date_from,
+            date_to=date_to,
+        )
+
+    lessons, next_cursor = await lesson_service.list_lessons_page_async(
+        db,
+        limit=page_size,
+        cursor=cursor,
+        group_id=group_id,
+        lecturer_user_id=lecturer_user_id,
+        date_from=date_from,
+        date_to=date_to,
+    )
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return lessons
+
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_lessons(
+    group_id: int | None = Query(default=None, description="Filter by group"),
+    date_from: datetime | None = Query(default=None, description="Start date filter"),
+    date_to: datetime | None = Query(default=None, description="End date filter"),
+    session_factory: async_sessionmaker[AsyncSession] = Depends(deps.get_async_read_session_factory),
+    _actor: deps.CurrentActor = Depends(deps.get_current_actor),
+):
+    """Stream every matching lesson as newline-delimited JSON (one `Lesson` object per line)."""
+    return StreamingResponse(
+        lesson_service.stream_lessons_ndjson(
+            session_factory, group_id=group_id, date_from=date_from, date_to=date_to
+        ),
+        media_type="application/x-ndjson",
+    )
+
+
+@router.get("/me", response_model=list[LessonCompact])
+async def list_my_lessons(
+    date_from: datetime | None = Query(default=None, description="Start date filter"),
+    date_to: datetime | None = Query(default=None, description="End date filter"),
+    db: AsyncSession = Depends(deps.get_async_read_db),
+    actor: deps.CurrentActor = Depends(deps.get_current_actor),
+):
+    """The caller's timetable: the selected group for students, own lessons for lecturers."""
+    return await lesson_service.list_my_lessons_async(
+        db, user_id=actor.user.id, role=actor.role, date_from=date_from, date_to=date_to
+    )
+
+
+@router.get("/me/next", response_model=LessonCompact | None)
+async def read_my_next_lesson(
+    db: AsyncSession = Depends(deps.get_async_db),
+    actor: deps.CurrentActor = Depends(deps.get_current_actor),
+):
+    """The caller's next non-cancelled lesson (or null), answered from memory when warm."""
+    return await next_lesson_service.get_next_lesson_async(
+        db, user_id=actor.user.id, role=actor.role
+    )
+
+
+@router.get("/changes", response_model=LessonChanges)
+async def list_lesson_changes(
+    since: str | None = Query(
+        default=None,
+        description="Cursor from a previous response; omit to get the current head cursor only",
+    ),
+    group_id: int | None = Query(default=None, description="Changes for this group"),
+    lecturer_user_id: int | None = Query(default=None, description="Changes for this lecturer"),
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(deps.get_async_read_db),
+    _actor: deps.CurrentActor = Depends(deps.get_current_actor),
+):
+    """Lessons created, updated or deleted since a cursor, for incremental client sync."""
+    if group_id is None and lecturer_user_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="group_id or lecturer_user_id is required",
+        )
+    return await lesson_service.list_lesson_changes_async(
+        db, cursor=since, group_id=group_id, lecturer_user_id=lecturer_user_id, limit=limit
+    )
+
+
+@router.get("/free-slots", response_model=list[FreeSlot])
+async def list_free_slots(
+    group_id: int = Query(..., description="Group that attends the lesson"),
+    date_from: datetime = Query(..., description="Start of the search range"),
+    date_to: datetime = Query(..., description="End of the search range (at most 31 days later)"),
+    lecturer_user_id: int | None = Query(
+        default=None, description="Lecturer; defaults to the calling lecturer"
+    ),
+    duration_minutes: int = Query(default=90, ge=15, le=600, description="Slot length"),
+    limit: int = Query(default=5, ge=1, le=50, description="Number of slots to return"),
+    min_capacity: int | None = Query(default=None, ge=1, description="Minimum room size"),
+    building: str | None = Query(default=None, description="Only rooms in this building"),
+    exclude_lesson_id: int | None = Query(
+        default=None, description="Lesson being rescheduled; its current slot counts as free"
+    ),
+    day_start: time = Query(default=slot_service.DEFAULT_DAY_START, description="Earliest start"),
+    day_end: time = Query(default=slot_service.DEFAULT_DAY_END, description="Latest end"),
+    include_weekends: bool = Query(default=False),
+    db: AsyncSession = Depends(deps.get_async_read_db),
+    actor: deps.CurrentActor = Depends(deps.get_current_actor),
+):
+    """Earliest non-overlapping slots where the lecturer, the group and a room are all free."""
+    if actor.role == "student":
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
+    if lecturer_user_id is None and actor.role == "lecturer":
+        lecturer_user_id = actor.user.id
+    if lecturer_user_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="lecturer_user_id is required"
+        )
+    return await slot_service.find_free_slots_async(
+        db,
+        lecturer_user_id=lecturer_user_id,
+        group_id=group_id,
+        date_from=date_from,
+        date_to=date_to,
+        duration=timedelta(minutes=duration_minutes),
+        limit=limit,
+        min_capacity=min_capacity,
+        building=building,
+        exclude_lesson_id=exclude_lesson_id,
+        day_start=day_start,
+        day_end=day_end,
+        include_weekends=include_weekends,
+    )
 
 
 @router.post("", response_model=Lesson, status_code=status.HTTP_201_CREATED)
@@ -38,9 +261,15 @@ def create_lesson(
     )
 
 
-@router.post("/series", response_model=list[Lesson], status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/series",
+    response_model=list[Lesson] | LessonSeriesConflictReport,
+    status_code=status.HTTP_201_CREATED,
+)
 def create_lesson_series(
     payload: LessonSeriesCreate,
+    response: Response,
+    dry_run: bool = Query(False, description="Only report conflicts of every occurrence"),
     db: Session = Depends(deps.get_db),
     actor: deps.CurrentActor = Depends(deps.get_current_actor),
 ):
@@ -50,6 +279,24 @@ def create_lesson_series(
     if actor.role == "lecturer" and base.lecturer_user_id != actor.user.id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
 
+    if dry_run:
+        response.status_code = status.HTTP_200_OK
+        return lesson_service.preview_lesson_series_conflicts(
+            db,
+            base.model_dump(),
+            occurrences=payload.occurrences,
+            repeat_every_days=payload.repeat_every_days,
+        )
+
+    if not payload.materialize:
+        rule = lesson_service.create_lesson_recurrence(
+            db,
+            base.model_dump(),
+            interval_days=payload.repeat_every_days,
+            count=payload.occurrences,
+            actor_user_id=actor.user.id,
+        )
+        return recurrence_service.expand(rule)
     return lesson_service.create_lesson_series(
         db,
         base.model_dump(),
@@ -59,6 +306,95 @@ def create_lesson_series(
     )
 
 
+@router.post(
+    "/recurrences", response_model=LessonRecurrence, status_code=status.HTTP_201_CREATED
+)
+def create_lesson_recurrence(
+    payload: LessonRecurrenceCreate,
+    db: Session = Depends(deps.get_db),
+    actor: deps.CurrentActor = Depends(deps.get_current_actor),
+):
+    """Store a recurring lesson as a rule; its occurrences are expanded when lessons are read."""
+    base = payload.lesson
+    if actor.role == "student":
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
+    if actor.role == "lecturer" and base.lecturer_user_id != actor.user.id:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
+    return lesson_service.create_lesson_recurrence(
+        db,
+        base.model_dump(),
+        interval_days=payload.interval_days,
+        count=payload.count,
+        until=payload.until,
+        exdates=payload.exdates,
+        actor_user_id=actor.user.id,
+    )
+
+
+@router.get("/recurrences/{recurrence_id}", response_model=LessonRecurrence)
+def read_lesson_recurrence(
+    recurrence_id: int = Path(..., description="Recurrence identifier"),
+    db: Session = Depends(deps.get_read_db),
+    _actor: deps.CurrentActor = Depends(deps.get_current_actor),
+):
+    return recurrence_service.get_recurrence(db, recurrence_id)
+
+
+@router.post(
+    "/recurrences/{recurrence_id}/materialize",
+    response_model=Lesson,
+    status_code=status.HTTP_201_CREATED,
+)
+def materialize_lesson_occurrence(
+    payload: LessonMaterialize,
+    recurrence_id: int = Path(..., description="Recurrence identifier"),
+    db: Session = Depends(deps.get_db),
+    actor: deps.CurrentActor = Depends(deps.get_current_actor),
+):
+    """Store one occurrence as a regular lesson so it can be edited or deleted on its own."""
+    rule = recurrence_service.get_recurrence(db, recurrence_id)
+    if actor.role == "student":
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
+    if actor.role == "lecturer" and rule.lecturer_user_id != actor.user.id:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
+    return lesson_service.materialize_occurrence(
+        db, recurrence_id, payload.starts_at, actor_user_id=actor.user.id
+    )
+
+
+@router.delete("/recurrences/{recurrence_id}", status_code=status.HTTP_204_NO_CONTENT)
+def delete_lesson_recurrence(
+    recurrence_id: int = Path(..., description="Recurrence identifier"),
+    db: Session = Depends(deps.get_db),
+    actor: deps.CurrentActor = Depends(deps.get_current_actor),
+):
+    """Delete the rule and its remaining virtual occurrences; materialized lessons stay."""
+    rule = recurrence_service.get_recurrence(db, recurrence_id)
+    if actor.role == "student":
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
+    if actor.role == "lecturer" and rule.lecturer_user_id != actor.user.id:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
+    lesson_service.delete_lesson_recurrence(db, recurrence_id, actor_user_id=actor.user.id)
+
+
+@router.post("/bulk", response_model=LessonBulkResult)
+def create_lessons_bulk(
+    payload: LessonBulkCreate,
+    db: Session = Depends(deps.get_db),
+    actor: deps.CurrentActor = Depends(deps.get_current_actor),
+):
+    """Create many lessons at once; rows that fail validation are reported in `errors` and skipped."""
+    if actor.role == "student":
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
+    lesson_ids, errors = lesson_service.create_lessons_bulk(
+        db,
+        [lesson.model_dump() for lesson in payload.lessons],
+        actor_user_id=actor.user.id,
+        lecturer_user_id=actor.user.id if actor.role == "lecturer" else None,
+    )
+    return {"created": len(lesson_ids), "lesson_ids": lesson_ids, "errors": errors}
+
+
 @router.get("/{lesson_id}", response_model=Lesson)
 def read_lesson(
     lesson_id: int = Path(..., description="Lesson identifier"),
@@ -76,7 +412,9 @@ def update_lesson(
     actor: deps.CurrentActor = Depends(deps.get_current_actor),
 ):
     data = payload.model_dump(exclude_unset=True)
+    scope = data.pop("scope", None) or LessonScope.occurrence
     lesson = lesson_service.get_lesson(db, lesson_id)
+    series_lecturer_id = None
 
     if actor.role == "student":
         selection = db.execute(
@@ -87,8 +425,7 @@ def update_lesson(
         ).scalar_one_or_none()
         if selection is None:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
-        scope = data.pop("scope", "occurrence")
-        if scope != "occurrence":
+        if scope != LessonScope.occurrence:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
         allowed_fields = {"starts_at", "ends_at", "status", "room_id"}
         disallowed = set(data.keys()) - allowed_fields
@@ -100,16 +437,27 @@ def update_lesson(
         forbidden_identity_fields = {"lecturer_user_id", "group_id", "subject_id"}
         if forbidden_identity_fields.intersection(data):
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
-        data.pop("scope", None)
-    else:
-        data.pop("scope", None)
+        series_lecturer_id = actor.user.id
 
+    if scope != LessonScope.occurrence:
+        return lesson_service.update_lesson_series(
+            db,
+            lesson_id,
+            data,
+            scope=scope.value,
+            actor_user_id=actor.user.id,
+            lecturer_user_id=series_lecturer_id,
+        )
     return lesson_service.update_lesson(db, lesson_id, data, actor_user_id=actor.user.id)
 
 
 @router.delete("/{lesson_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_lesson(
     lesson_id: int = Path(..., description="Lesson identifier"),
+    scope: LessonScope = Query(
+        default=LessonScope.occurrence,
+        description="occurrence, following (this and later lessons of the series) or series",
+    ),
     db: Session = Depends(deps.get_db),
     actor: deps.CurrentActor = Depends(deps.get_current_actor),
 ):
@@ -118,4 +466,13 @@ def delete_lesson(
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
     if actor.role == "lecturer" and lesson.lecturer_user_id != actor.user.id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
+    if scope != LessonScope.occurrence:
+        lesson_service.delete_lesson_series(
+            db,
+            lesson_id,
+            scope=scope.value,
+            actor_user_id=actor.user.id,
+            lecturer_user_id=actor.user.id if actor.role == "lecturer" else None,
+        )
+        return
     lesson_service.delete_lesson(db, lesson_id, actor_user_id=actor.user.id)
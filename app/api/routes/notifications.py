@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, Path, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.schemas.notifications import (
@@ -17,7 +18,7 @@ router = APIRouter(prefix="/notifications", tags=["notifications"])
 
 
 @router.get("", response_model=list[Notification])
-def list_notifications(
+async def list_notifications(
     user_id: int | None = Query(default=None, description="Filter by user id"),
     delivery_status: str | None = Query(default=None, description="Filter by delivery status"),
     read_status: str | None = Query(default=None, description="Filter by read status"),
@@ -26,12 +27,12 @@ def list_notifications(
         description="Deprecated: legacy status filter (uses delivery status)",
         include_in_schema=False,
     ),
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_read_db),
     actor: deps.CurrentActor = Depends(deps.get_current_actor),
 ):
     target_id = deps.resolve_user_scope(actor, user_id)
     effective_delivery = delivery_status or status
-    return notification_service.list_notifications(
+    return await notification_service.list_notifications_async(
         db,
         user_id=target_id,
         delivery_status=effective_delivery,
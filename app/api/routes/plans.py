@@ -15,7 +15,7 @@ def download_lecturer_plan(
     lecturer_user_id: int = Query(..., description="Lecturer user identifier"),
     date_from: date = Query(..., description="Start date (YYYY-MM-DD)"),
     date_to: date = Query(..., description="End date (YYYY-MM-DD)"),
-    db: Session = Depends(deps.get_db),
+    db: Session = Depends(deps.get_read_db),
     _actor: deps.CurrentActor = Depends(deps.get_current_actor),
 ):
     start_at, end_at = plan_service.get_week_window(date_from, date_to)
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, Path
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.schemas.programs import ProgramYear, ProgramYearCreate, ProgramYearUpdate
@@ -9,11 +10,11 @@ router = APIRouter(prefix="/program-years", tags=["program-years"])
 
 
 @router.get("", response_model=list[ProgramYear])
-def list_program_years(
-    db: Session = Depends(deps.get_db),
+async def list_program_years(
+    db: AsyncSession = Depends(deps.get_async_read_db),
     _actor: deps.CurrentActor = Depends(deps.get_current_actor),
 ):
-    return program_service.list_program_years(db)
+    return await program_service.list_program_years_async(db)
 
 
 @router.get("/{year_id}", response_model=ProgramYear)
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, Path, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.schemas.programs import (
@@ -15,11 +16,11 @@ router = APIRouter(prefix="/programs", tags=["programs"])
 
 
 @router.get("", response_model=list[Program])
-def list_programs(
-    db: Session = Depends(deps.get_db),
+async def list_programs(
+    db: AsyncSession = Depends(deps.get_async_read_db),
     _actor: deps.CurrentActor = Depends(deps.get_current_actor),
 ):
-    return program_service.list_programs(db)
+    return await program_service.list_programs_async(db)
 
 
 @router.get("/{program_id}", response_model=Program)
@@ -62,15 +63,15 @@ def delete_program(
 
 
 @router.get("/{program_id}/groups", response_model=list[Group])
-def list_program_groups(
+async def list_program_groups(
     program_id: int = Path(..., description="Program identifier"),
     program_year_id: int | None = Query(default=None, description="Filter by program year"),
     specialization_id: int | None = Query(default=None, description="Filter by specialization"),
     group_type: str | None = Query(default=None, description="Filter by group type"),
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_read_db),
     _actor: deps.CurrentActor = Depends(deps.get_current_actor),
 ):
-    return program_service.list_groups(
+    return await program_service.list_groups_async(
         db,
         program_id=program_id,
         program_year_id=program_year_id,
@@ -1,4 +1,7 @@
-from fastapi import APIRouter, Depends, Path
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, Path, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.api import deps
@@ -9,11 +12,29 @@ router = APIRouter(prefix="/rooms", tags=["rooms"])
 
 
 @router.get("", response_model=list[Room])
-def list_rooms(
-    db: Session = Depends(deps.get_db),
+async def list_rooms(
+    db: AsyncSession = Depends(deps.get_async_read_db),
+    _actor: deps.CurrentActor = Depends(deps.get_current_actor),
+):
+    return await catalog_service.list_rooms_async(db)
+
+
+@router.get("/available", response_model=list[Room])
+async def list_available_rooms(
+    starts_at: datetime = Query(..., description="Start of the requested slot"),
+    ends_at: datetime = Query(..., description="End of the requested slot (exclusive)"),
+    min_capacity: int | None = Query(None, ge=1, description="Minimum number of seats"),
+    building: str | None = Query(None, description="Only rooms in this building"),
+    db: AsyncSession = Depends(deps.get_async_read_db),
     _actor: deps.CurrentActor = Depends(deps.get_current_actor),
 ):
-    return catalog_service.list_rooms(db)
+    return await catalog_service.list_available_rooms_async(
+        db,
+        starts_at=starts_at,
+        ends_at=ends_at,
+        min_capacity=min_capacity,
+        building=building,
+    )
 
 
 @router.get("/{room_id}", response_model=Room)
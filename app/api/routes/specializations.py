@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, Path
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.schemas.programs import Specialization, SpecializationCreate, SpecializationUpdate
@@ -9,11 +10,11 @@ router = APIRouter(prefix="/specializations", tags=["specializations"])
 
 
 @router.get("", response_model=list[Specialization])
-def list_specializations(
-    db: Session = Depends(deps.get_db),
+async def list_specializations(
+    db: AsyncSession = Depends(deps.get_async_read_db),
     _actor: deps.CurrentActor = Depends(deps.get_current_actor),
 ):
-    return program_service.list_specializations(db)
+    return await program_service.list_specializations_async(db)
 
 
 @router.get("/{spec_id}", response_model=Specialization)
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, Path
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.api import deps
@@ -9,11 +10,11 @@ router = APIRouter(prefix="/subjects", tags=["subjects"])
 
 
 @router.get("", response_model=list[Subject])
-def list_subjects(
-    db: Session = Depends(deps.get_db),
+async def list_subjects(
+    db: AsyncSession = Depends(deps.get_async_read_db),
     _actor: deps.CurrentActor = Depends(deps.get_current_actor),
 ):
-    return catalog_service.list_subjects(db)
+    return await catalog_service.list_subjects_async(db)
 
 
 @router.get("/{subject_id}", response_model=Subject)
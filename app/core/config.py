@@ -13,6 +13,31 @@ class Settings(BaseSettings):
     db_name: str = Field("ab_planner", alias="POSTGRES_DB")
     db_user: str = Field("postgres", alias="POSTGRES_USER")
     db_password: str = Field("change_me", alias="POSTGRES_PASSWORD")
+    db_replica_host: str = Field("", alias="POSTGRES_REPLICA_HOST")
+    db_replica_port: int | None = Field(None, alias="POSTGRES_REPLICA_PORT")
+    db_replica_max_lag_seconds: float = Field(5.0, alias="DB_REPLICA_MAX_LAG_SECONDS")
+    db_replica_lag_check_seconds: float = Field(5.0, alias="DB_REPLICA_LAG_CHECK_SECONDS")
+    db_pool_size: int = Field(10, alias="DB_POOL_SIZE")
+    db_max_overflow: int = Field(10, alias="DB_MAX_OVERFLOW")
+    db_pool_timeout: float = Field(30.0, alias="DB_POOL_TIMEOUT")
+    db_pool_recycle: int = Field(1800, alias="DB_POOL_RECYCLE")
+    db_pool_pre_ping: bool = Field(True, alias="DB_POOL_PRE_PING")
+    db_statement_timeout_ms: int = Field(30000, alias="DB_STATEMENT_TIMEOUT_MS")
+    db_worker_pool_size: int = Field(2, alias="DB_WORKER_POOL_SIZE")
+    db_worker_max_overflow: int = Field(0, alias="DB_WORKER_MAX_OVERFLOW")
+
+    lessons_json_fast_path: bool = Field(True, alias="LESSONS_JSON_FAST_PATH")
+    lesson_overlap_constraints: bool = Field(False, alias="LESSON_OVERLAP_CONSTRAINTS")
+
+    lesson_changes_retention_days: int = Field(30, alias="LESSON_CHANGES_RETENTION_DAYS")
+
+    timetable_cache_max_bytes: int = Field(64 * 1024 * 1024, alias="TIMETABLE_CACHE_MAX_BYTES")
+    next_lesson_index_size: int = Field(20000, alias="NEXT_LESSON_INDEX_SIZE")
+    cache_invalidation_bus: bool = Field(True, alias="CACHE_INVALIDATION_BUS")
+
+    calendar_feed_past_days: int = Field(30, alias="CALENDAR_FEED_PAST_DAYS")
+    calendar_feed_future_days: int = Field(180, alias="CALENDAR_FEED_FUTURE_DAYS")
+    calendar_feed_cache_size: int = Field(500, alias="CALENDAR_FEED_CACHE_SIZE")
 
     ms_client_id: str = Field("change_me", alias="MS_CLIENT_ID")
     ms_client_secret: str = Field("change_me", alias="MS_CLIENT_SECRET")
@@ -25,6 +50,8 @@ class Settings(BaseSettings):
     auth_access_token_exp_minutes: int = Field(60, alias="AUTH_ACCESS_TOKEN_EXPIRES_MINUTES")
     auth_refresh_token_exp_minutes: int = Field(60 * 24 * 30, alias="AUTH_REFRESH_TOKEN_EXPIRES_MINUTES")
     auth_default_role_code: str = Field("student", alias="AUTH_DEFAULT_ROLE")
+    auth_session_cache_size: int = Field(10000, alias="AUTH_SESSION_CACHE_SIZE")
+    auth_session_cache_ttl_seconds: int = Field(30, alias="AUTH_SESSION_CACHE_TTL_SECONDS")
 
     fcm_server_key: str = Field("", alias="FCM_SERVER_KEY")
     fcm_sender_id: str = Field("", alias="FCM_SENDER_ID")
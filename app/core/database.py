@@ -1,10 +1,17 @@
+import threading
+import time
 from contextlib import asynccontextmanager
-from sqlalchemy import text
+from typing import Any
+
+from sqlalchemy import exc, text
 from sqlalchemy.engine import URL, create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 from fastapi import FastAPI
 
 from app.core.config import get_settings
+from app.core.metrics import pool_metrics
 
 settings = get_settings()
 
@@ -32,5 +39,198 @@ TARGET_URL = URL.create(
     port=settings.db_port,
     database=settings.db_name
 )
-engine = create_engine(TARGET_URL, future=True)
-SessionLocal = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
\ No newline at end of file
+
+
+class _CheckoutTimingMixin:
+    """Report how long each connection checkout waited (including connect time for new connections)."""
+
+    metrics_name = "default"
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            pool_metrics.observe(self.metrics_name, time.perf_counter() - started, timed_out=True)
+            raise
+        pool_metrics.observe(self.metrics_name, time.perf_counter() - started)
+        return connection
+
+
+def _timed_pool(base: type, name: str) -> type:
+    return type(f"Timed{base.__name__}", (_CheckoutTimingMixin, base), {"metrics_name": name})
+
+
+def _pool_options(*, pool_size: int, max_overflow: int) -> dict[str, Any]:
+    return {
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+
+
+def _sync_connect_args() -> dict[str, Any]:
+    if settings.db_statement_timeout_ms <= 0:
+        return {}
+    return {"options": f"-c statement_timeout={settings.db_statement_timeout_ms}"}
+
+
+def _async_connect_args() -> dict[str, Any]:
+    if settings.db_statement_timeout_ms <= 0:
+        return {}
+    return {"server_settings": {"statement_timeout": str(settings.db_statement_timeout_ms)}}
+
+
+engine = create_engine(
+    TARGET_URL,
+    future=True,
+    poolclass=_timed_pool(QueuePool, "api"),
+    connect_args=_sync_connect_args(),
+    **_pool_options(pool_size=settings.db_pool_size, max_overflow=settings.db_max_overflow),
+)
+SessionLocal = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+
+# Dedicated small pool for the outbox sender and cleanup jobs so slow batches never starve API requests.
+worker_engine = create_engine(
+    TARGET_URL,
+    future=True,
+    poolclass=_timed_pool(QueuePool, "worker"),
+    connect_args=_sync_connect_args(),
+    **_pool_options(
+        pool_size=settings.db_worker_pool_size, max_overflow=settings.db_worker_max_overflow
+    ),
+)
+WorkerSessionLocal = sessionmaker(bind=worker_engine, autoflush=False, expire_on_commit=False)
+
+# Native asyncio path (asyncpg) for hot read endpoints, so they do not occupy threadpool workers.
+ASYNC_TARGET_URL = TARGET_URL.set(drivername="postgresql+asyncpg")
+async_engine = create_async_engine(
+    ASYNC_TARGET_URL,
+    poolclass=_timed_pool(AsyncAdaptedQueuePool, "api_async"),
+    connect_args=_async_connect_args(),
+    **_pool_options(pool_size=settings.db_pool_size, max_overflow=settings.db_max_overflow),
+)
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+# Optional streaming replica for read-only endpoints; None when POSTGRES_REPLICA_HOST is unset.
+replica_engine = None
+ReplicaSessionLocal = None
+async_replica_engine = None
+AsyncReplicaSessionLocal = None
+if settings.db_replica_host:
+    REPLICA_URL = TARGET_URL.set(
+        host=settings.db_replica_host,
+        port=settings.db_replica_port or settings.db_port,
+    )
+    replica_engine = create_engine(
+        REPLICA_URL,
+        future=True,
+        poolclass=_timed_pool(QueuePool, "replica"),
+        connect_args=_sync_connect_args(),
+        **_pool_options(pool_size=settings.db_pool_size, max_overflow=settings.db_max_overflow),
+    )
+    ReplicaSessionLocal = sessionmaker(bind=replica_engine, autoflush=False, expire_on_commit=False)
+    async_replica_engine = create_async_engine(
+        REPLICA_URL.set(drivername="postgresql+asyncpg"),
+        poolclass=_timed_pool(AsyncAdaptedQueuePool, "replica_async"),
+        connect_args=_async_connect_args(),
+        **_pool_options(pool_size=settings.db_pool_size, max_overflow=settings.db_max_overflow),
+    )
+    AsyncReplicaSessionLocal = async_sessionmaker(
+        bind=async_replica_engine, autoflush=False, expire_on_commit=False
+    )
+
+
+REPLICA_LAG_SQL = text(
+    """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+    END
+    """
+)
+
+
+class ReplicaLagMonitor:
+    """Decide whether reads may go to the replica, re-probing its replay lag at most every few seconds.
+
+    An unreachable replica or an unknown lag counts as unhealthy, so reads fall back to the primary.
+    """
+
+    def __init__(self, *, max_lag_seconds: float, check_interval_seconds: float) -> None:
+        self._max_lag_seconds = max_lag_seconds
+        self._check_interval_seconds = check_interval_seconds
+        self._lock = threading.Lock()
+        self._next_check_at = 0.0
+        self._healthy = False
+        self.last_lag_seconds: float | None = None
+
+    def _claim_probe(self) -> bool:
+        """Return True for exactly one caller once the cached verdict has gone stale."""
+        now = time.monotonic()
+        with self._lock:
+            if now < self._next_check_at:
+                return False
+            self._next_check_at = now + self._check_interval_seconds
+            return True
+
+    def _record(self, lag: float | None) -> bool:
+        with self._lock:
+            self.last_lag_seconds = float(lag) if lag is not None else None
+            self._healthy = lag is not None and float(lag) <= self._max_lag_seconds
+            return self._healthy
+
+    def replica_ok(self) -> bool:
+        if replica_engine is None:
+            return False
+        if not self._claim_probe():
+            return self._healthy
+        try:
+            with replica_engine.connect() as conn:
+                lag = conn.scalar(REPLICA_LAG_SQL)
+        except exc.SQLAlchemyError:
+            lag = None
+        return self._record(lag)
+
+    async def replica_ok_async(self) -> bool:
+        if async_replica_engine is None:
+            return False
+        if not self._claim_probe():
+            return self._healthy
+        try:
+            async with async_replica_engine.connect() as conn:
+                lag = await conn.scalar(REPLICA_LAG_SQL)
+        except exc.SQLAlchemyError:
+            lag = None
+        return self._record(lag)
+
+
+replica_monitor = ReplicaLagMonitor(
+    max_lag_seconds=settings.db_replica_max_lag_seconds,
+    check_interval_seconds=settings.db_replica_lag_check_seconds,
+)
+
+
+def pool_status() -> dict[str, dict[str, Any]]:
+    """Current pool occupancy merged with the checkout wait metrics."""
+    waits = pool_metrics.snapshot()
+    pools = {
+        "api": engine.pool,
+        "worker": worker_engine.pool,
+        "api_async": async_engine.sync_engine.pool,
+    }
+    if replica_engine is not None and async_replica_engine is not None:
+        pools["replica"] = replica_engine.pool
+        pools["replica_async"] = async_replica_engine.sync_engine.pool
+    status: dict[str, dict[str, Any]] = {}
+    for name, pool in pools.items():
+        status[name] = {
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "overflow": pool.overflow(),
+            **waits.get(name, {}),
+        }
+    return status
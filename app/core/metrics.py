@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import threading
+
+
+class PoolWaitMetrics:
+    """Per-pool connection checkout wait statistics, kept in-process for the admin stats endpoint."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._pools: dict[str, dict[str, float]] = {}
+
+    def _bucket(self, pool_name: str) -> dict[str, float]:
+        bucket = self._pools.get(pool_name)
+        if bucket is None:
+            bucket = {"checkouts": 0, "timeouts": 0, "total_wait_seconds": 0.0, "max_wait_seconds": 0.0}
+            self._pools[pool_name] = bucket
+        return bucket
+
+    def observe(self, pool_name: str, wait_seconds: float, *, timed_out: bool = False) -> None:
+        with self._lock:
+            bucket = self._bucket(pool_name)
+            if timed_out:
+                bucket["timeouts"] += 1
+            else:
+                bucket["checkouts"] += 1
+            bucket["total_wait_seconds"] += wait_seconds
+            bucket["max_wait_seconds"] = max(bucket["max_wait_seconds"], wait_seconds)
+
+    def snapshot(self) -> dict[str, dict[str, float]]:
+        with self._lock:
+            result: dict[str, dict[str, float]] = {}
+            for name, bucket in self._pools.items():
+                attempts = bucket["checkouts"] + bucket["timeouts"]
+                result[name] = {
+                    **bucket,
+                    "avg_wait_seconds": bucket["total_wait_seconds"] / attempts if attempts else 0.0,
+                }
+            return result
+
+
+pool_metrics = PoolWaitMetrics()
@@ -5,12 +5,14 @@ from fastapi import FastAPI
 
 from app.api.router import api_router
 from app.core.config import get_settings
-from app.core.database import SessionLocal, ensure_database
+from app.core.database import WorkerSessionLocal, async_engine, ensure_database
 from app.core.run_migrations import ensure_schema_up_to_date
+from app.services.invalidation_bus import run_invalidation_listener
 from app.services.push_service import process_outbox
 from app.scripts.check_db import check_db
 from app.scripts.cleanup_auth_sessions import cleanup_auth_sessions
 from app.scripts.cleanup_change_logs import cleanup_change_logs
+from app.scripts.cleanup_lesson_changes import cleanup_lesson_changes
 
 
 async def _run_periodic_cleanup(
@@ -19,7 +21,7 @@ async def _run_periodic_cleanup(
     grace_days: int = 7,
     audit_retention_days: int = 90,
 ) -> None:
-    """Background task to prune expired auth sessions and stale audit logs on a fixed interval."""
+    """Background task to prune expired auth sessions, stale audit logs and lesson changes on a fixed interval."""
     interval = interval_hours * 3600
     while not stop_event.is_set():
         try:
@@ -32,6 +34,11 @@ async def _run_periodic_cleanup(
         except Exception:
             # Swallow exceptions to avoid crashing the app; could add logging here.
             pass
+        try:
+            cleanup_lesson_changes()
+        except Exception:
+            # Swallow exceptions to avoid crashing the app; could add logging here.
+            pass
         try:
             await asyncio.wait_for(stop_event.wait(), timeout=interval)
         except asyncio.TimeoutError:
@@ -48,10 +55,13 @@ def _process_outbox_batch(
     max_attempts: int,
     retry_backoff_seconds: int,
 ) -> None:
-    """Run a single outbox batch in a worker thread to avoid blocking the event loop."""
+    """Run a single outbox batch in a worker thread to avoid blocking the event loop.
+
+    Uses the dedicated worker pool so a slow FCM batch cannot hold API connections.
+    """
     if not server_key and not service_account_json:
         return
-    with SessionLocal() as session:
+    with WorkerSessionLocal() as session:
         process_outbox(
             session,
             server_key=server_key,
@@ -108,6 +118,7 @@ async def lifespan(app: FastAPI):
     try:
         cleanup_auth_sessions()
         cleanup_change_logs()
+        cleanup_lesson_changes()
     except Exception:
         # Swallow exceptions to avoid blocking startup; could add logging.
         pass
@@ -125,11 +136,13 @@ async def lifespan(app: FastAPI):
             batch_size=50,
         )
     )
+    invalidation_task = asyncio.create_task(run_invalidation_listener(stop_event))
     try:
         yield
     finally:
         stop_event.set()
-        await asyncio.gather(cleanup_task, sender_task)
+        await asyncio.gather(cleanup_task, sender_task, invalidation_task)
+        await async_engine.dispose()
 
 
 def create_app() -> FastAPI:
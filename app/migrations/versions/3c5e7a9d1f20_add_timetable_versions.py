@@ -0,0 +1,33 @@
+"""add timetable_versions for conditional timetable reads
+
+Revision ID: 3c5e7a9d1f20
+Revises: 84601712f521
+Create Date: 2026-10-17 00:00:00.000000
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "3c5e7a9d1f20"
+down_revision: Union[str, Sequence[str], None] = "84601712f521"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "timetable_versions",
+        sa.Column("scope", sa.Text(), nullable=False),
+        sa.Column("entity_id", sa.BigInteger(), nullable=False),
+        sa.Column("version", sa.BigInteger(), nullable=False, server_default="1"),
+        sa.Column(
+            "updated_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()
+        ),
+        sa.PrimaryKeyConstraint("scope", "entity_id"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("timetable_versions")
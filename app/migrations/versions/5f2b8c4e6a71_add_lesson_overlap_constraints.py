@@ -0,0 +1,36 @@
+"""prepare for exclusion constraints against double-booked rooms, lecturers and groups
+
+Revision ID: 5f2b8c4e6a71
+Revises: 3c5e7a9d1f20
+Create Date: 2026-10-17 00:00:00.000000
+
+Installs btree_gist, which GiST indexes over (resource id, tstzrange(starts_at, ends_at)) need.
+The `ex_lessons_*_overlap` constraints themselves are optional and can only be added once no
+overlapping lessons are left, so no revision creates them: `python -m app.scripts.lesson_overlaps
+--enforce` does, after listing and cancelling the overlaps. The downgrade drops them if present.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "5f2b8c4e6a71"
+down_revision: Union[str, Sequence[str], None] = "3c5e7a9d1f20"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+CONSTRAINTS = (
+    "ex_lessons_group_overlap",
+    "ex_lessons_lecturer_overlap",
+    "ex_lessons_room_overlap",
+)
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+
+
+def downgrade() -> None:
+    for name in CONSTRAINTS:
+        op.execute(f"ALTER TABLE lessons DROP CONSTRAINT IF EXISTS {name}")
@@ -0,0 +1,47 @@
+"""add a GiST index on lesson room and period for free-room lookups
+
+Revision ID: 7b3f9e1c4d52
+Revises: e2c9a7d35b16
+Create Date: 2026-10-17 00:00:00.000000
+
+`GET /rooms/available` probes lessons per room by overlapping period. The optional
+`ex_lessons_room_overlap` constraint is not installed on every database, so the lookup gets its
+own partial index over (room_id, tstzrange(starts_at, ends_at)) for non-cancelled lessons.
+btree_gist is installed by 5f2b8c4e6a71. Built concurrently (autocommit block) so populated
+tables keep taking writes.
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+revision: str = "7b3f9e1c4d52"
+down_revision: Union[str, Sequence[str], None] = "e2c9a7d35b16"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema by adding the room/period GiST index."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_lessons_room_period",
+            "lessons",
+            ["room_id", sa.text("tstzrange(starts_at, ends_at)")],
+            postgresql_using="gist",
+            postgresql_where=sa.text("status <> 'cancelled'"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema by dropping the room/period GiST index."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_lessons_room_period",
+            table_name="lessons",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,58 @@
+"""add indexes for lesson, selection, outbox, token and audit access paths
+
+Revision ID: 84601712f521
+Revises: b2e1c0d5c0f1
+Create Date: 2026-10-17 00:00:00.000000
+
+Indexes are built with CREATE INDEX CONCURRENTLY so the migration does not block writes
+on populated tables; this requires running outside a transaction (autocommit block).
+`student_group_selection.user_id` lookups are already served by the leading column of
+`uq_selection_user_group`, so only `group_id` gets a new index there.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "84601712f521"
+down_revision: Union[str, Sequence[str], None] = "b2e1c0d5c0f1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = (
+    ("ix_lessons_group_starts_at", "lessons", ["group_id", "starts_at"]),
+    ("ix_lessons_lecturer_starts_at", "lessons", ["lecturer_user_id", "starts_at"]),
+    ("ix_lessons_starts_at_id", "lessons", ["starts_at", "id"]),
+    ("ix_student_group_selection_group", "student_group_selection", ["group_id"]),
+    ("ix_notification_outbox_user_created_at", "notification_outbox", ["user_id", "created_at"]),
+    ("ix_notification_outbox_delivery_status_created_at", "notification_outbox", ["delivery_status", "created_at"]),
+    ("ix_fcm_tokens_user", "fcm_tokens", ["user_id"]),
+    ("ix_fcm_tokens_token", "fcm_tokens", ["token"]),
+    ("ix_change_logs_created_at", "change_logs", ["created_at"]),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema by adding secondary indexes for hot query paths."""
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema by dropping the hot path indexes."""
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
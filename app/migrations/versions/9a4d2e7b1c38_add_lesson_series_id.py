@@ -0,0 +1,44 @@
+"""add series_id to lessons
+
+Revision ID: 9a4d2e7b1c38
+Revises: 5f2b8c4e6a71
+Create Date: 2026-10-17 00:00:00.000000
+
+Lessons created together by `POST /lessons/series` share a series_id, which lets
+"this and following" / "whole series" edits run as one set-based statement. Existing lessons
+keep a NULL series_id. The index is built concurrently, outside the migration transaction.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = "9a4d2e7b1c38"
+down_revision: Union[str, Sequence[str], None] = "5f2b8c4e6a71"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("lessons", sa.Column("series_id", postgresql.UUID(as_uuid=True), nullable=True))
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_lessons_series_starts_at",
+            "lessons",
+            ["series_id", "starts_at"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_lessons_series_starts_at",
+            table_name="lessons",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+    op.drop_column("lessons", "series_id")
@@ -0,0 +1,58 @@
+"""add lesson_recurrences for rule-based recurring lessons
+
+Revision ID: c7e3a1f9b264
+Revises: 9a4d2e7b1c38
+Create Date: 2026-10-17 00:00:00.000000
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = "c7e3a1f9b264"
+down_revision: Union[str, Sequence[str], None] = "9a4d2e7b1c38"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = (
+    ("ix_lesson_recurrences_group_last_starts_at", ["group_id", "last_starts_at"]),
+    ("ix_lesson_recurrences_lecturer_last_starts_at", ["lecturer_user_id", "last_starts_at"]),
+    ("ix_lesson_recurrences_room_last_starts_at", ["room_id", "last_starts_at"]),
+)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "lesson_recurrences",
+        sa.Column("id", sa.BigInteger(), primary_key=True),
+        sa.Column("series_id", postgresql.UUID(as_uuid=True), nullable=False, unique=True),
+        sa.Column("subject_id", sa.BigInteger(), sa.ForeignKey("subjects.id"), nullable=False),
+        sa.Column("lecturer_user_id", sa.BigInteger(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("room_id", sa.BigInteger(), sa.ForeignKey("rooms.id"), nullable=False),
+        sa.Column("group_id", sa.BigInteger(), sa.ForeignKey("groups.id"), nullable=False),
+        sa.Column("starts_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("ends_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("status", sa.Text(), nullable=False),
+        sa.Column("lesson_type", sa.Text(), nullable=False),
+        sa.Column("interval_days", sa.Integer(), nullable=False),
+        sa.Column("count", sa.Integer(), nullable=True),
+        sa.Column("until", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("last_starts_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column(
+            "exdates",
+            postgresql.ARRAY(sa.DateTime(timezone=True)),
+            nullable=False,
+            server_default=sa.text("'{}'"),
+        ),
+    )
+    for name, columns in INDEXES:
+        op.create_index(name, "lesson_recurrences", columns)
+
+
+def downgrade() -> None:
+    for name, _ in reversed(INDEXES):
+        op.drop_index(name, table_name="lesson_recurrences")
+    op.drop_table("lesson_recurrences")
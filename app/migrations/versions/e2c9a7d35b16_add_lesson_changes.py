@@ -0,0 +1,48 @@
+"""add lesson_changes sequence for delta sync
+
+Revision ID: e2c9a7d35b16
+Revises: d4b8f2a6e913
+Create Date: 2026-10-17 00:00:00.000000
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "e2c9a7d35b16"
+down_revision: Union[str, Sequence[str], None] = "d4b8f2a6e913"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = (
+    ("ix_lesson_changes_group_txid_seq", ["group_id", "txid", "seq"]),
+    ("ix_lesson_changes_lecturer_txid_seq", ["lecturer_user_id", "txid", "seq"]),
+    ("ix_lesson_changes_changed_at", ["changed_at"]),
+)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "lesson_changes",
+        sa.Column("seq", sa.BigInteger(), primary_key=True),
+        sa.Column("lesson_id", sa.BigInteger(), nullable=True),
+        sa.Column("recurrence_id", sa.BigInteger(), nullable=True),
+        sa.Column("group_id", sa.BigInteger(), nullable=False),
+        sa.Column("lecturer_user_id", sa.BigInteger(), nullable=False),
+        sa.Column("action", sa.Text(), nullable=False),
+        sa.Column("changed_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+    )
+    # xid8 / pg_current_xact_id() need Postgres 13+; SQLAlchemy has no generic type for it.
+    op.execute(
+        "ALTER TABLE lesson_changes ADD COLUMN txid xid8 NOT NULL DEFAULT pg_current_xact_id()"
+    )
+    for name, columns in INDEXES:
+        op.create_index(name, "lesson_changes", columns)
+
+
+def downgrade() -> None:
+    for name, _ in reversed(INDEXES):
+        op.drop_index(name, table_name="lesson_changes")
+    op.drop_table("lesson_changes")
@@ -1,19 +1,23 @@
-from app.models.auth import AuthSession
+from app.models.auth import AuthSession, CalendarFeedToken
 from app.models.base import Base
-from app.models.lessons import Lesson, Room, Subject
+from app.models.lessons import Lesson, LessonChange, LessonRecurrence, Room, Subject
 from app.models.notifications import NotificationOutbox
 from app.models.programs import Group, GroupType, Program, ProgramYear, Specialization
 from app.models.selections import StudentGroupSelection
+from app.models.timetable import TimetableVersion
 from app.models.users import ChangeLog, FcmToken, LecturerProfile, Role, User
 
 __all__ = [
     "AuthSession",
     "Base",
+    "CalendarFeedToken",
     "ChangeLog",
     "FcmToken",
     "Group",
     "GroupType",
     "Lesson",
+    "LessonChange",
+    "LessonRecurrence",
     "NotificationOutbox",
     "Program",
     "ProgramYear",
@@ -23,5 +27,6 @@ __all__ = [
     "Specialization",
     "StudentGroupSelection",
     "Subject",
+    "TimetableVersion",
     "User",
 ]
@@ -1,10 +1,13 @@
 from __future__ import annotations
 
+import uuid
 from datetime import datetime
 from typing import List, TYPE_CHECKING
 
-from sqlalchemy import BigInteger, DateTime, ForeignKey, Integer, Text
+from sqlalchemy import BigInteger, DateTime, ForeignKey, Index, Integer, Text, func, text
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.types import UserDefinedType
 
 from app.models.base import Base
 
@@ -36,6 +39,22 @@ class Room(Base):
 
 class Lesson(Base):
     __tablename__ = "lessons"
+    # The optional ex_lessons_*_overlap exclusion constraints are not declared here: they are
+    # installed and dropped by app.scripts.lesson_overlaps, never by a migration.
+    __table_args__ = (
+        Index("ix_lessons_group_starts_at", "group_id", "starts_at"),
+        Index("ix_lessons_lecturer_starts_at", "lecturer_user_id", "starts_at"),
+        Index("ix_lessons_starts_at_id", "starts_at", "id"),
+        Index("ix_lessons_series_starts_at", "series_id", "starts_at"),
+        # Free-room lookups; needs btree_gist.
+        Index(
+            "ix_lessons_room_period",
+            "room_id",
+            text("tstzrange(starts_at, ends_at)"),
+            postgresql_using="gist",
+            postgresql_where=text("status <> 'cancelled'"),
+        ),
+    )
 
     id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
     subject_id: Mapped[int] = mapped_column(ForeignKey("subjects.id"), nullable=False)
@@ -46,8 +65,87 @@ class Lesson(Base):
     ends_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
     status: Mapped[str] = mapped_column(Text, nullable=False)
     lesson_type: Mapped[str] = mapped_column(Text, nullable=False)
+    series_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), nullable=True)
 
     subject: Mapped[Subject] = relationship("Subject", back_populates="lessons")
     lecturer: Mapped["User"] = relationship("User")
     room: Mapped[Room] = relationship("Room", back_populates="lessons")
     group: Mapped["Group"] = relationship("Group", back_populates="lessons")
+
+
+class LessonRecurrence(Base):
+    """A repeating lesson stored as a rule and expanded at read time.
+
+    Occurrences fall every `interval_days` from `starts_at` up to `last_starts_at` (derived from
+    `count` or `until`), except the start times in `exdates`. Editing an occurrence materializes
+    it as a `Lesson` with the rule's `series_id` and adds its start to `exdates`.
+    """
+
+    __tablename__ = "lesson_recurrences"
+    __table_args__ = (
+        Index("ix_lesson_recurrences_group_last_starts_at", "group_id", "last_starts_at"),
+        Index("ix_lesson_recurrences_lecturer_last_starts_at", "lecturer_user_id", "last_starts_at"),
+        Index("ix_lesson_recurrences_room_last_starts_at", "room_id", "last_starts_at"),
+    )
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    series_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False, unique=True)
+    subject_id: Mapped[int] = mapped_column(ForeignKey("subjects.id"), nullable=False)
+    lecturer_user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
+    room_id: Mapped[int] = mapped_column(ForeignKey("rooms.id"), nullable=False)
+    group_id: Mapped[int] = mapped_column(ForeignKey("groups.id"), nullable=False)
+    starts_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    ends_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    status: Mapped[str] = mapped_column(Text, nullable=False)
+    lesson_type: Mapped[str] = mapped_column(Text, nullable=False)
+    interval_days: Mapped[int] = mapped_column(Integer, nullable=False)
+    count: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    until: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    last_starts_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    exdates: Mapped[List[datetime]] = mapped_column(
+        ARRAY(DateTime(timezone=True)), nullable=False, server_default=text("'{}'")
+    )
+
+    subject: Mapped[Subject] = relationship("Subject")
+    lecturer: Mapped["User"] = relationship("User")
+    room: Mapped[Room] = relationship("Room")
+    group: Mapped["Group"] = relationship("Group")
+
+
+class XID8(UserDefinedType):
+    """Postgres `xid8` (64-bit transaction id); only compared in SQL, never loaded into Python."""
+
+    cache_ok = True
+
+    def get_col_spec(self, **kw) -> str:
+        return "xid8"
+
+
+class LessonChange(Base):
+    """Append-only change sequence behind `GET /lessons/changes`.
+
+    Every lesson (or recurrence rule) write appends rows scoped to the affected group and
+    lecturer; a lesson moved to another group/lecturer gets a `delete` under the old scope and an
+    `upsert` under the new one. `txid` lets readers stop at the oldest in-flight transaction so a
+    lower `seq` committed late is never skipped by a cursor.
+    """
+
+    __tablename__ = "lesson_changes"
+    __table_args__ = (
+        Index("ix_lesson_changes_group_txid_seq", "group_id", "txid", "seq"),
+        Index("ix_lesson_changes_lecturer_txid_seq", "lecturer_user_id", "txid", "seq"),
+        Index("ix_lesson_changes_changed_at", "changed_at"),
+    )
+
+    seq: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    txid: Mapped[str] = mapped_column(
+        XID8(), nullable=False, server_default=text("pg_current_xact_id()")
+    )
+    lesson_id: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    recurrence_id: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    group_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    lecturer_user_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    action: Mapped[str] = mapped_column(Text, nullable=False)
+    changed_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
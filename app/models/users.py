@@ -3,7 +3,7 @@ from __future__ import annotations
 from datetime import datetime
 from typing import List, Optional
 
-from sqlalchemy import BigInteger, DateTime, ForeignKey, Text
+from sqlalchemy import BigInteger, DateTime, ForeignKey, Index, Text
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -43,6 +43,10 @@ class User(Base):
 
 class FcmToken(Base):
     __tablename__ = "fcm_tokens"
+    __table_args__ = (
+        Index("ix_fcm_tokens_user", "user_id"),
+        Index("ix_fcm_tokens_token", "token"),
+    )
 
     id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
@@ -65,6 +69,7 @@ class LecturerProfile(Base):
 
 class ChangeLog(Base):
     __tablename__ = "change_logs"
+    __table_args__ = (Index("ix_change_logs_created_at", "created_at"),)
 
     id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
     actor_user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from pydantic import BaseModel
+
+
+class SessionCacheStats(BaseModel):
+    size: int
+    max_entries: int
+    ttl_seconds: int
+    hits: int
+    misses: int
+    evictions: int
+
+
+class FeedCacheStats(BaseModel):
+    size: int
+    max_entries: int
+    hits: int
+    misses: int
+    evictions: int
+
+
+class NextLessonIndexStats(BaseModel):
+    timetables: int
+    selections: int
+    max_entries: int
+    hits: int
+    misses: int
+
+
+class TimetableCacheStats(BaseModel):
+    size: int
+    bytes: int
+    max_bytes: int
+    hits: int
+    misses: int
+    hit_rate: float
+    evictions: int
+    invalidations: int
+
+
+class PoolStats(BaseModel):
+    size: int
+    checked_out: int
+    overflow: int
+    checkouts: int = 0
+    timeouts: int = 0
+    total_wait_seconds: float = 0.0
+    max_wait_seconds: float = 0.0
+    avg_wait_seconds: float = 0.0
+
+
+class AdminStats(BaseModel):
+    session_cache: SessionCacheStats
+    calendar_cache: FeedCacheStats
+    next_lesson_index: NextLessonIndexStats
+    timetable_cache: TimetableCacheStats
+    db_pools: dict[str, PoolStats]
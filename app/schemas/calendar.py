@@ -0,0 +1,8 @@
+from __future__ import annotations
+
+from pydantic import BaseModel, Field
+
+
+class CalendarFeedToken(BaseModel):
+    token: str = Field(description="Shown once; issuing a new token revokes the previous one")
+    feed_url: str = Field(description="Subscription URL of the caller's own timetable")
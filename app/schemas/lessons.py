@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from datetime import datetime
 from enum import Enum
+from uuid import UUID
 
 from pydantic import BaseModel, ConfigDict, Field
 
@@ -15,6 +16,12 @@ class LessonStatus(str, Enum):
     cancelled = "cancelled"
 
 
+class LessonScope(str, Enum):
+    occurrence = "occurrence"
+    following = "following"
+    series = "series"
+
+
 class Subject(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
@@ -78,23 +85,53 @@ class LessonUpdate(BaseModel):
     ends_at: datetime | None = None
     status: LessonStatus | None = None
     lesson_type: str | None = None
-    scope: str | None = None
+    scope: LessonScope | None = Field(
+        default=None,
+        description="occurrence (default), following (this and later lessons of the series) or series",
+    )
 
 
 class Lesson(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
-    id: int
+    id: int | None = Field(
+        description="None for an occurrence of a recurrence rule that has not been materialized"
+    )
     starts_at: datetime
     ends_at: datetime
     status: LessonStatus
     lesson_type: str
+    series_id: UUID | None = None
+    recurrence_id: int | None = None
     subject: Subject
     room: Room
     group: Group
     lecturer: UserSummary
 
 
+class LessonCompact(BaseModel):
+    """Flat lesson for personal timetables: referenced names inline instead of nested objects."""
+
+    id: int | None = Field(
+        description="None for an occurrence of a recurrence rule that has not been materialized"
+    )
+    recurrence_id: int | None = None
+    starts_at: datetime
+    ends_at: datetime
+    status: LessonStatus
+    lesson_type: str
+    subject_id: int
+    subject_name: str
+    subject_code: str
+    room_id: int
+    room_building: str
+    room_number: str
+    group_id: int
+    group_code: str
+    lecturer_user_id: int
+    lecturer_name: str
+
+
 class LessonSeriesCreate(BaseModel):
     lesson: LessonCreate
     repeat_every_days: int = Field(
@@ -108,3 +145,100 @@ class LessonSeriesCreate(BaseModel):
         le=52,
         description="How many lessons to create in the series, including the first occurrence.",
     )
+    materialize: bool = Field(
+        default=True,
+        description="Store every occurrence as a lesson (default) or only a recurrence rule "
+        "that is expanded at read time.",
+    )
+
+
+class LessonBulkCreate(BaseModel):
+    lessons: list[LessonCreate] = Field(
+        min_length=1,
+        max_length=50000,
+        description="Lessons to create; invalid rows are reported individually and skipped.",
+    )
+
+
+class LessonBulkError(BaseModel):
+    index: int = Field(description="Position of the rejected lesson in the request")
+    detail: str
+
+
+class LessonBulkResult(BaseModel):
+    created: int
+    lesson_ids: list[int]
+    errors: list[LessonBulkError]
+
+
+class LessonConflict(BaseModel):
+    occurrence: int = Field(description="Position of the conflicting occurrence in the series")
+    starts_at: datetime
+    ends_at: datetime
+    conflicting_lesson_id: int | None = None
+    conflicting_recurrence_id: int | None = Field(
+        default=None, description="Set instead of the lesson id for an occurrence of a recurring lesson"
+    )
+    conflicting_occurrence: int | None = Field(
+        default=None, description="Set instead of the lesson id when two occurrences overlap"
+    )
+    conflicting_starts_at: datetime
+    conflicting_ends_at: datetime
+    resources: list[str] = Field(description="Double-booked resources: room, lecturer and/or group")
+
+
+class LessonSeriesConflictReport(BaseModel):
+    occurrences: int
+    conflicts: list[LessonConflict]
+
+
+class FreeSlot(BaseModel):
+    starts_at: datetime
+    ends_at: datetime
+    room_ids: list[int] = Field(description="Rooms free for the whole slot, smallest first")
+
+
+class LessonRecurrenceCreate(BaseModel):
+    lesson: LessonCreate
+    interval_days: int = Field(default=7, gt=0, description="Days between occurrences")
+    count: int | None = Field(
+        default=None, gt=0, le=520, description="Number of occurrences, including the first"
+    )
+    until: datetime | None = Field(default=None, description="No occurrence starts after this")
+    exdates: list[datetime] = Field(
+        default_factory=list, description="Start times of occurrences to skip"
+    )
+
+
+class LessonRecurrence(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    series_id: UUID
+    starts_at: datetime
+    ends_at: datetime
+    status: LessonStatus
+    lesson_type: str
+    interval_days: int
+    count: int | None
+    until: datetime | None
+    last_starts_at: datetime
+    exdates: list[datetime]
+    subject: Subject
+    room: Room
+    group: Group
+    lecturer: UserSummary
+
+
+class LessonMaterialize(BaseModel):
+    starts_at: datetime = Field(description="Start time of the occurrence to materialize")
+
+
+class LessonChanges(BaseModel):
+    lessons: list[Lesson] = Field(description="Created or updated lessons, in their current state")
+    deleted: list[int] = Field(description="Ids of deleted lessons (tombstones)")
+    replaced_recurrences: list[int] = Field(
+        description="Recurrence rules whose occurrences must be dropped before applying `lessons`"
+    )
+    next_cursor: str = Field(description="Pass as `since` on the next call")
+    has_more: bool
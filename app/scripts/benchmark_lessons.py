@@ -0,0 +1,502 @@
+"""Benchmark lesson read/write paths against a synthetic dataset.
+
+The dataset is generated inside a transaction that is always rolled back, so the script is
+safe to point at a development database that already holds fixtures:
+
+    python -m app.scripts.benchmark_lessons load --lessons 100000 --runs 5
+    python -m app.scripts.benchmark_lessons series --occurrences 100 --students 30
+    python -m app.scripts.benchmark_lessons slots --taught-groups 30
+
+Service calls that commit only release a savepoint; the outer transaction is still rolled back.
+
+Each scenario reports latency (median/min over the runs), the number of SQL statements, the
+result cells (rows x columns) and the approximate bytes returned by the server.
+"""
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Iterable, Iterator
+
+from sqlalchemy import event, insert, select, text
+from sqlalchemy.orm import Session, joinedload
+
+from app.core.database import engine
+from app.models import (
+    Group,
+    GroupType,
+    Lesson,
+    Program,
+    ProgramYear,
+    Role,
+    Room,
+    Specialization,
+    StudentGroupSelection,
+    Subject,
+    User,
+)
+from app.schemas.lessons import Lesson as LessonSchema
+from app.services import lesson_service, slot_service
+
+BENCH_START = datetime(2030, 1, 7, 8, 0, tzinfo=timezone.utc)
+
+
+@dataclass
+class Dataset:
+    group_ids: list[int]
+    lecturer_ids: list[int]
+    room_ids: list[int]
+    subject_ids: list[int]
+    starts_from: datetime
+    lessons: int
+
+
+@dataclass
+class QueryStats:
+    statements: int = 0
+    rows: int = 0
+    cells: int = 0
+    bytes: int = 0
+    captured: list[tuple[str, Any, int]] = field(default_factory=list)
+
+
+def _insert_ids(session: Session, model, rows: list[dict[str, Any]]) -> list[int]:
+    return list(session.scalars(insert(model).returning(model.id), rows).all())
+
+
+def seed_dataset(
+    session: Session,
+    *,
+    lessons: int,
+    groups: int = 200,
+    lecturers: int = 80,
+    rooms: int = 100,
+    subjects: int = 50,
+) -> Dataset:
+    """Insert a synthetic timetable inside the caller's (uncommitted) transaction.
+
+    Every group gets consecutive 90-minute slots (8 per weekday); lecturers and rooms rotate per
+    slot so no lecturer or room is double-booked as long as there are at least as many of each
+    as there are groups.
+    """
+    lecturers = max(lecturers, groups)
+    rooms = max(rooms, groups)
+    now = datetime.now(timezone.utc)
+    role_id = session.scalar(
+        insert(Role).returning(Role.id), {"code": "benchmark_lecturer", "label": "Benchmark"}
+    )
+    lecturer_ids = _insert_ids(
+        session,
+        User,
+        [
+            {
+                "email": f"bench-lecturer-{i}@example.invalid",
+                "name": f"Lecturer {i}",
+                "role_id": role_id,
+                "created_at": now,
+            }
+            for i in range(lecturers)
+        ],
+    )
+    subject_ids = _insert_ids(
+        session,
+        Subject,
+        [{"name": f"Subject {i}", "code": f"BENCH-{i}"} for i in range(subjects)],
+    )
+    room_ids = _insert_ids(
+        session,
+        Room,
+        [{"number": str(100 + i), "building": f"B{i % 5}", "capacity": 30} for i in range(rooms)],
+    )
+    program_ids = _insert_ids(session, Program, [{"name": f"Program {i}"} for i in range(10)])
+    year_ids = _insert_ids(
+        session,
+        ProgramYear,
+        [{"program_id": program_id, "year": year} for program_id in program_ids for year in range(1, 4)],
+    )
+    specialization_ids = _insert_ids(
+        session,
+        Specialization,
+        [{"program_id": program_id, "name": f"Specialization {program_id}"} for program_id in program_ids],
+    )
+    session.merge(GroupType(code="bench", label="Benchmark"))
+    session.flush()
+    group_ids = _insert_ids(
+        session,
+        Group,
+        [
+            {
+                "program_id": program_ids[i % len(program_ids)],
+                "program_year_id": year_ids[i % len(year_ids)],
+                "specialization_id": specialization_ids[i % len(specialization_ids)],
+                "group_type_code": "bench",
+                "code": f"G{i}",
+            }
+            for i in range(groups)
+        ],
+    )
+    # Lesson n belongs to group g = n % groups and is that group's k-th slot (k = n / groups).
+    session.execute(
+        text(
+            """
+            INSERT INTO lessons (subject_id, lecturer_user_id, room_id, group_id,
+                                 starts_at, ends_at, status, lesson_type)
+            SELECT (:subject_ids)[1 + (g + k) % cardinality(:subject_ids)],
+                   (:lecturer_ids)[1 + (g + k) % cardinality(:lecturer_ids)],
+                   (:room_ids)[1 + (g + k) % cardinality(:room_ids)],
+                   (:group_ids)[1 + g],
+                   slot,
+                   slot + interval '90 minutes',
+                   'scheduled',
+                   'lecture'
+            FROM generate_series(0, :lessons - 1) AS n,
+                 LATERAL (SELECT n % cardinality(:group_ids) AS g, n / cardinality(:group_ids) AS k) AS idx,
+                 LATERAL (
+                     SELECT CAST(:starts_from AS timestamptz)
+                            + (k / 40) * interval '7 days'
+                            + ((k % 40) / 8) * interval '1 day'
+                            + (k % 8) * interval '1 hour 30 minutes' AS slot
+                 ) AS s
+            """
+        ),
+        {
+            "subject_ids": subject_ids,
+            "lecturer_ids": lecturer_ids,
+            "room_ids": room_ids,
+            "group_ids": group_ids,
+            "starts_from": BENCH_START,
+            "lessons": lessons,
+        },
+    )
+    session.execute(text("ANALYZE lessons"))
+    return Dataset(
+        group_ids=group_ids,
+        lecturer_ids=lecturer_ids,
+        room_ids=room_ids,
+        subject_ids=subject_ids,
+        starts_from=BENCH_START,
+        lessons=lessons,
+    )
+
+
+@contextmanager
+def capture_statements(session: Session) -> Iterator[QueryStats]:
+    """Record every statement sent to the server while the block runs."""
+    stats = QueryStats()
+    bind_engine = session.get_bind().engine
+
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        stats.statements += 1
+        stats.captured.append((statement, parameters, len(cursor.description or ())))
+
+    event.listen(bind_engine, "after_cursor_execute", _after_cursor_execute)
+    try:
+        yield stats
+    finally:
+        event.remove(bind_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def measure_result_size(session: Session, stats: QueryStats) -> None:
+    """Re-run captured SELECTs server-side to count returned rows and their on-wire size."""
+    connection = session.connection()
+    for statement, parameters, columns in stats.captured:
+        if not statement.lstrip().upper().startswith("SELECT"):
+            continue
+        rows, size = connection.exec_driver_sql(
+            f"SELECT count(*), coalesce(sum(pg_column_size(q.*)), 0) FROM ({statement}) AS q",
+            parameters,
+        ).one()
+        stats.rows += rows
+        stats.cells += rows * columns
+        stats.bytes += size
+
+
+def run_scenario(
+    session: Session, label: str, action: Callable[[], Any], *, runs: int
+) -> dict[str, Any]:
+    timings: list[float] = []
+    for _ in range(runs):
+        session.expunge_all()
+        started = time.perf_counter()
+        action()
+        timings.append(time.perf_counter() - started)
+    session.expunge_all()
+    with capture_statements(session) as stats:
+        action()
+    session.expunge_all()
+    measure_result_size(session, stats)
+    return {
+        "scenario": label,
+        "median_ms": statistics.median(timings) * 1000,
+        "min_ms": min(timings) * 1000,
+        "statements": stats.statements,
+        "rows": stats.rows,
+        "cells": stats.cells,
+        "kbytes": stats.bytes / 1024,
+    }
+
+
+def print_report(results: Iterable[dict[str, Any]]) -> None:
+    header = f"{'scenario':<40} {'median ms':>10} {'min ms':>10} {'stmts':>6} {'rows':>9} {'cells':>10} {'KiB':>10}"
+    print(header)
+    print("-" * len(header))
+    for row in results:
+        print(
+            f"{row['scenario']:<40} {row['median_ms']:>10.1f} {row['min_ms']:>10.1f} "
+            f"{row['statements']:>6} {row['rows']:>9} {row['cells']:>10} {row['kbytes']:>10.1f}"
+        )
+
+
+def _joined_relations() -> tuple:
+    """The previous all-joinedload strategy, kept as the comparison baseline."""
+    return (
+        joinedload(Lesson.subject),
+        joinedload(Lesson.room),
+        joinedload(Lesson.group).joinedload(Group.program),
+        joinedload(Lesson.group).joinedload(Group.program_year),
+        joinedload(Lesson.group).joinedload(Group.specialization),
+        joinedload(Lesson.group).joinedload(Group.group_type),
+        joinedload(Lesson.lecturer),
+    )
+
+
+def _serialize(lessons: Iterable[Lesson]) -> list[bytes]:
+    return [LessonSchema.model_validate(lesson).model_dump_json().encode("utf-8") for lesson in lessons]
+
+
+def bench_load(session: Session, dataset: Dataset, *, runs: int) -> list[dict[str, Any]]:
+    """Compare relationship loading strategies for the lesson list endpoint."""
+    week_from = dataset.starts_from
+    week_to = week_from + timedelta(days=7)
+    strategies = {
+        "joined": _joined_relations(),
+        "selectin": tuple(lesson_service._with_relations()),
+    }
+    scenarios: dict[str, Callable[[tuple], Any]] = {
+        "all groups, one week": lambda options: select(Lesson)
+        .options(*options)
+        .where(Lesson.starts_at >= week_from, Lesson.starts_at <= week_to)
+        .order_by(Lesson.starts_at, Lesson.id),
+        "one group, whole range": lambda options: select(Lesson)
+        .options(*options)
+        .where(Lesson.group_id == dataset.group_ids[0])
+        .order_by(Lesson.starts_at, Lesson.id),
+        "keyset page (500)": lambda options: select(Lesson)
+        .options(*options)
+        .order_by(Lesson.starts_at, Lesson.id)
+        .limit(500),
+    }
+    results = []
+    for scenario, build in scenarios.items():
+        for strategy, options in strategies.items():
+            stmt = build(options)
+            results.append(
+                run_scenario(
+                    session,
+                    f"{scenario} [{strategy}]",
+                    lambda stmt=stmt: _serialize(session.scalars(stmt).all()),
+                    runs=runs,
+                )
+            )
+    return results
+
+
+def _add_students(session: Session, group_id: int, count: int) -> list[int]:
+    now = datetime.now(timezone.utc)
+    role_id = session.scalar(
+        insert(Role).returning(Role.id), {"code": "benchmark_student", "label": "Benchmark"}
+    )
+    student_ids = _insert_ids(
+        session,
+        User,
+        [
+            {
+                "email": f"bench-student-{i}@example.invalid",
+                "name": f"Student {i}",
+                "role_id": role_id,
+                "created_at": now,
+            }
+            for i in range(count)
+        ],
+    )
+    session.execute(
+        insert(StudentGroupSelection),
+        [{"user_id": user_id, "group_id": group_id, "selected_at": now} for user_id in student_ids],
+    )
+    return student_ids
+
+
+def bench_series(
+    session: Session, dataset: Dataset, *, runs: int, occurrences: int = 100, students: int = 30
+) -> list[dict[str, Any]]:
+    """Measure `create_lesson_series` for a long series whose group has `students` members."""
+    group_id = dataset.group_ids[0]
+    _add_students(session, group_id, students)
+    actor_user_id = dataset.lecturer_ids[0]
+    calls = 0
+
+    def create_series() -> Any:
+        nonlocal calls
+        # Each call starts after the previous series so runs never overlap in time.
+        starts_at = dataset.starts_from + timedelta(days=7 * (occurrences + 1) * (calls + 1) + 3650)
+        calls += 1
+        return lesson_service.create_lesson_series(
+            session,
+            {
+                "subject_id": dataset.subject_ids[0],
+                "lecturer_user_id": actor_user_id,
+                "room_id": dataset.room_ids[0],
+                "group_id": group_id,
+                "starts_at": starts_at,
+                "ends_at": starts_at + timedelta(minutes=90),
+                "status": "scheduled",
+                "lesson_type": "lecture",
+            },
+            occurrences=occurrences,
+            repeat_every_days=7,
+            actor_user_id=actor_user_id,
+        )
+
+    return [
+        run_scenario(
+            session,
+            f"series x{occurrences}, {students} students",
+            create_series,
+            runs=runs,
+        )
+    ]
+
+
+def _seed_teaching_week(
+    session: Session, dataset: Dataset, week_start: datetime, *, taught_groups: int
+) -> None:
+    """Fill one week in which lecturer 0 teaches `taught_groups` groups, one slot each.
+
+    The groups also have lessons with other lecturers in every third slot; lecturers and rooms
+    rotate per (group, slot), so nothing is double-booked.
+    """
+    session.execute(
+        text(
+            """
+            INSERT INTO lessons (subject_id, lecturer_user_id, room_id, group_id,
+                                 starts_at, ends_at, status, lesson_type)
+            SELECT (:subject_ids)[1 + (g + k) % cardinality(:subject_ids)],
+                   CASE WHEN k = g THEN (:lecturer_ids)[1]
+                        ELSE (:lecturer_ids)[2 + (g + k) % (cardinality(:lecturer_ids) - 1)] END,
+                   (:room_ids)[1 + (g + k) % cardinality(:room_ids)],
+                   (:group_ids)[1 + g],
+                   slot,
+                   slot + interval '90 minutes',
+                   'scheduled',
+                   'lecture'
+            FROM generate_series(0, :taught_groups - 1) AS g,
+                 generate_series(0, 39) AS k,
+                 LATERAL (
+                     SELECT CAST(:week_start AS timestamptz)
+                            + (k / 8) * interval '1 day'
+                            + (k % 8) * interval '1 hour 30 minutes' AS slot
+                 ) AS s
+            WHERE k = g OR k % 3 = 0
+            """
+        ),
+        {
+            "subject_ids": dataset.subject_ids,
+            "lecturer_ids": dataset.lecturer_ids,
+            "room_ids": dataset.room_ids,
+            "group_ids": dataset.group_ids[:taught_groups],
+            "week_start": week_start,
+            "taught_groups": taught_groups,
+        },
+    )
+    session.execute(text("ANALYZE lessons"))
+
+
+def bench_slots(
+    session: Session, dataset: Dataset, *, runs: int, taught_groups: int = 30
+) -> list[dict[str, Any]]:
+    """Measure `find_free_slots` for a lecturer teaching `taught_groups` groups in one week.
+
+    Target: under 50 ms median for 30 groups.
+    """
+    taught_groups = min(taught_groups, len(dataset.group_ids), 40)
+    # Far after the synthetic timetable, so only this week's lessons are busy.
+    week_start = dataset.starts_from + timedelta(weeks=520)
+    _seed_teaching_week(session, dataset, week_start, taught_groups=taught_groups)
+    lecturer_user_id = dataset.lecturer_ids[0]
+
+    def find(group_id: int, limit: int) -> Any:
+        return lambda: slot_service.find_free_slots(
+            session,
+            lecturer_user_id=lecturer_user_id,
+            group_id=group_id,
+            date_from=week_start,
+            date_to=week_start + timedelta(days=7),
+            duration=timedelta(minutes=90),
+            limit=limit,
+        )
+
+    return [
+        run_scenario(
+            session, f"free slots, {taught_groups} groups, top 5", find(dataset.group_ids[0], 5), runs=runs
+        ),
+        run_scenario(
+            session,
+            f"free slots, {taught_groups} groups, top 50",
+            find(dataset.group_ids[taught_groups - 1], 50),
+            runs=runs,
+        ),
+    ]
+
+
+COMMANDS: dict[str, Callable[..., list[dict[str, Any]]]] = {
+    "load": bench_load,
+    "series": bench_series,
+    "slots": bench_slots,
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark lesson queries on a synthetic dataset")
+    parser.add_argument("command", choices=sorted(COMMANDS), help="Benchmark to run")
+    parser.add_argument("--lessons", type=int, default=100_000, help="Synthetic lessons to generate")
+    parser.add_argument("--groups", type=int, default=200, help="Synthetic groups to generate")
+    parser.add_argument("--runs", type=int, default=5, help="Timed runs per scenario")
+    parser.add_argument("--occurrences", type=int, default=100, help="series: occurrences per series")
+    parser.add_argument("--students", type=int, default=30, help="series: students in the group")
+    parser.add_argument(
+        "--taught-groups", type=int, default=30, help="slots: groups taught by the lecturer"
+    )
+    args = parser.parse_args()
+
+    options: dict[str, Any] = {}
+    if args.command == "series":
+        options = {"occurrences": args.occurrences, "students": args.students}
+    elif args.command == "slots":
+        options = {"taught_groups": args.taught_groups}
+
+    with engine.connect() as connection:
+        transaction = connection.begin()
+        try:
+            with Session(
+                bind=connection,
+                join_transaction_mode="create_savepoint",
+                autoflush=False,
+                expire_on_commit=False,
+            ) as session:
+                started = time.perf_counter()
+                dataset = seed_dataset(session, lessons=args.lessons, groups=args.groups)
+                print(
+                    f"Seeded {dataset.lessons} lessons in {time.perf_counter() - started:.1f}s "
+                    "(rolled back on exit)"
+                )
+                print_report(COMMANDS[args.command](session, dataset, runs=args.runs, **options))
+        finally:
+            transaction.rollback()
+
+
+if __name__ == "__main__":
+    main()
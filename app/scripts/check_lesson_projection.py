@@ -0,0 +1,79 @@
+"""Contract check for the SQL-side JSON projection of `GET /lessons`.
+
+Serializes the same lessons through the ORM + `app.schemas.lessons.Lesson` path and through
+`lesson_service.list_lessons_json_async`, and fails (exit code 1) on the first difference in
+values, types or key order. Run it against a seeded database after touching the lesson schema:
+
+    python -m app.scripts.check_lesson_projection --limit 1000
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+from typing import Any
+
+from app.core.database import AsyncSessionLocal, async_engine
+from app.schemas.lessons import Lesson as LessonSchema
+from app.services import lesson_service
+
+
+def _first_difference(expected: Any, actual: Any, path: str = "$") -> str | None:
+    if isinstance(expected, dict) and isinstance(actual, dict):
+        if list(expected) != list(actual):
+            return f"{path}: keys {list(expected)} != {list(actual)}"
+        for key in expected:
+            difference = _first_difference(expected[key], actual[key], f"{path}.{key}")
+            if difference:
+                return difference
+        return None
+    if isinstance(expected, list) and isinstance(actual, list):
+        if len(expected) != len(actual):
+            return f"{path}: {len(expected)} items != {len(actual)} items"
+        for index, (left, right) in enumerate(zip(expected, actual)):
+            difference = _first_difference(left, right, f"{path}[{index}]")
+            if difference:
+                return difference
+        return None
+    if type(expected) is not type(actual) or expected != actual:
+        return f"{path}: {expected!r} != {actual!r}"
+    return None
+
+
+async def check_lesson_projection(*, limit: int | None = None) -> str | None:
+    """Return a description of the first mismatch between both serializations, or None."""
+    async with AsyncSessionLocal() as db:
+        if limit is None:
+            lessons = await lesson_service.list_lessons_async(db)
+        else:
+            lessons, _ = await lesson_service.list_lessons_page_async(db, limit=limit)
+        expected = [
+            json.loads(LessonSchema.model_validate(lesson).model_dump_json()) for lesson in lessons
+        ]
+        body, _ = await lesson_service.list_lessons_json_async(db, limit=limit)
+    actual = json.loads(body)
+    print(f"Compared {len(expected)} lessons")
+    return _first_difference(expected, actual)
+
+
+async def _run(limit: int | None) -> str | None:
+    try:
+        return await check_lesson_projection(limit=limit)
+    finally:
+        await async_engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Check SQL JSON projection parity for lessons")
+    parser.add_argument("--limit", type=int, default=None, help="Only compare the first N lessons")
+    args = parser.parse_args()
+    difference = asyncio.run(_run(args.limit))
+    if difference:
+        print(f"Projection mismatch at {difference}")
+        sys.exit(1)
+    print("SQL projection matches the Lesson schema.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""Guard hot query paths against plan regressions.
+
+Runs EXPLAIN for the statements behind the hottest endpoints and background jobs and
+fails (exit code 1) if any of them reads its main table with a sequential scan.
+Sequential scans are discouraged for the check (`enable_seqscan = off`) so that small
+seeded datasets still prove an index *can* serve the query; a Seq Scan in the plan then
+means no usable index exists.
+
+Run against a seeded database, e.g. after `python -m app.scripts.seed_db`:
+
+    python -m app.scripts.check_query_plans
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from datetime import datetime, timedelta, timezone
+from typing import Any, Iterator
+
+from sqlalchemy import Executable, select, text
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLocal
+from app.models import ChangeLog, FcmToken, Lesson, NotificationOutbox, StudentGroupSelection
+from app.services.catalog_service import _available_rooms_stmt
+from app.services.lesson_service import _compact_lessons_stmt, _list_lessons_stmt
+from app.services.next_lesson_service import UPCOMING_BATCH
+from app.services.notification_service import _list_notifications_stmt
+
+
+def _plan_nodes(node: dict[str, Any]) -> Iterator[dict[str, Any]]:
+    yield node
+    for child in node.get("Plans", []):
+        yield from _plan_nodes(child)
+
+
+def _explain(session: Session, stmt: Executable) -> dict[str, Any]:
+    connection = session.connection()
+    compiled = stmt.compile(dialect=connection.dialect)
+    raw = connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params).scalar()
+    plan = raw if isinstance(raw, list) else json.loads(raw)
+    return plan[0]["Plan"]
+
+
+def _checks() -> list[tuple[str, str, Executable]]:
+    now = datetime.now(timezone.utc)
+    week_start = now - timedelta(days=now.weekday())
+    week_end = week_start + timedelta(days=7)
+    return [
+        (
+            "lessons by group and week",
+            "lessons",
+            _list_lessons_stmt(group_id=1, date_from=week_start, date_to=week_end),
+        ),
+        (
+            "lessons by lecturer and week",
+            "lessons",
+            select(Lesson).where(
+                Lesson.lecturer_user_id == 2,
+                Lesson.starts_at >= week_start,
+                Lesson.starts_at < week_end,
+            ),
+        ),
+        (
+            "lesson keyset page",
+            "lessons",
+            _list_lessons_stmt(date_from=week_start, limit=100),
+        ),
+        (
+            "personal timetable of a student",
+            "lessons",
+            _compact_lessons_stmt(user_id=1, role="student", date_from=week_start, date_to=week_end),
+        ),
+        (
+            "personal timetable of a lecturer",
+            "lessons",
+            _compact_lessons_stmt(user_id=2, role="lecturer", date_from=week_start, date_to=week_end),
+        ),
+        (
+            "next lessons of a group",
+            "lessons",
+            _compact_lessons_stmt(
+                group_id=1, date_from=now, exclude_cancelled=True, limit=UPCOMING_BATCH
+            ),
+        ),
+        (
+            "free rooms for a slot",
+            "lessons",
+            _available_rooms_stmt(starts_at=week_start, ends_at=week_start + timedelta(hours=2)),
+        ),
+        (
+            "selection by user",
+            "student_group_selection",
+            select(StudentGroupSelection).where(StudentGroupSelection.user_id == 1),
+        ),
+        (
+            "selection recipients by group",
+            "student_group_selection",
+            select(StudentGroupSelection.user_id).where(StudentGroupSelection.group_id == 1),
+        ),
+        (
+            "notifications by user",
+            "notification_outbox",
+            _list_notifications_stmt(user_id=1),
+        ),
+        (
+            "outbox queued batch",
+            "notification_outbox",
+            select(NotificationOutbox)
+            .where(NotificationOutbox.delivery_status == "queued")
+            .order_by(NotificationOutbox.created_at)
+            .limit(50),
+        ),
+        (
+            "fcm tokens by user",
+            "fcm_tokens",
+            select(FcmToken).where(FcmToken.user_id == 1),
+        ),
+        (
+            "fcm tokens by token",
+            "fcm_tokens",
+            select(FcmToken).where(FcmToken.token == "token"),
+        ),
+        (
+            "change log retention",
+            "change_logs",
+            select(ChangeLog.id).where(ChangeLog.created_at < now - timedelta(days=90)),
+        ),
+    ]
+
+
+def check_query_plans(*, verbose: bool = False) -> list[str]:
+    """Return a description of every check whose plan sequentially scans its target table."""
+    failures: list[str] = []
+    with SessionLocal() as session:
+        session.execute(text("SET LOCAL enable_seqscan = off"))
+        for label, table, stmt in _checks():
+            plan = _explain(session, stmt)
+            seq_scans = [
+                node
+                for node in _plan_nodes(plan)
+                if node.get("Node Type") == "Seq Scan" and node.get("Relation Name") == table
+            ]
+            status = "FAIL" if seq_scans else "ok"
+            print(f"[{status}] {label} ({table})")
+            if verbose or seq_scans:
+                print(json.dumps(plan, indent=2))
+            if seq_scans:
+                failures.append(f"{label}: sequential scan on {table}")
+        session.rollback()
+    return failures
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Fail if hot queries degrade to sequential scans")
+    parser.add_argument("--verbose", action="store_true", help="Print every plan, not only failures")
+    args = parser.parse_args()
+    failures = check_query_plans(verbose=args.verbose)
+    if failures:
+        print(f"{len(failures)} query plan regression(s):")
+        for failure in failures:
+            print(f"  - {failure}")
+        sys.exit(1)
+    print("All hot query paths use indexes.")
+
+
+if __name__ == "__main__":
+    main()
@@ -11,7 +11,7 @@ from datetime import datetime, timedelta, timezone
 
 from sqlalchemy import and_, delete, or_
 
-from app.core.database import SessionLocal
+from app.core.database import WorkerSessionLocal
 from app.models import AuthSession
 
 
@@ -31,7 +31,7 @@ def cleanup_auth_sessions(grace_days: int = 7) -> int:
         )
     )
 
-    with SessionLocal() as session:
+    with WorkerSessionLocal() as session:
         result = session.execute(stmt)
         session.commit()
         deleted = result.rowcount or 0
@@ -9,7 +9,7 @@ from datetime import datetime, timedelta, timezone
 
 from sqlalchemy import delete
 
-from app.core.database import SessionLocal
+from app.core.database import WorkerSessionLocal
 from app.models import ChangeLog
 
 
@@ -18,7 +18,7 @@ def cleanup_change_logs(max_age_days: int = 90) -> int:
     cutoff = datetime.now(timezone.utc) - timedelta(days=max_age_days)
     stmt = delete(ChangeLog).where(ChangeLog.created_at < cutoff)
 
-    with SessionLocal() as session:
+    with WorkerSessionLocal() as session:
         result = session.execute(stmt)
         session.commit()
         deleted = result.rowcount or 0
@@ -0,0 +1,45 @@
+"""Prune the lesson change sequence behind GET /lessons/changes.
+
+Clients holding a cursor older than the retention window get 410 Gone and resync in full.
+"""
+from __future__ import annotations
+
+import argparse
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete
+
+from app.core.config import get_settings
+from app.core.database import WorkerSessionLocal
+from app.models import LessonChange
+
+
+def cleanup_lesson_changes(max_age_days: int | None = None) -> int:
+    """Delete change rows older than the retention window."""
+    if max_age_days is None:
+        max_age_days = get_settings().lesson_changes_retention_days
+    cutoff = datetime.now(timezone.utc) - timedelta(days=max_age_days)
+    stmt = delete(LessonChange).where(LessonChange.changed_at < cutoff)
+
+    with WorkerSessionLocal() as session:
+        result = session.execute(stmt)
+        session.commit()
+        deleted = result.rowcount or 0
+    return deleted
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Prune the lesson change sequence")
+    parser.add_argument(
+        "--max-age-days",
+        type=int,
+        default=None,
+        help="Delete changes older than this many days (default: LESSON_CHANGES_RETENTION_DAYS)",
+    )
+    args = parser.parse_args()
+    deleted = cleanup_lesson_changes(max_age_days=args.max_age_days)
+    print(f"Deleted {deleted} lesson change record(s).")
+
+
+if __name__ == "__main__":
+    main()
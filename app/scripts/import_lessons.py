@@ -0,0 +1,381 @@
+"""Import a timetable CSV straight into Postgres.
+
+The file is streamed with COPY into a temporary staging table, natural keys are resolved to ids
+with set-based joins and the result is merged into `lessons` in one transaction, together with
+bulk audit entries, one summary notification per recipient and timetable version bumps. Memory
+use does not depend on the file size.
+
+Expected CSV header (extra columns are not allowed):
+
+    subject_code,room_building,room_number,group_code,lecturer_email,starts_at,ends_at,lesson_type
+
+`starts_at`/`ends_at` accept anything Postgres parses as timestamptz (ISO 8601 with offset
+recommended). Rows already present (same group, subject and start) are skipped, so a file
+can be re-imported safely; with LESSON_OVERLAP_CONSTRAINTS on, rows that would double-book a
+room, lecturer or group are rejected.
+
+    python -m app.scripts.import_lessons timetable.csv --actor-email admin@example.edu
+
+Large files run longer than DB_STATEMENT_TIMEOUT_MS, so the import lifts the statement timeout
+for its transaction; pass `--statement-timeout-ms` to keep a limit.
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+from sqlalchemy import select, text
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.core.database import WorkerSessionLocal
+from app.models import User
+
+CSV_COLUMNS = (
+    "subject_code",
+    "room_building",
+    "room_number",
+    "group_code",
+    "lecturer_email",
+    "starts_at",
+    "ends_at",
+    "lesson_type",
+)
+MAX_REPORTED_ERRORS = 20
+
+STAGING_SQL = """
+CREATE TEMP TABLE lesson_import (
+    line_no bigserial,
+    subject_code text,
+    room_building text,
+    room_number text,
+    group_code text,
+    lecturer_email text,
+    starts_at timestamptz,
+    ends_at timestamptz,
+    lesson_type text
+) ON COMMIT DROP
+"""
+
+# Rooms and groups are not unique by their natural keys; ambiguous keys are reported, not guessed.
+RESOLVE_SQL = """
+CREATE TEMP TABLE lesson_import_resolved ON COMMIT DROP AS
+SELECT i.line_no,
+       s.id AS subject_id,
+       CASE WHEN r.matches = 1 THEN r.id END AS room_id,
+       CASE WHEN g.matches = 1 THEN g.id END AS group_id,
+       u.id AS lecturer_user_id,
+       i.starts_at,
+       i.ends_at,
+       i.lesson_type,
+       concat_ws(', ',
+           CASE WHEN s.id IS NULL THEN 'unknown subject ' || quote_literal(coalesce(i.subject_code, '')) END,
+           CASE WHEN r.id IS NULL THEN 'unknown room ' || quote_literal(concat_ws(' ', i.room_building, i.room_number))
+                WHEN r.matches > 1 THEN 'ambiguous room ' || quote_literal(concat_ws(' ', i.room_building, i.room_number)) END,
+           CASE WHEN g.id IS NULL THEN 'unknown group ' || quote_literal(coalesce(i.group_code, ''))
+                WHEN g.matches > 1 THEN 'ambiguous group ' || quote_literal(i.group_code) END,
+           CASE WHEN u.id IS NULL THEN 'unknown lecturer ' || quote_literal(coalesce(i.lecturer_email, '')) END,
+           CASE WHEN i.starts_at IS NULL OR i.ends_at IS NULL OR i.ends_at <= i.starts_at
+                THEN 'ends_at must be after starts_at' END,
+           CASE WHEN coalesce(i.lesson_type, '') = '' THEN 'missing lesson_type' END
+       ) AS error
+FROM lesson_import AS i
+LEFT JOIN subjects AS s ON s.code = i.subject_code
+LEFT JOIN (
+    SELECT building, number, min(id) AS id, count(*) AS matches FROM rooms GROUP BY building, number
+) AS r ON r.building = i.room_building AND r.number = i.room_number
+LEFT JOIN (
+    SELECT code, min(id) AS id, count(*) AS matches FROM groups GROUP BY code
+) AS g ON g.code = i.group_code
+LEFT JOIN users AS u ON lower(u.email) = lower(i.lecturer_email)
+"""
+
+# With LESSON_OVERLAP_CONSTRAINTS on, rows that would trip the ex_lessons_*_overlap exclusion
+# constraints, or double-book an occurrence of a recurrence rule, are rejected up front, so one
+# double-booked line does not abort the whole import. Exact re-imports (same group, subject and
+# start) are not conflicts; MERGE_SQL skips them. Within the file, each row is compared with the
+# running maximum end of the rows starting before it on the same room, lecturer and group, which
+# keeps the check at a few sorts instead of a self-join; of two overlapping rows the one starting
+# later is rejected.
+CONFLICTS_SQL = """
+UPDATE lesson_import_resolved AS r
+SET error = 'overlaps lesson ' || l.id
+FROM lessons AS l
+WHERE r.error = ''
+  AND l.status <> 'cancelled'
+  AND tstzrange(l.starts_at, l.ends_at) && tstzrange(r.starts_at, r.ends_at)
+  AND (l.room_id = r.room_id OR l.lecturer_user_id = r.lecturer_user_id OR l.group_id = r.group_id)
+  AND NOT (l.group_id = r.group_id AND l.subject_id = r.subject_id AND l.starts_at = r.starts_at);
+
+UPDATE lesson_import_resolved AS r
+SET error = 'overlaps recurrence ' || o.recurrence_id
+FROM (
+    -- Same expansion as lesson_service.LESSON_CONFLICTS_SQL: only the occurrences around each row.
+    SELECT DISTINCT ON (i.line_no) i.line_no, rule.id AS recurrence_id
+    FROM lesson_import_resolved AS i
+    JOIN lesson_recurrences AS rule
+      ON rule.starts_at < i.ends_at
+     AND rule.last_starts_at + (rule.ends_at - rule.starts_at) > i.starts_at
+     AND (rule.room_id = i.room_id OR rule.lecturer_user_id = i.lecturer_user_id OR rule.group_id = i.group_id)
+    CROSS JOIN LATERAL generate_series(
+        rule.starts_at + make_interval(0, 0, 0, 0, rule.interval_days * 24 * greatest(
+            0, floor(extract(epoch FROM i.starts_at - rule.ends_at) / (rule.interval_days * 86400))
+        )::integer),
+        least(rule.last_starts_at, i.ends_at),
+        make_interval(0, 0, 0, 0, rule.interval_days * 24)
+    ) AS occurrence(starts_at)
+    WHERE i.error = ''
+      AND rule.status <> 'cancelled'
+      AND occurrence.starts_at < i.ends_at
+      AND occurrence.starts_at + (rule.ends_at - rule.starts_at) > i.starts_at
+      AND occurrence.starts_at <> ALL(rule.exdates)
+    ORDER BY i.line_no, rule.id
+) AS o
+WHERE r.line_no = o.line_no;
+
+WITH candidates AS (
+    -- Repeated lines for the same group, subject and start are one lesson (see MERGE_SQL).
+    SELECT DISTINCT ON (group_id, subject_id, starts_at)
+           line_no, room_id, lecturer_user_id, group_id, subject_id, starts_at, ends_at
+    FROM lesson_import_resolved
+    WHERE error = ''
+    ORDER BY group_id, subject_id, starts_at, line_no
+), previous AS (
+    -- Per resource, the latest end (and its line) among the rows that start before this one.
+    SELECT c.*,
+           max(ARRAY[extract(epoch FROM ends_at), line_no]) OVER (
+               PARTITION BY room_id ORDER BY starts_at, line_no
+               ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING) AS room_previous,
+           max(ARRAY[extract(epoch FROM ends_at), line_no]) OVER (
+               PARTITION BY lecturer_user_id ORDER BY starts_at, line_no
+               ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING) AS lecturer_previous,
+           max(ARRAY[extract(epoch FROM ends_at), line_no]) OVER (
+               PARTITION BY group_id ORDER BY starts_at, line_no
+               ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING) AS group_previous
+    FROM candidates AS c
+), clashes AS (
+    SELECT group_id, subject_id, starts_at,
+           CASE WHEN starts_at < to_timestamp(room_previous[1]) THEN room_previous[2]
+                WHEN starts_at < to_timestamp(lecturer_previous[1]) THEN lecturer_previous[2]
+                WHEN starts_at < to_timestamp(group_previous[1]) THEN group_previous[2]
+           END AS other_line_no
+    FROM previous
+)
+UPDATE lesson_import_resolved AS r
+SET error = 'overlaps line ' || (c.other_line_no::bigint + 1)
+FROM clashes AS c
+WHERE c.other_line_no IS NOT NULL
+  AND r.error = ''
+  AND r.group_id = c.group_id
+  AND r.subject_id = c.subject_id
+  AND r.starts_at = c.starts_at;
+"""
+
+MERGE_SQL = """
+CREATE TEMP TABLE lesson_import_created ON COMMIT DROP AS
+SELECT * FROM lessons WITH NO DATA;
+
+WITH candidates AS (
+    SELECT DISTINCT ON (group_id, subject_id, starts_at)
+           subject_id, lecturer_user_id, room_id, group_id, starts_at, ends_at, lesson_type
+    FROM lesson_import_resolved
+    WHERE error = ''
+    ORDER BY group_id, subject_id, starts_at, line_no
+), inserted AS (
+    INSERT INTO lessons (subject_id, lecturer_user_id, room_id, group_id,
+                         starts_at, ends_at, status, lesson_type)
+    SELECT c.subject_id, c.lecturer_user_id, c.room_id, c.group_id,
+           c.starts_at, c.ends_at, :status, c.lesson_type
+    FROM candidates AS c
+    WHERE NOT EXISTS (
+        SELECT 1 FROM lessons AS l
+        WHERE l.group_id = c.group_id
+          AND l.subject_id = c.subject_id
+          AND l.starts_at = c.starts_at
+    )
+    RETURNING *
+)
+INSERT INTO lesson_import_created SELECT * FROM inserted;
+"""
+
+# Same shape as audit_service.serialize_model (UTC ISO timestamps; the session runs in UTC).
+AUDIT_SQL = """
+INSERT INTO change_logs (actor_user_id, entity, entity_id, action, old_data, new_data, created_at)
+SELECT :actor_user_id, 'lessons', c.id, 'create', NULL, to_jsonb(c), now()
+FROM lesson_import_created AS c
+"""
+
+# Same payload as lesson_service._bulk_notification_payload, one row per recipient.
+OUTBOX_SQL = """
+INSERT INTO notification_outbox (user_id, payload, delivery_status, read_status, attempts, created_at)
+SELECT recipients.user_id,
+       jsonb_build_object(
+           'title', 'Timetable updated',
+           'body', CASE
+               WHEN count(*) = 1 THEN 'New lesson at '
+                   || to_char(min(recipients.starts_at), 'YYYY-MM-DD HH24:MI') || ' - '
+                   || to_char(min(recipients.ends_at), 'YYYY-MM-DD HH24:MI')
+               ELSE count(*) || ' new lessons scheduled between '
+                   || to_char(min(recipients.starts_at), 'YYYY-MM-DD HH24:MI') || ' and '
+                   || to_char(max(recipients.starts_at), 'YYYY-MM-DD HH24:MI')
+           END,
+           'data', jsonb_build_object(
+               'action', 'bulk_created',
+               'lesson_id', (array_agg(recipients.id ORDER BY recipients.starts_at, recipients.id))[1],
+               'lessons', count(*),
+               'starts_at', to_jsonb(min(recipients.starts_at)),
+               'last_starts_at', to_jsonb(max(recipients.starts_at))
+           )
+       ),
+       'queued', 'unread', 0, now()
+FROM (
+    SELECT c.id, c.starts_at, c.ends_at, c.lecturer_user_id AS user_id
+    FROM lesson_import_created AS c
+    UNION
+    SELECT c.id, c.starts_at, c.ends_at, s.user_id
+    FROM lesson_import_created AS c
+    JOIN student_group_selection AS s ON s.group_id = c.group_id
+) AS recipients
+GROUP BY recipients.user_id
+"""
+
+# Same rows as lesson_change_service.record_lesson_changes for created lessons.
+CHANGES_SQL = """
+INSERT INTO lesson_changes (lesson_id, group_id, lecturer_user_id, action)
+SELECT c.id, c.group_id, c.lecturer_user_id, 'upsert'
+FROM lesson_import_created AS c
+ORDER BY c.starts_at, c.id
+"""
+
+VERSIONS_SQL = """
+INSERT INTO timetable_versions (scope, entity_id)
+SELECT scope, entity_id FROM (
+    SELECT 'group' AS scope, group_id AS entity_id FROM lesson_import_created
+    UNION
+    SELECT 'lecturer', lecturer_user_id FROM lesson_import_created
+) AS touched
+ORDER BY scope, entity_id
+ON CONFLICT (scope, entity_id)
+DO UPDATE SET version = timetable_versions.version + 1, updated_at = now()
+"""
+
+
+def _copy_csv(session: Session, path: Path, *, delimiter: str) -> int:
+    cursor = session.connection().connection.driver_connection.cursor()
+    try:
+        with path.open("r", encoding="utf-8", newline="") as handle:
+            cursor.copy_expert(
+                f"COPY lesson_import ({', '.join(CSV_COLUMNS)}) FROM STDIN "
+                f"WITH (FORMAT csv, HEADER true, DELIMITER {delimiter!r})",
+                handle,
+            )
+    finally:
+        cursor.close()
+    return session.scalar(text("SELECT count(*) FROM lesson_import")) or 0
+
+
+def import_lessons(
+    path: Path,
+    *,
+    actor_email: str,
+    status: str = "scheduled",
+    delimiter: str = ",",
+    dry_run: bool = False,
+    statement_timeout_ms: int = 0,
+) -> dict[str, int]:
+    """Import a timetable CSV; returns counters for staged, created, skipped and rejected rows.
+
+    `statement_timeout_ms` replaces DB_STATEMENT_TIMEOUT_MS for the import's transaction
+    (0 = no limit).
+    """
+    with WorkerSessionLocal() as session:
+        actor_user_id = session.scalar(select(User.id).where(User.email == actor_email))
+        if actor_user_id is None:
+            raise SystemExit(f"Actor {actor_email!r} not found")
+
+        session.execute(text("SET LOCAL timezone = 'UTC'"))
+        session.execute(text(f"SET LOCAL statement_timeout = {int(statement_timeout_ms)}"))
+        session.execute(text(STAGING_SQL))
+        staged = _copy_csv(session, path, delimiter=delimiter)
+        session.execute(text("ANALYZE lesson_import"))
+        session.execute(text(RESOLVE_SQL))
+        if status != "cancelled" and get_settings().lesson_overlap_constraints:
+            for statement in CONFLICTS_SQL.split(";"):
+                if statement.strip():
+                    session.execute(text(statement))
+
+        rejected = session.scalar(
+            text("SELECT count(*) FROM lesson_import_resolved WHERE error <> ''")
+        ) or 0
+        if rejected:
+            for line_no, error in session.execute(
+                text(
+                    "SELECT line_no, error FROM lesson_import_resolved WHERE error <> '' "
+                    "ORDER BY line_no LIMIT :limit"
+                ),
+                {"limit": MAX_REPORTED_ERRORS},
+            ):
+                # line_no counts data rows; +1 accounts for the header line.
+                print(f"line {line_no + 1}: {error}", file=sys.stderr)
+            if rejected > MAX_REPORTED_ERRORS:
+                print(f"... and {rejected - MAX_REPORTED_ERRORS} more rejected row(s)", file=sys.stderr)
+
+        for statement in MERGE_SQL.split(";"):
+            if statement.strip():
+                session.execute(text(statement), {"status": status})
+        created = session.scalar(text("SELECT count(*) FROM lesson_import_created")) or 0
+        if created:
+            session.execute(text(AUDIT_SQL), {"actor_user_id": actor_user_id})
+            session.execute(text(OUTBOX_SQL))
+            session.execute(text(CHANGES_SQL))
+            session.execute(text(VERSIONS_SQL))
+
+        if dry_run:
+            session.rollback()
+        else:
+            session.commit()
+
+    return {
+        "staged": staged,
+        "created": created,
+        "skipped": staged - rejected - created,
+        "rejected": rejected,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Import lessons from a timetable CSV via COPY")
+    parser.add_argument("path", type=Path, help="CSV file with a header row")
+    parser.add_argument(
+        "--actor-email", required=True, help="Existing user recorded as the author in the audit log"
+    )
+    parser.add_argument("--status", default="scheduled", help="Status for imported lessons")
+    parser.add_argument("--delimiter", default=",", help="CSV field delimiter (default: ',')")
+    parser.add_argument(
+        "--dry-run", action="store_true", help="Resolve and merge, then roll everything back"
+    )
+    parser.add_argument(
+        "--statement-timeout-ms",
+        type=int,
+        default=0,
+        help="statement_timeout for the import transaction (default: 0, no limit)",
+    )
+    args = parser.parse_args()
+    summary = import_lessons(
+        args.path,
+        actor_email=args.actor_email,
+        status=args.status,
+        delimiter=args.delimiter,
+        dry_run=args.dry_run,
+        statement_timeout_ms=args.statement_timeout_ms,
+    )
+    suffix = " (dry run, rolled back)" if args.dry_run else ""
+    print(
+        f"Staged {summary['staged']}, created {summary['created']}, "
+        f"skipped {summary['skipped']} existing/duplicate, rejected {summary['rejected']}{suffix}."
+    )
+
+
+if __name__ == "__main__":
+    main()
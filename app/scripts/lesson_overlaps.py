@@ -0,0 +1,178 @@
+"""Report, clean up and enforce lesson double-bookings.
+
+The `ex_lessons_*_overlap` exclusion constraints are optional and no migration installs them:
+they can only be added to a table without overlapping non-cancelled lessons. Fix the data and
+add them here, then turn on LESSON_OVERLAP_CONSTRAINTS so writes are checked against them:
+
+    python -m app.scripts.lesson_overlaps              # list overlapping lesson pairs
+    python -m app.scripts.lesson_overlaps --cancel --actor-email admin@example.edu
+                                                       # cancel the later lesson of each pair
+    python -m app.scripts.lesson_overlaps --enforce    # add the constraints
+    python -m app.scripts.lesson_overlaps --drop       # remove them again
+
+`--enforce` exits with status 1, adding nothing, while overlaps remain or if Postgres rejects
+the constraints (e.g. btree_gist is not available).
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+
+from sqlalchemy import select, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+
+from app.core.database import WorkerSessionLocal
+from app.models import User
+from app.services import lesson_service
+
+CONSTRAINTS = (
+    ("ex_lessons_room_overlap", "room_id"),
+    ("ex_lessons_lecturer_overlap", "lecturer_user_id"),
+    ("ex_lessons_group_overlap", "group_id"),
+)
+
+_OVERLAPS_SQL = """
+SELECT a.id AS first_id, b.id AS second_id
+FROM lessons AS a
+JOIN lessons AS b
+  ON a.{column} = b.{column}
+ AND (a.starts_at, a.id) < (b.starts_at, b.id)
+ AND tstzrange(a.starts_at, a.ends_at) && tstzrange(b.starts_at, b.ends_at)
+WHERE a.status <> 'cancelled' AND b.status <> 'cancelled'
+ORDER BY a.starts_at, a.id, b.id
+{limit}
+"""
+
+# Lessons that overlap an earlier lesson which itself starts clean, so in a chain A/B/C only B
+# goes (C is re-checked on the next pass once B is out of the way).
+_CANCEL_SQL = """
+SELECT DISTINCT b.id
+FROM lessons AS a
+JOIN lessons AS b
+  ON a.{column} = b.{column}
+ AND (a.starts_at, a.id) < (b.starts_at, b.id)
+ AND tstzrange(a.starts_at, a.ends_at) && tstzrange(b.starts_at, b.ends_at)
+WHERE a.status <> 'cancelled' AND b.status <> 'cancelled'
+  AND NOT EXISTS (
+      SELECT 1
+      FROM lessons AS e
+      WHERE e.{column} = a.{column}
+        AND e.status <> 'cancelled'
+        AND (e.starts_at, e.id) < (a.starts_at, a.id)
+        AND tstzrange(e.starts_at, e.ends_at) && tstzrange(a.starts_at, a.ends_at)
+  )
+"""
+
+
+def find_overlaps(connection: Connection, *, limit: int | None = None) -> list[tuple[str, int, int]]:
+    """(constraint, first lesson id, second lesson id) for every overlapping pair."""
+    overlaps: list[tuple[str, int, int]] = []
+    for name, column in CONSTRAINTS:
+        sql = _OVERLAPS_SQL.format(column=column, limit=f"LIMIT {int(limit)}" if limit else "")
+        overlaps.extend((name, first, second) for first, second in connection.execute(text(sql)))
+    return overlaps
+
+
+def installed_constraints(connection: Connection) -> set[str]:
+    rows = connection.execute(
+        text("SELECT conname FROM pg_constraint WHERE conrelid = 'lessons'::regclass AND contype = 'x'")
+    )
+    return {name for (name,) in rows}
+
+
+def add_constraints(connection: Connection) -> list[str]:
+    """Add the missing exclusion constraints; the table must be free of overlaps."""
+    connection.execute(text("CREATE EXTENSION IF NOT EXISTS btree_gist"))
+    existing = installed_constraints(connection)
+    added: list[str] = []
+    for name, column in CONSTRAINTS:
+        if name in existing:
+            continue
+        connection.execute(
+            text(
+                f"""
+                ALTER TABLE lessons ADD CONSTRAINT {name}
+                EXCLUDE USING gist ({column} WITH =, tstzrange(starts_at, ends_at) WITH &&)
+                WHERE (status <> 'cancelled')
+                """
+            )
+        )
+        added.append(name)
+    return added
+
+
+def drop_constraints(connection: Connection) -> None:
+    for name, _ in reversed(CONSTRAINTS):
+        connection.execute(text(f"ALTER TABLE lessons DROP CONSTRAINT IF EXISTS {name}"))
+
+
+def cancel_overlaps(session: Session, *, actor_user_id: int) -> int:
+    """Cancel the later lesson of every overlapping pair, audited and notified like any other
+    lesson update (one transaction per pass); returns how many were cancelled."""
+    total = 0
+    while True:
+        lesson_ids = {
+            lesson_id
+            for _, column in CONSTRAINTS
+            for (lesson_id,) in session.execute(text(_CANCEL_SQL.format(column=column)))
+        }
+        if not lesson_ids:
+            return total
+        total += lesson_service.cancel_lessons(session, lesson_ids, actor_user_id=actor_user_id)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Report, clean up and enforce lesson double-bookings")
+    action = parser.add_mutually_exclusive_group()
+    action.add_argument(
+        "--cancel", action="store_true", help="Cancel the later lesson of each overlapping pair"
+    )
+    action.add_argument("--enforce", action="store_true", help="Add the exclusion constraints")
+    action.add_argument("--drop", action="store_true", help="Drop the exclusion constraints")
+    parser.add_argument("--limit", type=int, default=50, help="Pairs to list per resource")
+    parser.add_argument(
+        "--actor-email", help="Existing user recorded as the author in the audit log (--cancel)"
+    )
+    args = parser.parse_args()
+    if args.cancel and not args.actor_email:
+        parser.error("--cancel requires --actor-email")
+
+    with WorkerSessionLocal() as session:
+        session.execute(text("SET LOCAL statement_timeout = 0"))
+        if args.cancel:
+            actor_user_id = session.scalar(select(User.id).where(User.email == args.actor_email))
+            if actor_user_id is None:
+                raise SystemExit(f"Actor {args.actor_email!r} not found")
+            cancelled = cancel_overlaps(session, actor_user_id=actor_user_id)
+            print(f"Cancelled {cancelled} overlapping lesson(s).")
+            return
+        connection = session.connection()
+        if args.drop:
+            drop_constraints(connection)
+            session.commit()
+            print("Dropped the lesson overlap constraints; set LESSON_OVERLAP_CONSTRAINTS=false.")
+            return
+        overlaps = find_overlaps(connection, limit=None if args.enforce else args.limit)
+        for name, first, second in overlaps:
+            print(f"{name}: lessons {first} and {second} overlap")
+        if not args.enforce:
+            print(f"{len(overlaps)} overlapping pair(s) listed.")
+            return
+        if overlaps:
+            print("Resolve the overlaps above (e.g. with --cancel) before enforcing.", file=sys.stderr)
+            sys.exit(1)
+        try:
+            added = add_constraints(connection)
+            session.commit()
+        except DBAPIError as exc:
+            session.rollback()
+            print(f"Could not add the lesson overlap constraints: {exc.orig}", file=sys.stderr)
+            sys.exit(1)
+        print(f"Added {len(added)} constraint(s): {', '.join(added) or 'already installed'}.")
+        print("Set LESSON_OVERLAP_CONSTRAINTS=true to check lesson writes against them.")
+
+
+if __name__ == "__main__":
+    main()
@@ -26,6 +26,7 @@ from app.models import (
     Subject,
     User,
 )
+from app.services import version_service
 
 
 def _truncate_tables(session: Session) -> None:
@@ -33,7 +34,8 @@ def _truncate_tables(session: Session) -> None:
     session.execute(
             text(
                 "TRUNCATE TABLE "
-                "student_group_selection, notification_outbox, lessons, groups, group_types, "
+                "student_group_selection, notification_outbox, lesson_changes, lessons, "
+                "lesson_recurrences, groups, group_types, "
                 "rooms, subjects, specializations, program_years, programs, fcm_tokens, "
                 "lecturer_profiles, change_logs, auth_sessions, users, roles "
                 "RESTART IDENTITY CASCADE"
@@ -232,6 +234,8 @@ def seed() -> None:
             )
 
             session.flush()  # ensure inserts are written before sequence sync
+            # Timetable data was replaced wholesale; invalidate every cached ETag.
+            version_service.bump_catalog_version(session)
             _sync_sequences(
                 session,
                 [
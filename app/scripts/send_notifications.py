@@ -5,7 +5,7 @@ from __future__ import annotations
 import argparse
 
 from app.core.config import get_settings
-from app.core.database import SessionLocal
+from app.core.database import WorkerSessionLocal
 from app.services.push_service import process_outbox
 
 
@@ -23,7 +23,7 @@ def send_queued_notifications(
         print("FCM credentials not configured; set FCM_SERVICE_ACCOUNT_JSON or FCM_SERVER_KEY.")
         return {"processed": 0, "sent": 0, "failed": 0, "skipped": 0}
 
-    with SessionLocal() as session:
+    with WorkerSessionLocal() as session:
         summary = process_outbox(
             session,
             server_key=server_key,
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
 from datetime import datetime, timezone
-from typing import Any, Iterable
+from uuid import UUID
+from typing import Any, Iterable, Mapping
 
+from sqlalchemy import insert
 from sqlalchemy.inspection import inspect
 from sqlalchemy.orm import Session
 
@@ -15,9 +17,18 @@ def _serialize_value(value: Any) -> Any:
         if value.tzinfo is None:
             return value.isoformat()
         return value.astimezone(timezone.utc).isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, (list, tuple)):
+        return [_serialize_value(item) for item in value]
     return value
 
 
+def serialize_values(values: Mapping[str, Any]) -> dict[str, Any]:
+    """Snapshot a plain column mapping (e.g. a RETURNING row) like `serialize_model` does."""
+    return {key: _serialize_value(value) for key, value in values.items()}
+
+
 def serialize_model(instance: Any, *, fields: Iterable[str] | None = None) -> dict[str, Any]:
     """Take a shallow snapshot of a model's column values."""
     if instance is None:
@@ -57,3 +68,30 @@ def record_change(
             created_at=datetime.now(timezone.utc),
         )
     )
+
+
+def record_changes(
+    db: Session,
+    *,
+    actor_user_id: int,
+    entity: str,
+    action: str,
+    entries: Iterable[tuple[int, dict[str, Any] | None, dict[str, Any] | None]],
+) -> int:
+    """Append many change log entries with one bulk INSERT; entries are (entity_id, old, new)."""
+    now = datetime.now(timezone.utc)
+    rows = [
+        {
+            "actor_user_id": actor_user_id,
+            "entity": entity,
+            "entity_id": entity_id,
+            "action": action,
+            "old_data": old_data,
+            "new_data": new_data,
+            "created_at": now,
+        }
+        for entity_id, old_data, new_data in entries
+    ]
+    if rows:
+        db.execute(insert(ChangeLog), rows)
+    return len(rows)
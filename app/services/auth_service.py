@@ -11,10 +11,11 @@ from sqlalchemy.orm import Session, joinedload
 
 from app.core import security
 from app.core.config import get_settings
-from app.models import AuthSession
+from app.models import AuthSession, Lesson, LessonRecurrence
 from app.models.users import Role, User
 from app.schemas.auth import AuthTokens, LogoutRequest, MicrosoftAuthRequest
 from app.schemas.users import UserProfile
+from app.services import version_service
 from app.services.microsoft_oauth import oauth_client
 
 
@@ -59,19 +60,19 @@ def refresh_session(db: Session, refresh_token: str) -> AuthTokens:
     return _issue_tokens(db, user)
 
 
-def logout(db: Session, actor: User, payload: Optional[LogoutRequest]) -> None:
+def logout(db: Session, user_id: int, payload: Optional[LogoutRequest]) -> None:
     refresh_token = payload.refresh_token if payload else None
     if refresh_token is None:
-        _revoke_all_sessions(db, actor.id, reason="logout all sessions")
+        _revoke_all_sessions(db, user_id, reason="logout all sessions")
         return
 
     data = _decode_refresh(refresh_token)
-    if data["user_id"] != actor.id:
+    if data["user_id"] != user_id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
 
     session = _get_session_by_token(db, refresh_token)
-    if session is None or session.user_id != actor.id:
-        _revoke_all_sessions(db, actor.id, reason="logout token not found")
+    if session is None or session.user_id != user_id:
+        _revoke_all_sessions(db, user_id, reason="logout token not found")
         return
 
     _revoke_session(db, session, reason="logout")
@@ -89,9 +90,13 @@ def _get_or_create_user(db: Session, *, email: str, name: str) -> User:
     stmt = select(User).options(joinedload(User.role)).where(User.email == email)
     user = db.execute(stmt).scalar_one_or_none()
     if user:
-        user.name = name
-        db.commit()
-        db.refresh(user)
+        if user.name != name:
+            user.name = name
+            if user.role and user.role.code == "lecturer":
+                _bump_lecturer_versions(db, user.id)
+            version_service.queue_invalidation(db, [(version_service.USER, user.id)])
+            db.commit()
+            db.refresh(user)
         return user
 
     role = _get_default_role(db)
@@ -108,6 +113,19 @@ def _get_or_create_user(db: Session, *, email: str, name: str) -> User:
     return user
 
 
+def _bump_lecturer_versions(db: Session, user_id: int) -> None:
+    """A lecturer's name is embedded in their lessons: bump the lecturer's timetable version and
+    those of the groups they teach, and drop the cached weeks that show them."""
+    group_ids = db.scalars(
+        select(Lesson.group_id)
+        .where(Lesson.lecturer_user_id == user_id)
+        .union(select(LessonRecurrence.group_id).where(LessonRecurrence.lecturer_user_id == user_id))
+    ).all()
+    keys = [(version_service.LECTURER, user_id)]
+    keys += [(version_service.GROUP, group_id) for group_id in group_ids]
+    version_service.bump_versions(db, keys, invalidate=[*keys, (version_service.USER_NAME, user_id)])
+
+
 def _get_default_role(db: Session) -> Role:
     settings = get_settings()
     stmt = select(Role).where(Role.code == settings.auth_default_role_code)
@@ -169,6 +187,7 @@ def _revoke_session(db: Session, session: AuthSession, *, reason: str) -> None:
         return
     session.revoked_at = _now()
     session.revoked_reason = reason
+    version_service.queue_invalidation(db, [(version_service.AUTH_SESSION, session.jti)])
     db.commit()
 
 
@@ -179,6 +198,7 @@ def _revoke_all_sessions(db: Session, user_id: int, *, reason: str) -> None:
         .where(AuthSession.user_id == user_id, AuthSession.revoked_at.is_(None))
         .values(revoked_at=now, revoked_reason=reason)
     )
+    version_service.queue_invalidation(db, [(version_service.USER, user_id)])
     db.commit()
 
 
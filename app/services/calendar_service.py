@@ -0,0 +1,283 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import secrets
+import threading
+from collections import OrderedDict
+from datetime import datetime, time, timedelta, timezone
+from typing import Any, Iterable, NamedTuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.models import CalendarFeedToken, Group, StudentGroupSelection, User
+from app.models.users import Role
+from app.services import lesson_service, version_service
+from app.services.version_service import CATALOG_KEY, GROUP, LECTURER, VersionKey
+
+PRODID = "-//AB Planner//Timetable//EN"
+UID_DOMAIN = "ab-planner"
+# Students without a group selection get an empty calendar rather than a broken subscription.
+EMPTY = "empty"
+
+
+class FeedOwner(NamedTuple):
+    user_id: int
+    role: str
+    group_id: int | None
+
+
+class RenderedFeed(NamedTuple):
+    body: bytes
+    etag: str
+    last_modified: datetime
+
+
+class FeedCache:
+    """Bounded LRU of rendered `.ics` bodies.
+
+    Keys embed the data versions the body was built from, so a bump simply makes old entries
+    unreachable; they are never served stale and age out of the LRU on their own.
+    """
+
+    def __init__(self, *, max_entries: int) -> None:
+        self._max_entries = max_entries
+        self._entries: OrderedDict[tuple, RenderedFeed] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, key: tuple) -> RenderedFeed | None:
+        with self._lock:
+            feed = self._entries.get(key)
+            if feed is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return feed
+
+    def put(self, key: tuple, feed: RenderedFeed) -> None:
+        if self._max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = feed
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_entries": self._max_entries,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+            }
+
+
+feed_cache = FeedCache(max_entries=get_settings().calendar_feed_cache_size)
+
+
+def _hash_token(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+def issue_feed_token(db: Session, *, user_id: int) -> str:
+    """Create or rotate the user's feed token; the plain value is only ever returned here."""
+    token = secrets.token_urlsafe(32)
+    now = datetime.now(timezone.utc)
+    stmt = insert(CalendarFeedToken).values(
+        user_id=user_id, token_hash=_hash_token(token), created_at=now
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[CalendarFeedToken.user_id],
+        set_={"token_hash": stmt.excluded.token_hash, "created_at": stmt.excluded.created_at},
+    )
+    db.execute(stmt)
+    db.commit()
+    return token
+
+
+def revoke_feed_token(db: Session, *, user_id: int) -> None:
+    db.execute(delete(CalendarFeedToken).where(CalendarFeedToken.user_id == user_id))
+    db.commit()
+
+
+async def resolve_feed_token_async(db: AsyncSession, token: str) -> FeedOwner:
+    """Owner of a feed token, with role and group selection, in one round trip."""
+    stmt = (
+        select(CalendarFeedToken.user_id, Role.code, StudentGroupSelection.group_id)
+        .join(User, User.id == CalendarFeedToken.user_id)
+        .join(Role, Role.id == User.role_id)
+        .outerjoin(StudentGroupSelection, StudentGroupSelection.user_id == CalendarFeedToken.user_id)
+        .where(CalendarFeedToken.token_hash == _hash_token(token))
+        .limit(1)
+    )
+    row = (await db.execute(stmt)).one_or_none()
+    if row is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Calendar feed not found")
+    user_id, role_code, group_id = row
+    return FeedOwner(user_id=user_id, role=(role_code or "").lower(), group_id=group_id)
+
+
+def owner_scope(owner: FeedOwner) -> tuple[str, int]:
+    """Timetable behind a "my" feed: a student's selected group, otherwise the user's teaching."""
+    if owner.role == "student":
+        if owner.group_id is None:
+            return EMPTY, owner.user_id
+        return GROUP, owner.group_id
+    return LECTURER, owner.user_id
+
+
+def _window(now: datetime) -> tuple[datetime, datetime, datetime]:
+    """(day start, feed start, feed end); the window moves once a day so bodies stay cacheable."""
+    settings = get_settings()
+    day_start = datetime.combine(now.date(), time.min, tzinfo=timezone.utc)
+    return (
+        day_start,
+        day_start - timedelta(days=settings.calendar_feed_past_days),
+        day_start + timedelta(days=settings.calendar_feed_future_days),
+    )
+
+
+def _escape(value: str) -> str:
+    return (
+        value.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def _fold(line: str) -> str:
+    """Fold a content line at 75 octets (RFC 5545 3.1) without splitting UTF-8 sequences."""
+    if len(line.encode("utf-8")) <= 75:
+        return line
+    parts: list[str] = []
+    chunk = ""
+    size = 0
+    for char in line:
+        width = len(char.encode("utf-8"))
+        if size + width > (75 if not parts else 74):
+            parts.append(chunk)
+            chunk, size = "", 0
+        chunk += char
+        size += width
+    parts.append(chunk)
+    return "\r\n ".join(parts)
+
+
+def _format_utc(value: datetime) -> str:
+    return value.astimezone(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def _event_uid(lesson: Any) -> str:
+    if lesson.id is None:
+        return f"recurrence-{lesson.recurrence_id}-{_format_utc(lesson.starts_at)}@{UID_DOMAIN}"
+    return f"lesson-{lesson.id}@{UID_DOMAIN}"
+
+
+def render_calendar(lessons: Iterable[Any], *, name: str, stamp: datetime) -> bytes:
+    """VCALENDAR for `Lesson` rows and occurrences; `stamp` is used as DTSTAMP so equal data
+    renders byte-identical bodies."""
+    dtstamp = _format_utc(stamp)
+    lines = [
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        f"PRODID:{PRODID}",
+        "CALSCALE:GREGORIAN",
+        "METHOD:PUBLISH",
+        f"X-WR-CALNAME:{_escape(name)}",
+        "REFRESH-INTERVAL;VALUE=DURATION:PT1H",
+        "X-PUBLISHED-TTL:PT1H",
+    ]
+    for lesson in lessons:
+        summary = f"{lesson.subject.name} ({lesson.lesson_type})"
+        location = f"{lesson.room.building} {lesson.room.number}"
+        description = f"Lecturer: {lesson.lecturer.name}\nGroup: {lesson.group.code}"
+        lines.extend(
+            [
+                "BEGIN:VEVENT",
+                f"UID:{_event_uid(lesson)}",
+                f"DTSTAMP:{dtstamp}",
+                f"DTSTART:{_format_utc(lesson.starts_at)}",
+                f"DTEND:{_format_utc(lesson.ends_at)}",
+                f"SUMMARY:{_escape(summary)}",
+                f"LOCATION:{_escape(location)}",
+                f"DESCRIPTION:{_escape(description)}",
+                "STATUS:CANCELLED" if lesson.status == "cancelled" else "STATUS:CONFIRMED",
+                "END:VEVENT",
+            ]
+        )
+    lines.append("END:VCALENDAR")
+    return ("\r\n".join(_fold(line) for line in lines) + "\r\n").encode("utf-8")
+
+
+async def _feed_name(db: AsyncSession, scope: str, entity_id: int) -> str:
+    if scope == GROUP:
+        group = await db.get(Group, entity_id)
+        if group is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Group not found")
+        return f"Group {group.code}"
+    if scope == LECTURER:
+        user = await db.get(User, entity_id)
+        if user is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Lecturer not found")
+        return user.name
+    return "My timetable"
+
+
+async def get_feed_async(db: AsyncSession, *, scope: str, entity_id: int) -> RenderedFeed:
+    """Rendered feed for a group or lecturer timetable, served from `feed_cache` when current.
+
+    A hit costs a single primary-key lookup of the data versions; lessons are only loaded and
+    rendered when the group/lecturer or catalog version (or the daily window) has moved.
+    """
+    day_start, date_from, date_to = _window(datetime.now(timezone.utc))
+    keys: list[VersionKey] = [CATALOG_KEY]
+    if scope != EMPTY:
+        keys.append((scope, entity_id))
+    stamps = await version_service.get_version_stamps_async(db, keys)
+    # Shifting the window changes the body too, so it counts as a modification.
+    last_modified = max(
+        [day_start] + [stamp.updated_at for stamp in stamps.values() if stamp.updated_at]
+    ).replace(microsecond=0)
+    versions = sorted((scope_, id_, stamp.version) for (scope_, id_), stamp in stamps.items())
+    cache_key = (scope, entity_id, day_start.date().isoformat(), tuple(versions))
+
+    feed = feed_cache.get(cache_key)
+    if feed is not None:
+        return feed
+
+    name = await _feed_name(db, scope, entity_id)
+    lessons: list[Any] = []
+    if scope != EMPTY:
+        lessons = await lesson_service.list_lessons_async(
+            db,
+            group_id=entity_id if scope == GROUP else None,
+            lecturer_user_id=entity_id if scope == LECTURER else None,
+            date_from=date_from,
+            date_to=date_to,
+        )
+    raw_key = json.dumps(cache_key, default=str)
+    feed = RenderedFeed(
+        body=render_calendar(lessons, name=name, stamp=last_modified),
+        etag='"' + hashlib.sha256(raw_key.encode("utf-8")).hexdigest()[:32] + '"',
+        last_modified=last_modified,
+    )
+    feed_cache.put(cache_key, feed)
+    return feed
@@ -1,13 +1,16 @@
 from __future__ import annotations
 
+from datetime import datetime
 from typing import Any
 
-from fastapi import HTTPException
-from sqlalchemy import select
+from fastapi import HTTPException, status
+from sqlalchemy import Select, all_, exists, func, select, true
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.models import Room, Subject
+from app.models import Lesson, LessonRecurrence, Room, Subject
+from app.services import recurrence_service, version_service
 from app.services.audit_service import record_change, serialize_model
 
 
@@ -29,6 +32,11 @@ def list_subjects(db: Session) -> list[Subject]:
     return list(db.scalars(stmt).all())
 
 
+async def list_subjects_async(db: AsyncSession) -> list[Subject]:
+    result = await db.scalars(select(Subject).order_by(Subject.id))
+    return list(result.all())
+
+
 def get_subject(db: Session, subject_id: int) -> Subject:
     subject = db.get(Subject, subject_id)
     if not subject:
@@ -75,6 +83,7 @@ def update_subject(
         old_data=before,
         new_data=serialize_model(subject),
     )
+    version_service.bump_catalog_version(db, (version_service.SUBJECT, subject.id))
     db.commit()
     db.refresh(subject)
     return subject
@@ -105,6 +114,75 @@ def list_rooms(db: Session) -> list[Room]:
     return list(db.scalars(stmt).all())
 
 
+async def list_rooms_async(db: AsyncSession) -> list[Room]:
+    result = await db.scalars(select(Room).order_by(Room.id))
+    return list(result.all())
+
+
+def _available_rooms_stmt(
+    *,
+    starts_at: datetime,
+    ends_at: datetime,
+    min_capacity: int | None = None,
+    building: str | None = None,
+) -> Select:
+    # Anti-join probe per room; the predicate mirrors ix_lessons_room_period (room_id, period,
+    # non-cancelled) so each probe is a single lookup in that partial GiST index.
+    busy = exists().where(
+        Lesson.room_id == Room.id,
+        func.tstzrange(Lesson.starts_at, Lesson.ends_at).op("&&")(
+            func.tstzrange(starts_at, ends_at)
+        ),
+        Lesson.status != "cancelled",
+    )
+    # Occurrences of recurrence rules are not stored as lessons; expand the (few) rules of each
+    # room in SQL and apply the same overlap test.
+    rule = LessonRecurrence
+    duration = rule.ends_at - rule.starts_at
+    occurrence = recurrence_service.occurrence_series()
+    busy_rule = exists(
+        select(1)
+        .select_from(rule)
+        .join(occurrence, true())
+        .where(
+            rule.room_id == Room.id,
+            rule.status != "cancelled",
+            rule.starts_at < ends_at,
+            rule.last_starts_at + duration > starts_at,
+            occurrence.c.starts_at < ends_at,
+            occurrence.c.starts_at + duration > starts_at,
+            occurrence.c.starts_at != all_(rule.exdates),
+        )
+    )
+    stmt = select(Room).where(~busy, ~busy_rule)
+    if min_capacity is not None:
+        stmt = stmt.where(Room.capacity >= min_capacity)
+    if building is not None:
+        stmt = stmt.where(Room.building == building)
+    return stmt.order_by(Room.building, Room.number, Room.id)
+
+
+async def list_available_rooms_async(
+    db: AsyncSession,
+    *,
+    starts_at: datetime,
+    ends_at: datetime,
+    min_capacity: int | None = None,
+    building: str | None = None,
+) -> list[Room]:
+    """Rooms with no non-cancelled lesson overlapping [starts_at, ends_at)."""
+    if ends_at <= starts_at:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="ends_at must be after starts_at"
+        )
+    result = await db.scalars(
+        _available_rooms_stmt(
+            starts_at=starts_at, ends_at=ends_at, min_capacity=min_capacity, building=building
+        )
+    )
+    return list(result.all())
+
+
 def get_room(db: Session, room_id: int) -> Room:
     room = db.get(Room, room_id)
     if not room:
@@ -161,6 +239,7 @@ def update_room(
         old_data=before,
         new_data=serialize_model(room),
     )
+    version_service.bump_catalog_version(db, (version_service.ROOM, room.id))
     db.commit()
     db.refresh(room)
     return room
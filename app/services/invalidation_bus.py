@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+import asyncpg
+
+from app.core.config import get_settings
+from app.services import version_service
+
+
+def _on_notification(_connection: Any, _pid: int, _channel: str, payload: str) -> None:
+    origin, keys = version_service.decode_invalidations(payload)
+    if origin == version_service.PROCESS_ID:
+        # Already applied by this process's own after-commit hook.
+        return
+    if keys is None:
+        version_service.reset_caches()
+    else:
+        version_service.apply_invalidations(keys)
+
+
+async def _connect() -> asyncpg.Connection:
+    # Always the primary: NOTIFY is published there and standbys do not support LISTEN.
+    settings = get_settings()
+    return await asyncpg.connect(
+        host=settings.db_host,
+        port=settings.db_port,
+        user=settings.db_user,
+        password=settings.db_password,
+        database=settings.db_name,
+    )
+
+
+async def run_invalidation_listener(
+    stop_event: asyncio.Event,
+    *,
+    keepalive_seconds: float = 30,
+    retry_seconds: float = 5,
+) -> None:
+    """LISTEN for cache invalidations committed by other workers and apply them in this one.
+
+    Notifications sent while the connection is down are lost, so in-process caches are reset
+    whenever the listener (re)connects and after it loses its connection.
+    """
+    if not get_settings().cache_invalidation_bus:
+        return
+
+    while not stop_event.is_set():
+        connection = None
+        lost = asyncio.Event()
+        try:
+            connection = await _connect()
+            connection.add_termination_listener(lambda _connection: lost.set())
+            await connection.add_listener(version_service.INVALIDATION_CHANNEL, _on_notification)
+            version_service.reset_caches()
+            while not stop_event.is_set() and not lost.is_set():
+                try:
+                    await asyncio.wait_for(stop_event.wait(), timeout=keepalive_seconds)
+                except asyncio.TimeoutError:
+                    # Detects half-open connections that never report termination.
+                    await asyncio.wait_for(connection.execute("SELECT 1"), timeout=keepalive_seconds)
+        except Exception:
+            # Swallow exceptions to keep the listener alive; add logging if needed.
+            pass
+        finally:
+            if connection is not None and not connection.is_closed():
+                try:
+                    await connection.close(timeout=retry_seconds)
+                except Exception:
+                    connection.terminate()
+        if stop_event.is_set():
+            return
+        version_service.reset_caches()
+        try:
+            await asyncio.wait_for(stop_event.wait(), timeout=retry_seconds)
+        except asyncio.TimeoutError:
+            continue
@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import base64
+from datetime import datetime, timedelta, timezone
+from typing import Any, Iterable, NamedTuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import BigInteger, Text, cast, func, insert, select, true, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.models import LessonChange
+from app.models.lessons import XID8
+
+UPSERT = "upsert"
+DELETE = "delete"
+
+Snapshot = dict[str, Any]
+
+
+class ChangeCursor(NamedTuple):
+    """Position (txid, seq) in `lesson_changes` and when it was reached (for retention checks)."""
+
+    txid: int
+    seq: int
+    issued_at: datetime
+
+
+class ChangeRow(NamedTuple):
+    txid: int
+    seq: int
+    lesson_id: int | None
+    recurrence_id: int | None
+    action: str
+    changed_at: datetime
+
+
+def _change_rows(
+    pairs: Iterable[tuple[Snapshot | None, Snapshot | None]], id_column: str
+) -> list[dict[str, Any]]:
+    rows: list[dict[str, Any]] = []
+
+    def row(snapshot: Snapshot, action: str) -> dict[str, Any]:
+        return {
+            id_column: snapshot["id"],
+            "group_id": snapshot["group_id"],
+            "lecturer_user_id": snapshot["lecturer_user_id"],
+            "action": action,
+        }
+
+    for before, after in pairs:
+        if after is None:
+            if before is not None:
+                rows.append(row(before, DELETE))
+            continue
+        if before is not None and (
+            before["group_id"] != after["group_id"]
+            or before["lecturer_user_id"] != after["lecturer_user_id"]
+        ):
+            # Readers scoped to the old group/lecturer must drop the lesson.
+            rows.append(row(before, DELETE))
+        rows.append(row(after, UPSERT))
+    return rows
+
+
+def _record(db: Session, rows: list[dict[str, Any]]) -> None:
+    if rows:
+        db.execute(insert(LessonChange), rows)
+
+
+def record_lesson_changes(
+    db: Session, pairs: Iterable[tuple[Snapshot | None, Snapshot | None]]
+) -> None:
+    """Append (before, after) lesson snapshots to the change sequence in the caller's transaction."""
+    _record(db, _change_rows(pairs, "lesson_id"))
+
+
+def record_recurrence_changes(
+    db: Session, pairs: Iterable[tuple[Snapshot | None, Snapshot | None]]
+) -> None:
+    """Same for recurrence rules; readers replace all occurrences of a changed rule."""
+    _record(db, _change_rows(pairs, "recurrence_id"))
+
+
+def encode_cursor(cursor: ChangeCursor) -> str:
+    raw = f"{cursor.txid}|{cursor.seq}|{int(cursor.issued_at.timestamp())}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> ChangeCursor:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        txid, seq, issued_at = base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8").split("|")
+        return ChangeCursor(
+            int(txid), int(seq), datetime.fromtimestamp(int(issued_at), tz=timezone.utc)
+        )
+    except (ValueError, UnicodeError) as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor") from exc
+
+
+def _ensure_retained(cursor: ChangeCursor) -> None:
+    retention = timedelta(days=get_settings().lesson_changes_retention_days)
+    if cursor.issued_at < datetime.now(timezone.utc) - retention:
+        raise HTTPException(
+            status_code=status.HTTP_410_GONE,
+            detail="Cursor is older than the change retention window; resync the full timetable",
+        )
+
+
+def _horizon():
+    # Oldest transaction still in flight: every change below it is committed (or rolled back) and
+    # visible to this statement, so a cursor never has to move past an unfinished write.
+    return cast(cast(func.pg_snapshot_xmin(func.pg_current_snapshot()), Text), BigInteger)
+
+
+def _page_stmt(
+    after: ChangeCursor, *, group_id: int | None, lecturer_user_id: int | None, limit: int
+):
+    txid = cast(cast(LessonChange.txid, Text), BigInteger)
+    changes = select(
+        txid.label("txid"),
+        LessonChange.seq,
+        LessonChange.lesson_id,
+        LessonChange.recurrence_id,
+        LessonChange.action,
+        LessonChange.changed_at,
+    ).where(
+        tuple_(LessonChange.txid, LessonChange.seq)
+        > tuple_(cast(cast(str(after.txid), Text), XID8), after.seq),
+        LessonChange.txid < func.pg_snapshot_xmin(func.pg_current_snapshot()),
+    )
+    if group_id is not None:
+        changes = changes.where(LessonChange.group_id == group_id)
+    if lecturer_user_id is not None:
+        changes = changes.where(LessonChange.lecturer_user_id == lecturer_user_id)
+    changes = changes.order_by(LessonChange.txid, LessonChange.seq).limit(limit + 1).subquery()
+    horizon = select(_horizon().label("horizon")).subquery()
+    # One statement, so the horizon and the rows come from the same snapshot.
+    return (
+        select(horizon.c.horizon, *[column for column in changes.c])
+        .select_from(horizon.outerjoin(changes, true()))
+        .order_by(changes.c.txid, changes.c.seq)
+    )
+
+
+async def read_changes_async(
+    db: AsyncSession,
+    cursor: str | None,
+    *,
+    group_id: int | None,
+    lecturer_user_id: int | None,
+    limit: int,
+) -> tuple[list[ChangeRow], str, bool]:
+    """One page of raw change rows after `cursor`, the cursor to continue from and `has_more`.
+
+    Without a cursor nothing is returned and the cursor marks the current head, so a client can
+    take it before its initial full download and sync from there. 410 once the cursor is older
+    than `LESSON_CHANGES_RETENTION_DAYS`.
+    """
+    now = datetime.now(timezone.utc)
+    if cursor is None:
+        head = (await db.execute(select(_horizon()))).scalar_one()
+        return [], encode_cursor(ChangeCursor(head, 0, now)), False
+
+    after = decode_cursor(cursor)
+    _ensure_retained(after)
+    result = await db.execute(
+        _page_stmt(after, group_id=group_id, lecturer_user_id=lecturer_user_id, limit=limit)
+    )
+    records = result.all()
+    horizon = records[0].horizon
+    rows = [
+        ChangeRow(row.txid, row.seq, row.lesson_id, row.recurrence_id, row.action, row.changed_at)
+        for row in records
+        if row.seq is not None
+    ]
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if has_more:
+        last = rows[-1]
+        next_cursor = ChangeCursor(last.txid, last.seq, last.changed_at)
+    elif horizon > after.txid:
+        next_cursor = ChangeCursor(horizon, 0, now)
+    else:
+        next_cursor = ChangeCursor(after.txid, after.seq, now)
+    return rows, encode_cursor(next_cursor), has_more
+
+
+def latest_actions(rows: Iterable[ChangeRow]) -> tuple[dict[int, str], dict[int, str]]:
+    """Last action per lesson id and per recurrence id within a page."""
+    lessons: dict[int, str] = {}
+    recurrences: dict[int, str] = {}
+    for row in rows:
+        if row.lesson_id is not None:
+            lessons[row.lesson_id] = row.action
+        elif row.recurrence_id is not None:
+            recurrences[row.recurrence_id] = row.action
+    return lessons, recurrences
@@ -1,29 +1,160 @@
 from __future__ import annotations
 
-from datetime import datetime, timedelta
-from typing import Any, Dict, Iterable
+import base64
+import heapq
+import uuid
+from collections import defaultdict
+from datetime import datetime, time, timedelta, timezone
+from itertools import islice
+from typing import Any, AsyncIterator, Dict, Iterable, Mapping, Sequence
 
 from fastapi import HTTPException, status
-from sqlalchemy import select
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import (
+    BigInteger,
+    Select,
+    Text,
+    all_,
+    case,
+    cast,
+    delete,
+    func,
+    insert,
+    literal,
+    null,
+    select,
+    text,
+    true,
+    tuple_,
+    union_all,
+    update,
+)
+from sqlalchemy.dialects.postgresql import JSON
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session, joinedload, selectinload
 
-from app.models import Group, Lesson, Room, StudentGroupSelection, Subject, User
-from app.services.audit_service import record_change, serialize_model
-from app.services import notification_service
+from app.core.config import get_settings
+from app.models import (
+    Group,
+    GroupType,
+    Lesson,
+    LessonRecurrence,
+    Program,
+    ProgramYear,
+    Room,
+    Specialization,
+    StudentGroupSelection,
+    Subject,
+    User,
+)
+from app.schemas.lessons import Lesson as LessonSchema
+from app.services.audit_service import (
+    record_change,
+    record_changes,
+    serialize_model,
+    serialize_values,
+)
+from app.services.reference_service import Reference
+from app.services import (
+    lesson_change_service,
+    notification_service,
+    recurrence_service,
+    reference_service,
+    timetable_cache,
+    version_service,
+)
+from app.services.recurrence_service import LessonOccurrence
 
 LessonModel = Lesson
+EXPORT_CHUNK_SIZE = 500
+BULK_CHUNK_SIZE = 1000
+EXCLUSION_VIOLATION = "23P01"
+CONFLICT_RESOURCES = ("room", "lecturer", "group")
+# Updates touching none of these cannot create a double-booking.
+CONFLICT_FIELDS = frozenset({"starts_at", "ends_at", "room_id", "lecturer_user_id", "group_id", "status"})
+
+# One round trip for any number of candidate slots; each probe can use the GiST indexes behind
+# the ex_lessons_*_overlap exclusion constraints. Recurrence rules are expanded only around each
+# candidate: the series starts at the last occurrence that could still be running at its start.
+LESSON_CONFLICTS_SQL = text(
+    """
+    WITH c AS (
+        SELECT *
+        FROM unnest(
+            CAST(:idx AS integer[]),
+            CAST(:starts_at AS timestamptz[]),
+            CAST(:ends_at AS timestamptz[]),
+            CAST(:room_ids AS bigint[]),
+            CAST(:lecturer_ids AS bigint[]),
+            CAST(:group_ids AS bigint[])
+        ) AS c(idx, starts_at, ends_at, room_id, lecturer_user_id, group_id)
+    )
+    SELECT c.idx,
+           c.starts_at AS candidate_starts_at,
+           c.ends_at AS candidate_ends_at,
+           l.id AS lesson_id,
+           NULL::bigint AS recurrence_id,
+           l.starts_at,
+           l.ends_at,
+           l.room_id = c.room_id AS room,
+           l.lecturer_user_id = c.lecturer_user_id AS lecturer,
+           l.group_id = c.group_id AS "group"
+    FROM c
+    JOIN lessons AS l
+      ON tstzrange(l.starts_at, l.ends_at) && tstzrange(c.starts_at, c.ends_at)
+     AND (l.room_id = c.room_id OR l.lecturer_user_id = c.lecturer_user_id OR l.group_id = c.group_id)
+    WHERE l.status <> 'cancelled'
+      AND l.id <> ALL(CAST(:exclude_ids AS bigint[]))
+    UNION ALL
+    SELECT c.idx,
+           c.starts_at,
+           c.ends_at,
+           NULL,
+           r.id,
+           o.starts_at,
+           o.starts_at + (r.ends_at - r.starts_at),
+           r.room_id = c.room_id,
+           r.lecturer_user_id = c.lecturer_user_id,
+           r.group_id = c.group_id
+    FROM c
+    JOIN lesson_recurrences AS r
+      ON r.starts_at < c.ends_at
+     AND r.last_starts_at + (r.ends_at - r.starts_at) > c.starts_at
+     AND (r.room_id = c.room_id OR r.lecturer_user_id = c.lecturer_user_id OR r.group_id = c.group_id)
+    CROSS JOIN LATERAL generate_series(
+        r.starts_at + make_interval(0, 0, 0, 0, r.interval_days * 24 * greatest(
+            0, floor(extract(epoch FROM c.starts_at - r.ends_at) / (r.interval_days * 86400))
+        )::integer),
+        least(r.last_starts_at, c.ends_at),
+        make_interval(0, 0, 0, 0, r.interval_days * 24)
+    ) AS o(starts_at)
+    WHERE r.status <> 'cancelled'
+      AND r.id <> ALL(CAST(:exclude_recurrence_ids AS bigint[]))
+      AND o.starts_at < c.ends_at
+      AND o.starts_at + (r.ends_at - r.starts_at) > c.starts_at
+      AND o.starts_at <> ALL(r.exdates)
+    ORDER BY idx, starts_at, lesson_id, recurrence_id
+    """
+)
 
 
 def _with_relations() -> Iterable:
-    """Common relationship loading for consistent API payloads."""
+    """Common relationship loading for consistent API payloads.
+
+    References are fetched with one IN query per relationship over the distinct keys of the
+    page, so lesson rows never repeat subject/room/group/program columns; the group query
+    joins its own small reference tables once per distinct group.
+    """
     return (
-        joinedload(LessonModel.subject),
-        joinedload(LessonModel.room),
-        joinedload(LessonModel.group).joinedload(Group.program),
-        joinedload(LessonModel.group).joinedload(Group.program_year),
-        joinedload(LessonModel.group).joinedload(Group.specialization),
-        joinedload(LessonModel.group).joinedload(Group.group_type),
-        joinedload(LessonModel.lecturer),
+        selectinload(LessonModel.subject),
+        selectinload(LessonModel.room),
+        selectinload(LessonModel.lecturer),
+        selectinload(LessonModel.group).options(
+            joinedload(Group.program),
+            joinedload(Group.program_year),
+            joinedload(Group.specialization),
+            joinedload(Group.group_type),
+        ),
     )
 
 
@@ -35,12 +166,182 @@ def _validate_time_window(starts_at: datetime, ends_at: datetime) -> None:
         )
 
 
-def _ensure_fk(db: Session, model, pk: int | None, label: str) -> None:
-    if pk is None:
+def _ensure_lesson_references(db: Session, data: Dict[str, Any]) -> None:
+    reference_service.ensure_references(
+        db,
+        [
+            Reference("Subject", Subject.id, data.get("subject_id")),
+            Reference("Lecturer", User.id, data.get("lecturer_user_id")),
+            Reference("Room", Room.id, data.get("room_id")),
+            Reference("Group", Group.id, data.get("group_id")),
+        ],
+    )
+
+
+def find_conflicts(
+    db: Session,
+    candidates: Sequence[Mapping[str, Any]],
+    *,
+    exclude_ids: Iterable[int] = (),
+    exclude_recurrence_ids: Iterable[int] = (),
+) -> list[dict[str, Any]]:
+    """Existing lessons and recurrence occurrences that would double-book a candidate's room,
+    lecturer or group.
+
+    Candidates are lesson dicts; cancelled candidates never conflict. Each result carries the
+    candidate's position (`index`), the lesson id or recurrence id it clashes with and the
+    overlapping resources.
+    """
+    active = [
+        (index, candidate)
+        for index, candidate in enumerate(candidates)
+        if candidate.get("status") != "cancelled"
+    ]
+    if not active:
+        return []
+    rows = db.execute(
+        LESSON_CONFLICTS_SQL,
+        {
+            "idx": [index for index, _ in active],
+            "starts_at": [candidate["starts_at"] for _, candidate in active],
+            "ends_at": [candidate["ends_at"] for _, candidate in active],
+            "room_ids": [candidate["room_id"] for _, candidate in active],
+            "lecturer_ids": [candidate["lecturer_user_id"] for _, candidate in active],
+            "group_ids": [candidate["group_id"] for _, candidate in active],
+            "exclude_ids": list(exclude_ids),
+            "exclude_recurrence_ids": list(exclude_recurrence_ids),
+        },
+    ).mappings()
+    return [
+        {
+            "index": row["idx"],
+            "starts_at": row["candidate_starts_at"],
+            "ends_at": row["candidate_ends_at"],
+            "conflicting_lesson_id": row["lesson_id"],
+            "conflicting_recurrence_id": row["recurrence_id"],
+            "conflicting_starts_at": row["starts_at"],
+            "conflicting_ends_at": row["ends_at"],
+            "resources": [resource for resource in CONFLICT_RESOURCES if row[resource]],
+        }
+        for row in rows
+    ]
+
+
+def internal_conflicts(candidates: Sequence[Mapping[str, Any]]) -> list[dict[str, Any]]:
+    """Overlaps among the candidates themselves (a batch or series), in the shape of
+    `find_conflicts` with `conflicting_index` instead of a lesson id.
+
+    One sweep per resource in start order: a candidate conflicts with the earlier one that
+    reaches furthest if that one is still running when it starts.
+    """
+    found: dict[tuple[int, int], list[str]] = {}
+    order = sorted(
+        (index for index, candidate in enumerate(candidates) if candidate.get("status") != "cancelled"),
+        key=lambda index: (candidates[index]["starts_at"], index),
+    )
+    for resource, column in zip(CONFLICT_RESOURCES, ("room_id", "lecturer_user_id", "group_id")):
+        furthest: dict[Any, tuple[datetime, int]] = {}
+        for index in order:
+            candidate = candidates[index]
+            previous = furthest.get(candidate[column])
+            if previous is not None and candidate["starts_at"] < previous[0]:
+                found.setdefault((index, previous[1]), []).append(resource)
+            if previous is None or candidate["ends_at"] > previous[0]:
+                furthest[candidate[column]] = (candidate["ends_at"], index)
+    return [
+        {
+            "index": index,
+            "starts_at": candidates[index]["starts_at"],
+            "ends_at": candidates[index]["ends_at"],
+            "conflicting_lesson_id": None,
+            "conflicting_recurrence_id": None,
+            "conflicting_index": other,
+            "conflicting_starts_at": candidates[other]["starts_at"],
+            "conflicting_ends_at": candidates[other]["ends_at"],
+            "resources": resources,
+        }
+        for (index, other), resources in sorted(found.items())
+    ]
+
+
+def _conflict_detail(conflict: Mapping[str, Any] | None, *, series: bool) -> dict[str, Any]:
+    detail: dict[str, Any] = {
+        "message": "Lesson overlaps an existing lesson",
+        "conflicting_lesson_id": conflict["conflicting_lesson_id"] if conflict else None,
+        "resources": conflict["resources"] if conflict else [],
+    }
+    if conflict and conflict.get("conflicting_index") is not None:
+        detail["message"] = "Occurrences of the series overlap each other"
+        detail["conflicting_occurrence"] = conflict["conflicting_index"]
+    elif conflict and conflict.get("conflicting_recurrence_id") is not None:
+        detail["message"] = "Lesson overlaps an occurrence of a recurring lesson"
+        detail["conflicting_recurrence_id"] = conflict["conflicting_recurrence_id"]
+        detail["conflicting_starts_at"] = conflict["conflicting_starts_at"].isoformat()
+    if conflict and series:
+        detail["occurrence"] = conflict["index"]
+    return detail
+
+
+def _ensure_no_conflicts(
+    db: Session,
+    candidates: Sequence[Mapping[str, Any]],
+    *,
+    exclude_ids: Iterable[int] = (),
+    exclude_recurrence_ids: Iterable[int] = (),
+) -> None:
+    """409 before writing if the candidates double-book anything, among themselves included.
+
+    Only with LESSON_OVERLAP_CONSTRAINTS on, i.e. with the exclusion constraints installed: their
+    GiST indexes serve the probe, which names the conflicting lesson and covers recurrence
+    occurrences; the constraints themselves also stop concurrent writers.
+    """
+    if not get_settings().lesson_overlap_constraints:
         return
-    exists = db.get(model, pk)
-    if not exists:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"{label} not found")
+    conflicts = internal_conflicts(candidates) or find_conflicts(
+        db, candidates, exclude_ids=exclude_ids, exclude_recurrence_ids=exclude_recurrence_ids
+    )
+    if conflicts:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=_conflict_detail(conflicts[0], series=len(candidates) > 1),
+        )
+
+
+def _is_exclusion_violation(exc: IntegrityError) -> bool:
+    return getattr(exc.orig, "pgcode", None) == EXCLUSION_VIOLATION
+
+
+def _conflict_error(
+    db: Session,
+    exc: IntegrityError,
+    candidates: Sequence[Mapping[str, Any]],
+    *,
+    exclude_ids: Iterable[int] = (),
+    exclude_recurrence_ids: Iterable[int] = (),
+) -> HTTPException | None:
+    """Translate an exclusion violation (a concurrent write won the race) into a 409 naming the
+    conflicting lesson; else None."""
+    if not _is_exclusion_violation(exc):
+        return None
+    db.rollback()
+    conflicts = find_conflicts(
+        db, candidates, exclude_ids=exclude_ids, exclude_recurrence_ids=exclude_recurrence_ids
+    )
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail=_conflict_detail(conflicts[0] if conflicts else None, series=len(candidates) > 1),
+    )
+
+
+def _conflict_candidate(lesson: LessonModel) -> dict[str, Any]:
+    return {
+        "starts_at": lesson.starts_at,
+        "ends_at": lesson.ends_at,
+        "room_id": lesson.room_id,
+        "lecturer_user_id": lesson.lecturer_user_id,
+        "group_id": lesson.group_id,
+        "status": lesson.status,
+    }
 
 
 def _format_dt(value: Any) -> str:
@@ -89,6 +390,20 @@ def _lesson_recipients(db: Session, lesson_data: dict[str, Any]) -> list[int]:
     return list(user_ids)
 
 
+def _change_labels(before: dict[str, Any], after: dict[str, Any]) -> list[str]:
+    changes: list[str] = []
+    for field, label in (
+        ("starts_at", "time"),
+        ("ends_at", "time"),
+        ("room_id", "room"),
+        ("status", "status"),
+        ("lesson_type", "type"),
+    ):
+        if before.get(field) != after.get(field) and label not in changes:
+            changes.append(label)
+    return changes
+
+
 def _lesson_notification_payload(
     action: str,
     lesson_data: dict[str, Any],
@@ -105,17 +420,7 @@ def _lesson_notification_payload(
     time_window = _time_window_str(lesson_data)
     place = f"{time_window} @ {room_label}" if time_window else room_label
 
-    changes: list[str] = []
-    if before:
-        for field, label in (
-            ("starts_at", "time"),
-            ("ends_at", "time"),
-            ("room_id", "room"),
-            ("status", "status"),
-            ("lesson_type", "type"),
-        ):
-            if before.get(field) != lesson_data.get(field):
-                changes.append(label)
+    changes = _change_labels(before, lesson_data) if before else []
     change_text = ", ".join(changes) if changes else "details updated"
 
     if action == "created":
@@ -170,21 +475,712 @@ def _enqueue_lesson_notifications(
     )
 
 
-def list_lessons(
+def _series_notification_payload(
+    snapshots: list[dict[str, Any]],
+    *,
+    repeat_every_days: int,
+    subject_name: str,
+    room_label: str,
+) -> dict[str, Any]:
+    """One notification describing a whole newly created series."""
+    first, last = snapshots[0], snapshots[-1]
+    count = len(snapshots)
+    time_window = _time_window_str(first)
+    place = f"{time_window} @ {room_label}" if time_window else room_label
+    if count == 1:
+        body = f"{subject_name} at {place}"
+    else:
+        body = (
+            f"{subject_name}: {count} lessons every {repeat_every_days} days "
+            f"from {place} until {_format_dt(last.get('starts_at'))}"
+        )
+    return {
+        "title": "New lesson series scheduled" if count > 1 else "New lesson scheduled",
+        "body": body,
+        "data": {
+            "lesson_id": first.get("id"),
+            "lesson_ids": [snapshot.get("id") for snapshot in snapshots],
+            "group_id": first.get("group_id"),
+            "subject_id": first.get("subject_id"),
+            "room_id": first.get("room_id"),
+            "action": "series_created" if count > 1 else "created",
+            "starts_at": first.get("starts_at"),
+            "ends_at": first.get("ends_at"),
+            "last_starts_at": last.get("starts_at"),
+            "occurrences": count,
+            "repeat_every_days": repeat_every_days,
+            "status": first.get("status"),
+            "lesson_type": first.get("lesson_type"),
+        },
+    }
+
+
+def _recurrence_notification_payload(
+    action: str,
+    rule: dict[str, Any],
+    *,
+    occurrences: int,
+    subject_name: str,
+    room_label: str,
+) -> dict[str, Any]:
+    """One notification per recipient for a whole recurrence rule (no per-occurrence fan-out)."""
+    every = f"every {rule.get('interval_days')} days"
+    until = _format_dt(rule.get("last_starts_at"))
+    if action == "deleted":
+        title = "Lesson series canceled"
+        body = f"{subject_name}: lessons {every} until {until} were canceled"
+    else:
+        title = "New lesson series scheduled"
+        time_window = _time_window_str(rule)
+        body = f"{subject_name}: {occurrences} lessons {every} from {time_window} @ {room_label} until {until}"
+    return {
+        "title": title,
+        "body": body,
+        "data": {
+            "action": f"recurrence_{action}",
+            "recurrence_id": rule.get("id"),
+            "series_id": rule.get("series_id"),
+            "group_id": rule.get("group_id"),
+            "subject_id": rule.get("subject_id"),
+            "room_id": rule.get("room_id"),
+            "starts_at": rule.get("starts_at"),
+            "ends_at": rule.get("ends_at"),
+            "last_starts_at": rule.get("last_starts_at"),
+            "interval_days": rule.get("interval_days"),
+            "occurrences": occurrences,
+            "status": rule.get("status"),
+            "lesson_type": rule.get("lesson_type"),
+        },
+    }
+
+
+def _enqueue_recurrence_notifications(
+    db: Session, *, action: str, rule: dict[str, Any], occurrences: int
+) -> None:
+    recipients = _lesson_recipients(db, rule)
+    if not recipients:
+        return
+    subject_name, room_label = _lesson_context(db, rule)
+    notification_service.enqueue_notifications_bulk(
+        db,
+        user_ids=recipients,
+        payload=_recurrence_notification_payload(
+            action,
+            rule,
+            occurrences=occurrences,
+            subject_name=subject_name,
+            room_label=room_label,
+        ),
+    )
+
+
+def _series_change_payload(
+    action: str,
+    pairs: Sequence[tuple[dict[str, Any], dict[str, Any] | None]],
+    *,
+    scope: str,
+    subject_name: str,
+    room_label: str,
+) -> dict[str, Any]:
+    """One notification summarizing an update or cancellation of several series occurrences."""
+    first_before, first_after = pairs[0]
+    if len(pairs) == 1:
+        return _lesson_notification_payload(
+            action, first_after or first_before, first_before, subject_name, room_label
+        )
+    first = first_after or first_before
+    last = pairs[-1][1] or pairs[-1][0]
+    count = len(pairs)
+    span = f"{count} lessons from {_format_dt(first.get('starts_at'))} until {_format_dt(last.get('starts_at'))}"
+    if action == "deleted":
+        title = "Lesson series canceled"
+        body = f"{subject_name}: {span} were canceled"
+    else:
+        changes = _change_labels(first_before, first)
+        change_text = ", ".join(changes) if changes else "details updated"
+        title = "Lesson series updated"
+        body = f"{subject_name}: {change_text} for {span}. {_time_window_str(first)} @ {room_label}"
+    data_payload = {
+        "lesson_id": first.get("id"),
+        "lesson_ids": [(after or before).get("id") for before, after in pairs],
+        "series_id": first.get("series_id"),
+        "scope": scope,
+        "group_id": first.get("group_id"),
+        "subject_id": first.get("subject_id"),
+        "room_id": first.get("room_id"),
+        "action": f"series_{action}",
+        "starts_at": first.get("starts_at"),
+        "ends_at": first.get("ends_at"),
+        "last_starts_at": last.get("starts_at"),
+        "occurrences": count,
+        "status": first.get("status"),
+        "lesson_type": first.get("lesson_type"),
+    }
+    if action != "deleted":
+        data_payload["previous"] = {
+            key: first_before.get(key)
+            for key in ("starts_at", "ends_at", "room_id", "status", "lesson_type")
+            if first_before.get(key) is not None
+        }
+    return {"title": title, "body": body, "data": data_payload}
+
+
+def _enqueue_series_change_notifications(
     db: Session,
     *,
+    action: str,
+    scope: str,
+    pairs: Sequence[tuple[dict[str, Any], dict[str, Any] | None]],
+) -> None:
+    """Coalesced fan-out: each recipient gets one notification covering the occurrences they
+    attend or teach, before or after the change."""
+    snapshots = [snapshot for pair in pairs for snapshot in pair if snapshot]
+    group_ids = {snapshot["group_id"] for snapshot in snapshots}
+    members: dict[int, set[int]] = defaultdict(set)
+    stmt = select(StudentGroupSelection.group_id, StudentGroupSelection.user_id).where(
+        StudentGroupSelection.group_id.in_(group_ids)
+    )
+    for group_id, user_id in db.execute(stmt):
+        members[group_id].add(user_id)
+
+    affected: dict[int, list[int]] = defaultdict(list)
+    for index, pair in enumerate(pairs):
+        user_ids: set[int] = set()
+        for snapshot in pair:
+            if snapshot:
+                user_ids |= members[snapshot["group_id"]] | {snapshot["lecturer_user_id"]}
+        for user_id in user_ids:
+            affected[user_id].append(index)
+    if not affected:
+        return
+
+    subject_name, room_label = _lesson_context(db, pairs[0][1] or pairs[0][0])
+    # Recipients of the same occurrences share one payload object.
+    payloads: dict[tuple[int, ...], dict[str, Any]] = {}
+    for indexes in affected.values():
+        key = tuple(indexes)
+        if key not in payloads:
+            payloads[key] = _series_change_payload(
+                action,
+                [pairs[index] for index in key],
+                scope=scope,
+                subject_name=subject_name,
+                room_label=room_label,
+            )
+    notification_service.enqueue_notification_batch(
+        db,
+        payloads={user_id: payloads[tuple(indexes)] for user_id, indexes in affected.items()},
+    )
+
+
+def encode_cursor(starts_at: datetime, lesson_id: int) -> str:
+    """Opaque keyset cursor for the (starts_at, id) ordering of lesson lists."""
+    raw = f"{starts_at.isoformat()}|{lesson_id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        starts_at_raw, lesson_id_raw = (
+            base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8").split("|", 1)
+        )
+        return datetime.fromisoformat(starts_at_raw), int(lesson_id_raw)
+    except (ValueError, UnicodeError) as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor") from exc
+
+
+def _filter_lessons(
+    stmt: Select,
+    *,
     group_id: int | None = None,
+    lecturer_user_id: int | None = None,
     date_from: datetime | None = None,
     date_to: datetime | None = None,
-) -> list[LessonModel]:
-    stmt = select(LessonModel).options(*_with_relations())
+    after: tuple[datetime, int] | None = None,
+    limit: int | None = None,
+) -> Select:
     if group_id is not None:
         stmt = stmt.where(LessonModel.group_id == group_id)
+    if lecturer_user_id is not None:
+        stmt = stmt.where(LessonModel.lecturer_user_id == lecturer_user_id)
     if date_from is not None:
         stmt = stmt.where(LessonModel.starts_at >= date_from)
     if date_to is not None:
         stmt = stmt.where(LessonModel.starts_at <= date_to)
-    return list(db.scalars(stmt).all())
+    if after is not None:
+        stmt = stmt.where(tuple_(LessonModel.starts_at, LessonModel.id) > tuple_(*after))
+    stmt = stmt.order_by(LessonModel.starts_at, LessonModel.id)
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    return stmt
+
+
+def _list_lessons_stmt(
+    *,
+    group_id: int | None = None,
+    lecturer_user_id: int | None = None,
+    date_from: datetime | None = None,
+    date_to: datetime | None = None,
+    after: tuple[datetime, int] | None = None,
+    limit: int | None = None,
+) -> Select:
+    return _filter_lessons(
+        select(LessonModel).options(*_with_relations()),
+        group_id=group_id,
+        lecturer_user_id=lecturer_user_id,
+        date_from=date_from,
+        date_to=date_to,
+        after=after,
+        limit=limit,
+    )
+
+
+def list_lessons(
+    db: Session,
+    *,
+    group_id: int | None = None,
+    lecturer_user_id: int | None = None,
+    date_from: datetime | None = None,
+    date_to: datetime | None = None,
+) -> list[LessonModel | LessonOccurrence]:
+    """Lessons plus the not-yet-materialized occurrences of recurrence rules, by (starts_at, id)."""
+    filters = dict(
+        group_id=group_id, lecturer_user_id=lecturer_user_id, date_from=date_from, date_to=date_to
+    )
+    lessons = db.scalars(_list_lessons_stmt(**filters)).all()
+    return recurrence_service.merge(lessons, recurrence_service.list_occurrences(db, **filters))
+
+
+async def list_lessons_async(
+    db: AsyncSession,
+    *,
+    group_id: int | None = None,
+    lecturer_user_id: int | None = None,
+    date_from: datetime | None = None,
+    date_to: datetime | None = None,
+) -> list[LessonModel | LessonOccurrence]:
+    filters = dict(
+        group_id=group_id, lecturer_user_id=lecturer_user_id, date_from=date_from, date_to=date_to
+    )
+    lessons = (await db.scalars(_list_lessons_stmt(**filters))).all()
+    occurrences = await recurrence_service.list_occurrences_async(db, **filters)
+    return recurrence_service.merge(lessons, occurrences)
+
+
+async def list_lessons_page_async(
+    db: AsyncSession,
+    *,
+    limit: int,
+    cursor: str | None = None,
+    group_id: int | None = None,
+    lecturer_user_id: int | None = None,
+    date_from: datetime | None = None,
+    date_to: datetime | None = None,
+) -> tuple[list[LessonModel | LessonOccurrence], str | None]:
+    """Return one keyset page ordered by (starts_at, id) plus the cursor for the next page, if any."""
+    after = decode_cursor(cursor) if cursor else None
+    filters = dict(
+        group_id=group_id,
+        lecturer_user_id=lecturer_user_id,
+        date_from=date_from,
+        date_to=date_to,
+        after=after,
+        limit=limit + 1,
+    )
+    lessons = (await db.scalars(_list_lessons_stmt(**filters))).all()
+    occurrences = await recurrence_service.list_occurrences_async(db, **filters)
+    page = recurrence_service.merge(lessons, occurrences, limit=limit + 1)
+    if len(page) <= limit:
+        return page, None
+    page = page[:limit]
+    return page, encode_cursor(*recurrence_service.sort_key(page[-1]))
+
+
+async def list_lesson_changes_async(
+    db: AsyncSession,
+    *,
+    cursor: str | None,
+    group_id: int | None = None,
+    lecturer_user_id: int | None = None,
+    limit: int,
+) -> dict[str, Any]:
+    """Delta since `cursor`: current state of created/updated lessons, deleted lesson ids, and the
+    rules whose occurrences must be replaced (their current occurrences are in `lessons`)."""
+    rows, next_cursor, has_more = await lesson_change_service.read_changes_async(
+        db, cursor, group_id=group_id, lecturer_user_id=lecturer_user_id, limit=limit
+    )
+    lesson_actions, rule_actions = lesson_change_service.latest_actions(rows)
+    upserted = [
+        lesson_id
+        for lesson_id, action in lesson_actions.items()
+        if action == lesson_change_service.UPSERT
+    ]
+    lessons: list[LessonModel | LessonOccurrence] = []
+    if upserted:
+        stmt = (
+            select(LessonModel)
+            .options(*_with_relations())
+            .where(LessonModel.id.in_(upserted))
+            .order_by(LessonModel.starts_at, LessonModel.id)
+        )
+        lessons = list((await db.scalars(stmt)).all())
+    found = {lesson.id for lesson in lessons}
+    # An upserted lesson that no longer exists was deleted after this page's horizon.
+    deleted = sorted(lesson_id for lesson_id in lesson_actions if lesson_id not in found)
+
+    upserted_rules = [
+        rule_id for rule_id, action in rule_actions.items() if action == lesson_change_service.UPSERT
+    ]
+    if upserted_rules:
+        rules = await recurrence_service.get_recurrences_async(db, upserted_rules)
+        occurrences = [occurrence for rule in rules for occurrence in recurrence_service.expand(rule)]
+        occurrences.sort(key=recurrence_service.sort_key)
+        lessons = recurrence_service.merge(lessons, occurrences)
+    return {
+        "lessons": lessons,
+        "deleted": deleted,
+        "replaced_recurrences": sorted(rule_actions),
+        "next_cursor": next_cursor,
+        "has_more": has_more,
+    }
+
+
+def _compact_columns(
+    source: Any, *, starts_at: Any, ends_at: Any, lesson_id: Any, recurrence_id: Any
+) -> list:
+    return [
+        lesson_id.label("id"),
+        recurrence_id.label("recurrence_id"),
+        starts_at.label("starts_at"),
+        ends_at.label("ends_at"),
+        source.status.label("status"),
+        source.lesson_type.label("lesson_type"),
+        source.subject_id.label("subject_id"),
+        Subject.name.label("subject_name"),
+        Subject.code.label("subject_code"),
+        source.room_id.label("room_id"),
+        Room.building.label("room_building"),
+        Room.number.label("room_number"),
+        source.group_id.label("group_id"),
+        Group.code.label("group_code"),
+        source.lecturer_user_id.label("lecturer_user_id"),
+        User.name.label("lecturer_name"),
+    ]
+
+
+def _compact_stmt(
+    source: Any,
+    columns: list,
+    *,
+    occurrence: Any = None,
+    user_id: int | None = None,
+    role: str | None = None,
+    group_id: int | None = None,
+    lecturer_user_id: int | None = None,
+) -> Select:
+    stmt = select(*columns).select_from(source)
+    if occurrence is not None:
+        stmt = stmt.join(occurrence, true())
+    stmt = (
+        stmt.join(Subject, Subject.id == source.subject_id)
+        .join(Room, Room.id == source.room_id)
+        .join(Group, Group.id == source.group_id)
+        .join(User, User.id == source.lecturer_user_id)
+    )
+    if user_id is not None:
+        if role == "student":
+            stmt = stmt.join(
+                StudentGroupSelection,
+                (StudentGroupSelection.group_id == source.group_id)
+                & (StudentGroupSelection.user_id == user_id),
+            )
+        else:
+            stmt = stmt.where(source.lecturer_user_id == user_id)
+    if group_id is not None:
+        stmt = stmt.where(source.group_id == group_id)
+    if lecturer_user_id is not None:
+        stmt = stmt.where(source.lecturer_user_id == lecturer_user_id)
+    return stmt
+
+
+def _compact_lessons_stmt(
+    *,
+    date_from: datetime | None = None,
+    date_to: datetime | None = None,
+    exclude_cancelled: bool = False,
+    limit: int | None = None,
+    **scope: Any,
+) -> Select:
+    """Lessons and rule occurrences as `LessonCompact` rows in one UNION ALL, ordered by
+    (starts_at, id) like every other lesson list; `scope` is passed to `_compact_stmt`."""
+    lessons = _compact_stmt(
+        LessonModel,
+        _compact_columns(
+            LessonModel,
+            starts_at=LessonModel.starts_at,
+            ends_at=LessonModel.ends_at,
+            lesson_id=LessonModel.id,
+            recurrence_id=cast(null(), BigInteger),
+        ),
+        **scope,
+    )
+    rule = LessonRecurrence
+    occurrence = recurrence_service.occurrence_series()
+    occurrences = _compact_stmt(
+        rule,
+        _compact_columns(
+            rule,
+            starts_at=occurrence.c.starts_at,
+            ends_at=occurrence.c.starts_at + (rule.ends_at - rule.starts_at),
+            lesson_id=cast(null(), BigInteger),
+            recurrence_id=rule.id,
+        ),
+        occurrence=occurrence,
+        **scope,
+    ).where(occurrence.c.starts_at != all_(rule.exdates))
+    if date_from is not None:
+        lessons = lessons.where(LessonModel.starts_at >= date_from)
+        occurrences = occurrences.where(
+            rule.last_starts_at >= date_from, occurrence.c.starts_at >= date_from
+        )
+    if date_to is not None:
+        lessons = lessons.where(LessonModel.starts_at <= date_to)
+        occurrences = occurrences.where(rule.starts_at <= date_to, occurrence.c.starts_at <= date_to)
+    if exclude_cancelled:
+        lessons = lessons.where(LessonModel.status != "cancelled")
+        occurrences = occurrences.where(rule.status != "cancelled")
+    combined = union_all(lessons, occurrences).subquery("compact_lessons")
+    stmt = select(combined).order_by(
+        combined.c.starts_at, func.coalesce(combined.c.id, -combined.c.recurrence_id)
+    )
+    return stmt.limit(limit) if limit is not None else stmt
+
+
+async def list_my_lessons_async(
+    db: AsyncSession,
+    *,
+    user_id: int,
+    role: str,
+    date_from: datetime | None = None,
+    date_to: datetime | None = None,
+) -> list[Mapping[str, Any]]:
+    """Personal timetable in one round trip: the selected group's lessons for students, the
+    user's own lessons otherwise; rows match `LessonCompact`."""
+    stmt = _compact_lessons_stmt(user_id=user_id, role=role, date_from=date_from, date_to=date_to)
+    return list((await db.execute(stmt)).mappings().all())
+
+
+async def list_upcoming_compact_async(
+    db: AsyncSession,
+    *,
+    group_id: int | None = None,
+    lecturer_user_id: int | None = None,
+    date_from: datetime,
+    limit: int,
+) -> list[Mapping[str, Any]]:
+    """The next `limit` non-cancelled lessons of a group or lecturer starting at `date_from` or later."""
+    stmt = _compact_lessons_stmt(
+        group_id=group_id,
+        lecturer_user_id=lecturer_user_id,
+        date_from=date_from,
+        exclude_cancelled=True,
+        limit=limit,
+    )
+    return list((await db.execute(stmt)).mappings().all())
+
+
+def _json_timestamp(column):
+    """Render a timestamptz exactly like Pydantic serializes an aware UTC datetime."""
+    utc = func.timezone("UTC", column)
+    fraction = case(
+        (func.date_trunc("second", utc) != utc, literal(".").concat(func.to_char(utc, "US", type_=Text))),
+        else_=literal(""),
+    )
+    return func.to_char(utc, 'YYYY-MM-DD"T"HH24:MI:SS', type_=Text).concat(fraction).concat("Z")
+
+
+def _lesson_json_stmt(**filters: Any) -> Select:
+    """Build each `schemas.lessons.Lesson` document in Postgres, keeping the schema's field order."""
+    document = func.json_build_object(
+        "id", LessonModel.id,
+        "starts_at", _json_timestamp(LessonModel.starts_at),
+        "ends_at", _json_timestamp(LessonModel.ends_at),
+        "status", LessonModel.status,
+        "lesson_type", LessonModel.lesson_type,
+        "series_id", LessonModel.series_id,
+        "recurrence_id", cast(null(), BigInteger),
+        "subject", func.json_build_object(
+            "id", Subject.id, "name", Subject.name, "code", Subject.code
+        ),
+        "room", func.json_build_object(
+            "id", Room.id,
+            "number", Room.number,
+            "building", Room.building,
+            "capacity", Room.capacity,
+        ),
+        "group", func.json_build_object(
+            "id", Group.id,
+            "code", Group.code,
+            "program", func.json_build_object("id", Program.id, "name", Program.name),
+            "year", func.json_build_object(
+                "id", ProgramYear.id, "program_id", ProgramYear.program_id, "year", ProgramYear.year
+            ),
+            "specialization", func.json_build_object(
+                "id", Specialization.id,
+                "program_id", Specialization.program_id,
+                "name", Specialization.name,
+            ),
+            "group_type", func.json_build_object("code", GroupType.code, "label", GroupType.label),
+        ),
+        "lecturer", func.json_build_object("id", User.id, "name", User.name, "email", User.email),
+        type_=JSON,
+    )
+    stmt = (
+        select(
+            cast(document, Text).label("document"),
+            LessonModel.starts_at,
+            LessonModel.id,
+        )
+        .join(Subject, Subject.id == LessonModel.subject_id)
+        .join(Room, Room.id == LessonModel.room_id)
+        .join(User, User.id == LessonModel.lecturer_user_id)
+        .join(Group, Group.id == LessonModel.group_id)
+        .join(Program, Program.id == Group.program_id)
+        .join(ProgramYear, ProgramYear.id == Group.program_year_id)
+        .join(Specialization, Specialization.id == Group.specialization_id)
+        .join(GroupType, GroupType.code == Group.group_type_code)
+    )
+    return _filter_lessons(stmt, **filters)
+
+
+async def list_lessons_json_async(
+    db: AsyncSession,
+    *,
+    limit: int | None = None,
+    cursor: str | None = None,
+    group_id: int | None = None,
+    lecturer_user_id: int | None = None,
+    date_from: datetime | None = None,
+    date_to: datetime | None = None,
+) -> tuple[bytes, str | None]:
+    """Same payload as `list_lessons_async` / `list_lessons_page_async`, pre-encoded as a JSON array.
+
+    Skips ORM hydration and Pydantic validation; parity with the schema is guarded by
+    `app.scripts.check_lesson_projection`.
+    """
+    after = decode_cursor(cursor) if cursor else None
+    filters = dict(
+        group_id=group_id,
+        lecturer_user_id=lecturer_user_id,
+        date_from=date_from,
+        date_to=date_to,
+        after=after,
+        limit=limit + 1 if limit is not None else None,
+    )
+    rows = (await db.execute(_lesson_json_stmt(**filters))).all()
+    occurrences = await recurrence_service.list_occurrences_async(db, **filters)
+    # Rule occurrences are rare next to lessons; they go through Pydantic and are merged in.
+    documents = heapq.merge(
+        (((row.starts_at, row.id), row.document.encode("utf-8")) for row in rows),
+        (
+            (recurrence_service.sort_key(occurrence), _encode_lesson(occurrence))
+            for occurrence in occurrences
+        ),
+        key=lambda item: item[0],
+    )
+    page = list(documents) if limit is None else list(islice(documents, limit + 1))
+    next_cursor = None
+    if limit is not None and len(page) > limit:
+        page = page[:limit]
+        next_cursor = encode_cursor(*page[-1][0])
+    body = b"[" + b",".join(document for _, document in page) + b"]"
+    return body, next_cursor
+
+
+def _encode_lesson(lesson: LessonModel | LessonOccurrence) -> bytes:
+    return LessonSchema.model_validate(lesson).model_dump_json().encode("utf-8")
+
+
+async def list_group_lessons_cached_async(
+    db: AsyncSession, *, group_id: int, date_from: datetime, date_to: datetime
+) -> bytes:
+    """Group-scoped `GET /lessons` body (same JSON as `list[Lesson]`) assembled from cached
+    (group, week) timetables; missing weeks are loaded together in one query.
+
+    Pass a primary session: invalidations fire on commit, so a lagging replica could re-cache
+    the state from before the write.
+    """
+    cache = timetable_cache.timetable_cache
+    weeks = timetable_cache.weeks_between(date_from, date_to)
+    entries = {monday: cache.get((group_id, monday)) for monday in weeks}
+    missing = [monday for monday, entry in entries.items() if entry is None]
+    if missing:
+        generation = cache.generation
+        load_from = datetime.combine(missing[0], time.min, tzinfo=timezone.utc)
+        load_to = datetime.combine(missing[-1], time.min, tzinfo=timezone.utc) + timedelta(weeks=1)
+        lessons = await list_lessons_async(
+            db, group_id=group_id, date_from=load_from, date_to=load_to - timedelta(microseconds=1)
+        )
+        by_week: dict[Any, list[Any]] = defaultdict(list)
+        for lesson in lessons:
+            by_week[version_service.week_start(lesson.starts_at)].append(lesson)
+        for monday in missing:
+            entry = timetable_cache.build_week(by_week.get(monday, []), _encode_lesson)
+            cache.put((group_id, monday), entry, generation=generation)
+            entries[monday] = entry
+    chunks = [
+        chunk
+        for monday in weeks
+        for chunk in timetable_cache.slice_week(entries[monday], date_from, date_to)
+    ]
+    return b"[" + b",".join(chunks) + b"]"
+
+
+async def stream_lessons_ndjson(
+    session_factory: async_sessionmaker[AsyncSession],
+    *,
+    group_id: int | None = None,
+    lecturer_user_id: int | None = None,
+    date_from: datetime | None = None,
+    date_to: datetime | None = None,
+    chunk_size: int = EXPORT_CHUNK_SIZE,
+) -> AsyncIterator[bytes]:
+    """Yield lessons as NDJSON in chunks via a server-side cursor, keeping memory flat.
+
+    The generator owns its session because it outlives the request's dependencies.
+    """
+    stmt = _list_lessons_stmt(
+        group_id=group_id, lecturer_user_id=lecturer_user_id, date_from=date_from, date_to=date_to
+    )
+    stmt = stmt.execution_options(yield_per=chunk_size)
+    async with session_factory() as db:
+        # Rule occurrences are loaded up front (bounded by the rules) and interleaved in order.
+        pending = iter(
+            await recurrence_service.list_occurrences_async(
+                db,
+                group_id=group_id,
+                lecturer_user_id=lecturer_user_id,
+                date_from=date_from,
+                date_to=date_to,
+            )
+        )
+        occurrence = next(pending, None)
+        result = await db.stream_scalars(stmt)
+        async for partition in result.partitions():
+            lines: list[bytes] = []
+            for lesson in partition:
+                while occurrence is not None and recurrence_service.sort_key(
+                    occurrence
+                ) < recurrence_service.sort_key(lesson):
+                    lines.append(_encode_lesson(occurrence) + b"\n")
+                    occurrence = next(pending, None)
+                lines.append(_encode_lesson(lesson) + b"\n")
+            yield b"".join(lines)
+            db.expunge_all()
+        remaining = [] if occurrence is None else [occurrence, *pending]
+        if remaining:
+            yield b"".join(_encode_lesson(item) + b"\n" for item in remaining)
 
 
 def get_lesson(db: Session, lesson_id: int) -> LessonModel:
@@ -196,15 +1192,19 @@ def get_lesson(db: Session, lesson_id: int) -> LessonModel:
 
 
 def create_lesson(db: Session, data: Dict[str, Any], *, actor_user_id: int) -> LessonModel:
-    _ensure_fk(db, Subject, data.get("subject_id"), "Subject")
-    _ensure_fk(db, User, data.get("lecturer_user_id"), "Lecturer")
-    _ensure_fk(db, Room, data.get("room_id"), "Room")
-    _ensure_fk(db, Group, data.get("group_id"), "Group")
+    _ensure_lesson_references(db, data)
     _validate_time_window(data["starts_at"], data["ends_at"])
+    _ensure_no_conflicts(db, [data])
 
     lesson = LessonModel(**data)
     db.add(lesson)
-    db.flush()
+    try:
+        db.flush()
+    except IntegrityError as exc:
+        conflict = _conflict_error(db, exc, [data])
+        if conflict is None:
+            raise
+        raise conflict from exc
     lesson_snapshot = serialize_model(lesson)
     record_change(
         db,
@@ -216,19 +1216,28 @@ def create_lesson(db: Session, data: Dict[str, Any], *, actor_user_id: int) -> L
         new_data=lesson_snapshot,
     )
     _enqueue_lesson_notifications(db, action="created", lesson_snapshot=lesson_snapshot)
+    lesson_change_service.record_lesson_changes(db, [(None, lesson_snapshot)])
+    version_service.bump_lesson_versions(db, lesson_snapshot)
     db.commit()
     db.refresh(lesson)
     return get_lesson(db, lesson.id)
 
 
-def create_lesson_series(
-    db: Session,
-    data: Dict[str, Any],
-    *,
-    occurrences: int,
-    repeat_every_days: int,
-    actor_user_id: int,
-) -> list[LessonModel]:
+def _series_rows(
+    data: Dict[str, Any], *, occurrences: int, repeat_every_days: int
+) -> list[Dict[str, Any]]:
+    interval = timedelta(days=repeat_every_days)
+    return [
+        {
+            **data,
+            "starts_at": data["starts_at"] + interval * index,
+            "ends_at": data["ends_at"] + interval * index,
+        }
+        for index in range(occurrences)
+    ]
+
+
+def _validate_series(data: Dict[str, Any], *, occurrences: int, repeat_every_days: int) -> None:
     if occurrences < 1:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="occurrences must be at least 1"
@@ -237,78 +1246,307 @@ def create_lesson_series(
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="repeat_every_days must be at least 1"
         )
-
-    _ensure_fk(db, Subject, data.get("subject_id"), "Subject")
-    _ensure_fk(db, User, data.get("lecturer_user_id"), "Lecturer")
-    _ensure_fk(db, Room, data.get("room_id"), "Room")
-    _ensure_fk(db, Group, data.get("group_id"), "Group")
     _validate_time_window(data["starts_at"], data["ends_at"])
 
-    interval = timedelta(days=repeat_every_days)
-    starts_at = data["starts_at"]
-    ends_at = data["ends_at"]
 
-    created: list[LessonModel] = []
-    for index in range(occurrences):
-        offset = interval * index
-        occurrence_data = {
-            **data,
-            "starts_at": starts_at + offset,
-            "ends_at": ends_at + offset,
-        }
-        lesson = LessonModel(**occurrence_data)
-        db.add(lesson)
-        created.append(lesson)
+def preview_lesson_series_conflicts(
+    db: Session,
+    data: Dict[str, Any],
+    *,
+    occurrences: int,
+    repeat_every_days: int,
+) -> dict[str, Any]:
+    """Dry run for `create_lesson_series`: every conflict of every occurrence, in one query."""
+    _validate_series(data, occurrences=occurrences, repeat_every_days=repeat_every_days)
+    _ensure_lesson_references(db, data)
+    rows = _series_rows(data, occurrences=occurrences, repeat_every_days=repeat_every_days)
+    conflicts = sorted(
+        internal_conflicts(rows) + find_conflicts(db, rows),
+        key=lambda conflict: (conflict["index"], conflict["conflicting_starts_at"]),
+    )
+    for conflict in conflicts:
+        conflict["conflicting_occurrence"] = conflict.pop("conflicting_index", None)
+    return {
+        "occurrences": occurrences,
+        "conflicts": [{"occurrence": conflict.pop("index"), **conflict} for conflict in conflicts],
+    }
 
-    db.flush()
 
-    for lesson in created:
-        lesson_snapshot = serialize_model(lesson)
-        record_change(
+def create_lesson_series(
+    db: Session,
+    data: Dict[str, Any],
+    *,
+    occurrences: int,
+    repeat_every_days: int,
+    actor_user_id: int,
+) -> list[LessonModel]:
+    _validate_series(data, occurrences=occurrences, repeat_every_days=repeat_every_days)
+    _ensure_lesson_references(db, data)
+    rows = _series_rows(
+        {**data, "series_id": uuid.uuid4()},
+        occurrences=occurrences,
+        repeat_every_days=repeat_every_days,
+    )
+    _ensure_no_conflicts(db, rows)
+
+    # Set-based path: one INSERT ... RETURNING for all occurrences, one bulk audit insert,
+    # recipients/context resolved once and a single series-level notification per recipient.
+    try:
+        created = list(db.scalars(insert(LessonModel).returning(LessonModel), rows).all())
+    except IntegrityError as exc:
+        conflict = _conflict_error(db, exc, rows)
+        if conflict is None:
+            raise
+        raise conflict from exc
+    created.sort(key=lambda lesson: (lesson.starts_at, lesson.id))
+    snapshots = [serialize_model(lesson) for lesson in created]
+    record_changes(
+        db,
+        actor_user_id=actor_user_id,
+        entity=LessonModel.__tablename__,
+        action="create",
+        entries=[(snapshot["id"], None, snapshot) for snapshot in snapshots],
+    )
+    recipients = _lesson_recipients(db, data)
+    if recipients:
+        subject_name, room_label = _lesson_context(db, data)
+        notification_service.enqueue_notifications_bulk(
             db,
-            actor_user_id=actor_user_id,
-            entity=LessonModel.__tablename__,
-            entity_id=lesson.id,
-            action="create",
-            old_data=None,
-            new_data=lesson_snapshot,
+            user_ids=recipients,
+            payload=_series_notification_payload(
+                snapshots,
+                repeat_every_days=repeat_every_days,
+                subject_name=subject_name,
+                room_label=room_label,
+            ),
         )
-        _enqueue_lesson_notifications(db, action="created", lesson_snapshot=lesson_snapshot)
-
+    lesson_change_service.record_lesson_changes(db, [(None, snapshot) for snapshot in snapshots])
+    version_service.bump_lesson_versions(db, *snapshots)
     db.commit()
 
-    ids = [lesson.id for lesson in created]
-    if not ids:
-        return []
-
     stmt = (
         select(LessonModel)
         .options(*_with_relations())
-        .where(LessonModel.id.in_(ids))
+        .where(LessonModel.id.in_([lesson.id for lesson in created]))
         .order_by(LessonModel.starts_at, LessonModel.id)
     )
     return list(db.scalars(stmt).all())
 
 
+def _existing_ids(db: Session, column, ids: set[int]) -> set[int]:
+    if not ids:
+        return set()
+    return set(db.scalars(select(column).where(column.in_(ids))).all())
+
+
+def _validate_bulk_rows(
+    db: Session, items: list[Dict[str, Any]], *, lecturer_user_id: int | None
+) -> tuple[list[tuple[int, Dict[str, Any]]], list[dict[str, Any]]]:
+    """Split rows into valid ones and per-row errors, checking each reference set with one IN query."""
+    references = (
+        ("subject_id", Subject.id, "Subject not found"),
+        ("lecturer_user_id", User.id, "Lecturer not found"),
+        ("room_id", Room.id, "Room not found"),
+        ("group_id", Group.id, "Group not found"),
+    )
+    existing = {
+        field: _existing_ids(db, column, {item[field] for item in items})
+        for field, column, _ in references
+    }
+    valid: list[tuple[int, Dict[str, Any]]] = []
+    errors: list[dict[str, Any]] = []
+    for index, item in enumerate(items):
+        detail = None
+        if lecturer_user_id is not None and item["lecturer_user_id"] != lecturer_user_id:
+            detail = "Forbidden"
+        elif item["ends_at"] <= item["starts_at"]:
+            detail = "ends_at must be after starts_at"
+        else:
+            detail = next(
+                (message for field, _, message in references if item[field] not in existing[field]),
+                None,
+            )
+        if detail:
+            errors.append({"index": index, "detail": detail})
+        else:
+            valid.append((index, item))
+    return valid, errors
+
+
+def _insert_lessons(db: Session, items: list[Dict[str, Any]]) -> list[dict[str, Any]]:
+    stmt = insert(LessonModel).returning(*LessonModel.__table__.c)
+    return [serialize_values(row) for row in db.execute(stmt, items).mappings().all()]
+
+
+def _integrity_detail(exc: IntegrityError) -> str:
+    diag = getattr(exc.orig, "diag", None)
+    return getattr(diag, "message_primary", None) or "Lesson violates a database constraint"
+
+
+def _bulk_conflict_message(conflict: Mapping[str, Any], *, other: str | None = None) -> str:
+    if other is None and conflict.get("conflicting_recurrence_id") is not None:
+        other = (
+            f"recurrence {conflict['conflicting_recurrence_id']} at "
+            f"{_format_dt(conflict['conflicting_starts_at'])}"
+        )
+    target = other or f"lesson {conflict['conflicting_lesson_id']}"
+    return f"Overlaps {target} ({', '.join(conflict['resources'])})"
+
+
+def _bulk_row_error(db: Session, exc: IntegrityError, item: Dict[str, Any]) -> str:
+    if _is_exclusion_violation(exc):
+        conflicts = find_conflicts(db, [item])
+        if conflicts:
+            return _bulk_conflict_message(conflicts[0])
+    return _integrity_detail(exc)
+
+
+def _reject_conflicting_rows(
+    db: Session, valid: list[tuple[int, Dict[str, Any]]]
+) -> tuple[list[tuple[int, Dict[str, Any]]], list[dict[str, Any]]]:
+    """Drop rows overlapping stored lessons (one query), then rows overlapping an earlier row of
+    the same batch; returns the remaining rows and per-row errors. A no-op unless
+    LESSON_OVERLAP_CONSTRAINTS is on (see `_ensure_no_conflicts`)."""
+    if not get_settings().lesson_overlap_constraints:
+        return valid, []
+    errors: dict[int, str] = {}
+    for conflict in find_conflicts(db, [item for _, item in valid]):
+        errors.setdefault(valid[conflict["index"]][0], _bulk_conflict_message(conflict))
+    remaining = [(index, item) for index, item in valid if index not in errors]
+    for conflict in internal_conflicts([item for _, item in remaining]):
+        other = remaining[conflict["conflicting_index"]][0]
+        errors.setdefault(
+            remaining[conflict["index"]][0], _bulk_conflict_message(conflict, other=f"row {other}")
+        )
+    return (
+        [(index, item) for index, item in remaining if index not in errors],
+        [{"index": index, "detail": detail} for index, detail in errors.items()],
+    )
+
+
+def _bulk_notification_payload(count: int, first: dict[str, Any], last: dict[str, Any]) -> dict[str, Any]:
+    if count == 1:
+        body = f"New lesson at {_time_window_str(first)}"
+    else:
+        body = (
+            f"{count} new lessons scheduled between {_format_dt(first.get('starts_at'))} "
+            f"and {_format_dt(last.get('starts_at'))}"
+        )
+    return {
+        "title": "Timetable updated",
+        "body": body,
+        "data": {
+            "action": "bulk_created",
+            "lesson_id": first.get("id"),
+            "lessons": count,
+            "starts_at": first.get("starts_at"),
+            "last_starts_at": last.get("starts_at"),
+        },
+    }
+
+
+def _enqueue_bulk_notifications(db: Session, snapshots: list[dict[str, Any]]) -> None:
+    """Deferred fan-out: one summary notification per recipient for the whole batch."""
+    group_ids = {snapshot["group_id"] for snapshot in snapshots}
+    members: dict[int, set[int]] = defaultdict(set)
+    stmt = select(StudentGroupSelection.group_id, StudentGroupSelection.user_id).where(
+        StudentGroupSelection.group_id.in_(group_ids)
+    )
+    for group_id, user_id in db.execute(stmt):
+        members[group_id].add(user_id)
+
+    # Per recipient only the count and the earliest/latest lesson are kept, not every lesson.
+    summary: dict[int, list[Any]] = {}
+    for snapshot in sorted(snapshots, key=lambda item: (item["starts_at"], item["id"])):
+        for user_id in members[snapshot["group_id"]] | {snapshot["lecturer_user_id"]}:
+            entry = summary.setdefault(user_id, [0, snapshot, snapshot])
+            entry[0] += 1
+            entry[2] = snapshot
+    notification_service.enqueue_notification_batch(
+        db,
+        payloads={
+            user_id: _bulk_notification_payload(count, first, last)
+            for user_id, (count, first, last) in summary.items()
+        },
+    )
+
+
+def create_lessons_bulk(
+    db: Session,
+    items: list[Dict[str, Any]],
+    *,
+    actor_user_id: int,
+    lecturer_user_id: int | None = None,
+    chunk_size: int = BULK_CHUNK_SIZE,
+) -> tuple[list[int], list[dict[str, Any]]]:
+    """Create many independent lessons; returns the new ids and per-row errors (by request index).
+
+    Invalid rows, and rows that would double-book a stored lesson or an earlier row, are skipped
+    rather than failing the batch. Each chunk is inserted in its own savepoint; if the database
+    rejects a chunk it is retried row by row to pinpoint the culprit.
+    `lecturer_user_id` restricts every row to that lecturer (lecturers importing their own lessons).
+    """
+    valid, errors = _validate_bulk_rows(db, items, lecturer_user_id=lecturer_user_id)
+    valid, conflict_errors = _reject_conflicting_rows(db, valid)
+    errors.extend(conflict_errors)
+    created: list[dict[str, Any]] = []
+    for start in range(0, len(valid), chunk_size):
+        chunk = valid[start : start + chunk_size]
+        try:
+            with db.begin_nested():
+                snapshots = _insert_lessons(db, [item for _, item in chunk])
+        except IntegrityError:
+            snapshots = []
+            for index, item in chunk:
+                try:
+                    with db.begin_nested():
+                        snapshots.extend(_insert_lessons(db, [item]))
+                except IntegrityError as exc:
+                    errors.append({"index": index, "detail": _bulk_row_error(db, exc, item)})
+        record_changes(
+            db,
+            actor_user_id=actor_user_id,
+            entity=LessonModel.__tablename__,
+            action="create",
+            entries=[(snapshot["id"], None, snapshot) for snapshot in snapshots],
+        )
+        created.extend(snapshots)
+
+    if created:
+        _enqueue_bulk_notifications(db, created)
+        lesson_change_service.record_lesson_changes(db, [(None, snapshot) for snapshot in created])
+        version_service.bump_lesson_versions(db, *created)
+    db.commit()
+    errors.sort(key=lambda error: error["index"])
+    return [snapshot["id"] for snapshot in created], errors
+
+
 def update_lesson(db: Session, lesson_id: int, data: Dict[str, Any], *, actor_user_id: int) -> LessonModel:
     lesson = db.get(LessonModel, lesson_id)
     if not lesson:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Lesson not found")
 
-    _ensure_fk(db, Subject, data.get("subject_id"), "Subject")
-    _ensure_fk(db, User, data.get("lecturer_user_id"), "Lecturer")
-    _ensure_fk(db, Room, data.get("room_id"), "Room")
-    _ensure_fk(db, Group, data.get("group_id"), "Group")
+    _ensure_lesson_references(db, data)
 
     starts_at = data.get("starts_at", lesson.starts_at)
     ends_at = data.get("ends_at", lesson.ends_at)
     _validate_time_window(starts_at, ends_at)
 
     before = serialize_model(lesson)
+    changed = {field for field, value in data.items() if getattr(lesson, field) != value}
     for field, value in data.items():
         setattr(lesson, field, value)
 
-    db.flush()
+    candidate = _conflict_candidate(lesson)
+    if changed & CONFLICT_FIELDS:
+        _ensure_no_conflicts(db, [candidate], exclude_ids=[lesson_id])
+    try:
+        db.flush()
+    except IntegrityError as exc:
+        conflict = _conflict_error(db, exc, [candidate], exclude_ids=[lesson_id])
+        if conflict is None:
+            raise
+        raise conflict from exc
     after = serialize_model(lesson)
     record_change(
         db,
@@ -325,6 +1563,8 @@ def update_lesson(db: Session, lesson_id: int, data: Dict[str, Any], *, actor_us
         lesson_snapshot=after,
         before_snapshot=before,
     )
+    lesson_change_service.record_lesson_changes(db, [(before, after)])
+    version_service.bump_lesson_versions(db, before, after)
     db.commit()
     db.refresh(lesson)
     return get_lesson(db, lesson.id)
@@ -351,4 +1591,354 @@ def delete_lesson(db: Session, lesson_id: int, *, actor_user_id: int) -> None:
         lesson_snapshot=before,
         before_snapshot=before,
     )
+    lesson_change_service.record_lesson_changes(db, [(before, None)])
+    version_service.bump_lesson_versions(db, before)
+    db.commit()
+
+
+def _series_scope_conditions(
+    lesson: LessonModel, scope: str, *, lecturer_user_id: int | None = None
+) -> list[Any]:
+    if lesson.series_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Lesson is not part of a series"
+        )
+    conditions = [LessonModel.series_id == lesson.series_id]
+    if scope == "following":
+        conditions.append(LessonModel.starts_at >= lesson.starts_at)
+    if lecturer_user_id is not None:
+        conditions.append(LessonModel.lecturer_user_id == lecturer_user_id)
+    return conditions
+
+
+def update_lesson_series(
+    db: Session,
+    lesson_id: int,
+    data: Dict[str, Any],
+    *,
+    scope: str,
+    actor_user_id: int,
+    lecturer_user_id: int | None = None,
+) -> LessonModel:
+    """Apply `data` to this and following occurrences (`following`) or the whole series (`series`).
+
+    New `starts_at`/`ends_at` values are given for the addressed occurrence and applied to the
+    others as the same shift. Runs as one UPDATE ... RETURNING with bulk audit rows and one
+    notification per recipient; `lecturer_user_id` limits the set to that lecturer's lessons.
+    """
+    lesson = db.get(LessonModel, lesson_id)
+    if not lesson:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Lesson not found")
+    conditions = _series_scope_conditions(lesson, scope, lecturer_user_id=lecturer_user_id)
+    _ensure_lesson_references(db, data)
+
+    start_shift = data["starts_at"] - lesson.starts_at if "starts_at" in data else timedelta(0)
+    end_shift = data["ends_at"] - lesson.ends_at if "ends_at" in data else timedelta(0)
+    fields = {key: value for key, value in data.items() if key not in ("starts_at", "ends_at")}
+
+    table = LessonModel.__table__
+    before_rows = db.execute(
+        select(*table.c).where(*conditions).order_by(table.c.starts_at, table.c.id).with_for_update()
+    ).mappings().all()
+    candidates = [
+        {
+            **row,
+            **fields,
+            "starts_at": row["starts_at"] + start_shift,
+            "ends_at": row["ends_at"] + end_shift,
+        }
+        for row in before_rows
+    ]
+    for candidate in candidates:
+        _validate_time_window(candidate["starts_at"], candidate["ends_at"])
+    if start_shift or end_shift or fields.keys() & CONFLICT_FIELDS:
+        _ensure_no_conflicts(db, candidates, exclude_ids=[row["id"] for row in before_rows])
+
+    values: dict[str, Any] = dict(fields)
+    if start_shift:
+        values["starts_at"] = table.c.starts_at + start_shift
+    if end_shift:
+        values["ends_at"] = table.c.ends_at + end_shift
+    if not values or not before_rows:
+        return get_lesson(db, lesson_id)
+
+    ids = [row["id"] for row in before_rows]
+    try:
+        after_rows = db.execute(
+            update(table).where(table.c.id.in_(ids)).values(values).returning(*table.c)
+        ).mappings().all()
+    except IntegrityError as exc:
+        conflict = _conflict_error(db, exc, candidates, exclude_ids=ids)
+        if conflict is None:
+            raise
+        raise conflict from exc
+
+    after_by_id = {row["id"]: serialize_values(row) for row in after_rows}
+    pairs = [(serialize_values(row), after_by_id[row["id"]]) for row in before_rows]
+    record_changes(
+        db,
+        actor_user_id=actor_user_id,
+        entity=LessonModel.__tablename__,
+        action="update",
+        entries=[(before["id"], before, after) for before, after in pairs],
+    )
+    _enqueue_series_change_notifications(db, action="updated", scope=scope, pairs=pairs)
+    lesson_change_service.record_lesson_changes(db, pairs)
+    version_service.bump_lesson_versions(db, *(snapshot for pair in pairs for snapshot in pair))
+    db.commit()
+    # The Core UPDATE bypassed the identity map and sessions keep loaded state across commits
+    # (expire_on_commit=False), so `lesson` would otherwise be returned as it was before.
+    db.expire_all()
+    return get_lesson(db, lesson_id)
+
+
+def cancel_lessons(db: Session, lesson_ids: Iterable[int], *, actor_user_id: int) -> int:
+    """Cancel the given lessons in one UPDATE ... RETURNING, with bulk audit rows and one
+    notification per recipient for each subject/room; returns how many were cancelled."""
+    table = LessonModel.__table__
+    before_rows = db.execute(
+        select(*table.c)
+        .where(table.c.id.in_(list(lesson_ids)), table.c.status != "cancelled")
+        .order_by(table.c.starts_at, table.c.id)
+        .with_for_update()
+    ).mappings().all()
+    if not before_rows:
+        return 0
+    after_rows = db.execute(
+        update(table)
+        .where(table.c.id.in_([row["id"] for row in before_rows]))
+        .values(status="cancelled")
+        .returning(*table.c)
+    ).mappings().all()
+
+    after_by_id = {row["id"]: serialize_values(row) for row in after_rows}
+    pairs = [(serialize_values(row), after_by_id[row["id"]]) for row in before_rows]
+    record_changes(
+        db,
+        actor_user_id=actor_user_id,
+        entity=LessonModel.__tablename__,
+        action="update",
+        entries=[(before["id"], before, after) for before, after in pairs],
+    )
+    # Notification payloads name one subject and room.
+    by_context: dict[tuple[int, int], list[tuple[dict[str, Any], dict[str, Any]]]] = defaultdict(list)
+    for before, after in pairs:
+        by_context[(before["subject_id"], before["room_id"])].append((before, after))
+    for context_pairs in by_context.values():
+        _enqueue_series_change_notifications(
+            db, action="updated", scope="occurrence", pairs=context_pairs
+        )
+    lesson_change_service.record_lesson_changes(db, pairs)
+    version_service.bump_lesson_versions(db, *(snapshot for pair in pairs for snapshot in pair))
+    db.commit()
+    return len(pairs)
+
+
+def delete_lesson_series(
+    db: Session,
+    lesson_id: int,
+    *,
+    scope: str,
+    actor_user_id: int,
+    lecturer_user_id: int | None = None,
+) -> int:
+    """Delete this and following occurrences or the whole series in one DELETE ... RETURNING."""
+    lesson = db.get(LessonModel, lesson_id)
+    if not lesson:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Lesson not found")
+    conditions = _series_scope_conditions(lesson, scope, lecturer_user_id=lecturer_user_id)
+
+    table = LessonModel.__table__
+    deleted_rows = db.execute(delete(table).where(*conditions).returning(*table.c)).mappings().all()
+    snapshots = [
+        serialize_values(row)
+        for row in sorted(deleted_rows, key=lambda row: (row["starts_at"], row["id"]))
+    ]
+    if not snapshots:
+        return 0
+    record_changes(
+        db,
+        actor_user_id=actor_user_id,
+        entity=LessonModel.__tablename__,
+        action="delete",
+        entries=[(snapshot["id"], snapshot, None) for snapshot in snapshots],
+    )
+    _enqueue_series_change_notifications(
+        db, action="deleted", scope=scope, pairs=[(snapshot, None) for snapshot in snapshots]
+    )
+    lesson_change_service.record_lesson_changes(db, [(snapshot, None) for snapshot in snapshots])
+    version_service.bump_lesson_versions(db, *snapshots)
+    db.commit()
+    return len(snapshots)
+
+
+def _recurrence_conflict(
+    db: Session, rule: LessonRecurrence, occurrences: Sequence[tuple[datetime, datetime]]
+) -> dict[str, Any] | None:
+    """First clash of a new rule's occurrences with each other, stored lessons or other rules."""
+    candidates = [
+        {**_conflict_candidate(rule), "starts_at": starts_at, "ends_at": ends_at}
+        for starts_at, ends_at in occurrences
+    ]
+    conflicts = internal_conflicts(candidates) or find_conflicts(db, candidates)
+    if not conflicts:
+        return None
+    conflict = conflicts[0]
+    detail: dict[str, Any] = {"resources": conflict["resources"], "occurrence": conflict["index"]}
+    if conflict.get("conflicting_index") is not None:
+        detail["message"] = "Occurrences of the recurrence overlap each other"
+        detail["conflicting_occurrence"] = conflict["conflicting_index"]
+    elif conflict["conflicting_recurrence_id"] is not None:
+        detail["message"] = "Recurrence overlaps another recurrence"
+        detail["conflicting_recurrence_id"] = conflict["conflicting_recurrence_id"]
+        detail["conflicting_starts_at"] = conflict["conflicting_starts_at"].isoformat()
+    else:
+        detail["message"] = "Recurrence overlaps an existing lesson"
+        detail["conflicting_lesson_id"] = conflict["conflicting_lesson_id"]
+    return detail
+
+
+def create_lesson_recurrence(
+    db: Session,
+    data: Dict[str, Any],
+    *,
+    interval_days: int,
+    count: int | None = None,
+    until: datetime | None = None,
+    exdates: Iterable[datetime] = (),
+    actor_user_id: int,
+) -> LessonRecurrence:
+    """Store a repeating lesson as one rule; occurrences are expanded at read time."""
+    if count is None and until is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="count or until is required"
+        )
+    if interval_days < 1:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="interval_days must be at least 1"
+        )
+    _validate_time_window(data["starts_at"], data["ends_at"])
+    if until is not None and until < data["starts_at"]:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="until must not be before starts_at"
+        )
+    _ensure_lesson_references(db, data)
+
+    rule = LessonRecurrence(
+        **data,
+        series_id=uuid.uuid4(),
+        interval_days=interval_days,
+        count=count,
+        until=until,
+        last_starts_at=recurrence_service.last_starts_at(
+            data["starts_at"], interval_days=interval_days, count=count, until=until
+        ),
+        exdates=sorted(set(exdates)),
+    )
+    duration = rule.ends_at - rule.starts_at
+    occurrences = [
+        (starts_at, starts_at + duration) for starts_at in recurrence_service.occurrence_starts(rule)
+    ]
+    if not occurrences:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Recurrence has no occurrences"
+        )
+    if rule.status != "cancelled" and get_settings().lesson_overlap_constraints:
+        conflict = _recurrence_conflict(db, rule, occurrences)
+        if conflict:
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=conflict)
+
+    db.add(rule)
+    db.flush()
+    snapshot = serialize_model(rule)
+    record_change(
+        db,
+        actor_user_id=actor_user_id,
+        entity=LessonRecurrence.__tablename__,
+        entity_id=rule.id,
+        action="create",
+        old_data=None,
+        new_data=snapshot,
+    )
+    _enqueue_recurrence_notifications(
+        db, action="created", rule=snapshot, occurrences=len(occurrences)
+    )
+    lesson_change_service.record_recurrence_changes(db, [(None, snapshot)])
+    version_service.bump_lesson_versions(db, snapshot)
+    db.commit()
+    return recurrence_service.get_recurrence(db, rule.id)
+
+
+def materialize_occurrence(
+    db: Session, recurrence_id: int, starts_at: datetime, *, actor_user_id: int
+) -> LessonModel:
+    """Turn one rule occurrence into a stored lesson (with the rule's series_id) so it can be
+    edited like any other; the rule skips that start from now on."""
+    rule = db.get(LessonRecurrence, recurrence_id, with_for_update=True)
+    if not rule:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Recurrence not found")
+    if not recurrence_service.is_occurrence(rule, starts_at):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Occurrence not found")
+
+    data = {
+        "subject_id": rule.subject_id,
+        "lecturer_user_id": rule.lecturer_user_id,
+        "room_id": rule.room_id,
+        "group_id": rule.group_id,
+        "starts_at": starts_at,
+        "ends_at": starts_at + (rule.ends_at - rule.starts_at),
+        "status": rule.status,
+        "lesson_type": rule.lesson_type,
+        "series_id": rule.series_id,
+    }
+    _ensure_no_conflicts(db, [data], exclude_recurrence_ids=[rule.id])
+    lesson = LessonModel(**data)
+    db.add(lesson)
+    rule.exdates = sorted([*rule.exdates, starts_at])
+    try:
+        db.flush()
+    except IntegrityError as exc:
+        conflict = _conflict_error(db, exc, [data], exclude_recurrence_ids=[rule.id])
+        if conflict is None:
+            raise
+        raise conflict from exc
+    lesson_snapshot = serialize_model(lesson)
+    record_change(
+        db,
+        actor_user_id=actor_user_id,
+        entity=LessonModel.__tablename__,
+        entity_id=lesson.id,
+        action="create",
+        old_data=None,
+        new_data=lesson_snapshot,
+    )
+    # Same time slot, now with an id: no notification, but cached timetables change.
+    rule_snapshot = serialize_model(rule)
+    lesson_change_service.record_lesson_changes(db, [(None, lesson_snapshot)])
+    lesson_change_service.record_recurrence_changes(db, [(rule_snapshot, rule_snapshot)])
+    version_service.bump_lesson_versions(db, lesson_snapshot)
+    db.commit()
+    return get_lesson(db, lesson.id)
+
+
+def delete_lesson_recurrence(db: Session, recurrence_id: int, *, actor_user_id: int) -> None:
+    """Delete a rule and with it every occurrence not materialized yet."""
+    rule = db.get(LessonRecurrence, recurrence_id)
+    if not rule:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Recurrence not found")
+    snapshot = serialize_model(rule)
+    occurrences = len(recurrence_service.occurrence_starts(rule))
+    db.delete(rule)
+    record_change(
+        db,
+        actor_user_id=actor_user_id,
+        entity=LessonRecurrence.__tablename__,
+        entity_id=rule.id,
+        action="delete",
+        old_data=snapshot,
+        new_data=None,
+    )
+    _enqueue_recurrence_notifications(db, action="deleted", rule=snapshot, occurrences=occurrences)
+    lesson_change_service.record_recurrence_changes(db, [(snapshot, None)])
+    version_service.bump_lesson_versions(db, snapshot)
     db.commit()
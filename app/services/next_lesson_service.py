@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import threading
+from bisect import bisect_left
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, NamedTuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.models import StudentGroupSelection
+from app.services import lesson_service, version_service
+from app.services.version_service import (
+    CATALOG_SCOPES,
+    GROUP,
+    LECTURER,
+    SELECTION,
+    InvalidationKey,
+    VersionKey,
+)
+
+# Upcoming lessons loaded per timetable; a lookup past the last one reloads the next batch.
+UPCOMING_BATCH = 32
+
+
+class Upcoming(NamedTuple):
+    starts: list[datetime]
+    lessons: list[dict[str, Any]]
+    # Fewer than UPCOMING_BATCH lessons were left, so nothing is scheduled after the last one.
+    complete: bool
+
+
+class NextLessonIndex:
+    """In-process index behind `GET /lessons/me/next`.
+
+    Maps students to their selected group and each group/lecturer timetable to the sorted start
+    times of its upcoming lessons, so a warm lookup is a bisect with no database access. Entries
+    are dropped per key when a commit bumps that group/lecturer (or a selection changes) and are
+    reloaded on the next miss. Loads that overlap an invalidation are not cached.
+    """
+
+    def __init__(self, *, max_entries: int) -> None:
+        self._max_entries = max_entries
+        self._timetables: OrderedDict[VersionKey, Upcoming] = OrderedDict()
+        self._selections: OrderedDict[int, int | None] = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._hits = 0
+        self._misses = 0
+
+    def _timetable_key(self, user_id: int, role: str) -> VersionKey | None:
+        """Caller holds the lock; raises KeyError when a student's selection is not cached."""
+        if role != "student":
+            return LECTURER, user_id
+        group_id = self._selections[user_id]
+        self._selections.move_to_end(user_id)
+        return None if group_id is None else (GROUP, group_id)
+
+    def find(self, user_id: int, role: str, now: datetime) -> tuple[bool, dict[str, Any] | None]:
+        """(hit, next lesson) from memory only; a miss means the caller has to `load_async`."""
+        with self._lock:
+            try:
+                key = self._timetable_key(user_id, role)
+            except KeyError:
+                self._misses += 1
+                return False, None
+            if key is None:
+                self._hits += 1
+                return True, None
+            upcoming = self._timetables.get(key)
+            if upcoming is not None:
+                index = bisect_left(upcoming.starts, now)
+                if index < len(upcoming.starts) or upcoming.complete:
+                    self._timetables.move_to_end(key)
+                    self._hits += 1
+                    return True, upcoming.lessons[index] if index < len(upcoming.starts) else None
+            self._misses += 1
+            return False, None
+
+    def _trim(self, entries: OrderedDict) -> None:
+        while len(entries) > self._max_entries:
+            entries.popitem(last=False)
+
+    async def load_async(
+        self, db: AsyncSession, *, user_id: int, role: str, now: datetime
+    ) -> dict[str, Any] | None:
+        with self._lock:
+            generation = self._generation
+        key: VersionKey | None = (LECTURER, user_id)
+        if role == "student":
+            group_id = await db.scalar(
+                select(StudentGroupSelection.group_id)
+                .where(StudentGroupSelection.user_id == user_id)
+                .limit(1)
+            )
+            key = None if group_id is None else (GROUP, group_id)
+        upcoming = None
+        if key is not None:
+            rows = await lesson_service.list_upcoming_compact_async(
+                db,
+                group_id=key[1] if key[0] == GROUP else None,
+                lecturer_user_id=key[1] if key[0] == LECTURER else None,
+                date_from=now,
+                limit=UPCOMING_BATCH,
+            )
+            upcoming = Upcoming(
+                starts=[row["starts_at"] for row in rows],
+                lessons=[dict(row) for row in rows],
+                complete=len(rows) < UPCOMING_BATCH,
+            )
+        with self._lock:
+            if generation == self._generation and self._max_entries > 0:
+                if role == "student":
+                    self._selections[user_id] = None if key is None else key[1]
+                    self._selections.move_to_end(user_id)
+                    self._trim(self._selections)
+                if key is not None and upcoming is not None:
+                    self._timetables[key] = upcoming
+                    self._timetables.move_to_end(key)
+                    self._trim(self._timetables)
+        if upcoming is None:
+            return None
+        index = bisect_left(upcoming.starts, now)
+        return upcoming.lessons[index] if index < len(upcoming.starts) else None
+
+    def invalidate(self, keys: set[InvalidationKey]) -> None:
+        with self._lock:
+            self._generation += 1
+            if any(key[0] in CATALOG_SCOPES for key in keys):
+                # Subject/room/user names are embedded in every entry.
+                self._timetables.clear()
+            for key in keys:
+                if key[0] == SELECTION:
+                    self._selections.pop(key[1], None)
+                else:
+                    self._timetables.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._timetables.clear()
+            self._selections.clear()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "timetables": len(self._timetables),
+                "selections": len(self._selections),
+                "max_entries": self._max_entries,
+                "hits": self._hits,
+                "misses": self._misses,
+            }
+
+
+next_lesson_index = NextLessonIndex(max_entries=get_settings().next_lesson_index_size)
+version_service.add_commit_listener(next_lesson_index.invalidate, reset=next_lesson_index.clear)
+
+
+async def get_next_lesson_async(
+    db: AsyncSession, *, user_id: int, role: str, now: datetime | None = None
+) -> dict[str, Any] | None:
+    """Next non-cancelled lesson of the caller's timetable; `db` is only used on a miss.
+
+    Pass a primary session: invalidations fire on commit, so a lagging replica could re-cache
+    the state from before the write.
+    """
+    now = now or datetime.now(timezone.utc)
+    hit, lesson = next_lesson_index.find(user_id, role, now)
+    if hit:
+        return lesson
+    return await next_lesson_index.load_async(db, user_id=user_id, role=role, now=now)
@@ -1,31 +1,57 @@
 from __future__ import annotations
 
 from datetime import datetime, timezone
-from typing import Iterable
+from typing import Iterable, Mapping
 
-from sqlalchemy import select
+from sqlalchemy import Select, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 
 from app.models import Group, NotificationOutbox, StudentGroupSelection, User
 
 
-def list_notifications(
-    db: Session,
+def _list_notifications_stmt(
     *,
     user_id: int,
     delivery_status: str | None = None,
     read_status: str | None = None,
-) -> list[NotificationOutbox]:
+) -> Select:
     stmt = select(NotificationOutbox).where(NotificationOutbox.user_id == user_id)
     if delivery_status is not None:
         stmt = stmt.where(NotificationOutbox.delivery_status == delivery_status)
     if read_status is not None:
         stmt = stmt.where(NotificationOutbox.read_status == read_status)
-    stmt = stmt.order_by(NotificationOutbox.created_at.desc())
+    return stmt.order_by(NotificationOutbox.created_at.desc())
+
+
+def list_notifications(
+    db: Session,
+    *,
+    user_id: int,
+    delivery_status: str | None = None,
+    read_status: str | None = None,
+) -> list[NotificationOutbox]:
+    stmt = _list_notifications_stmt(
+        user_id=user_id, delivery_status=delivery_status, read_status=read_status
+    )
     return list(db.scalars(stmt).all())
 
 
+async def list_notifications_async(
+    db: AsyncSession,
+    *,
+    user_id: int,
+    delivery_status: str | None = None,
+    read_status: str | None = None,
+) -> list[NotificationOutbox]:
+    stmt = _list_notifications_stmt(
+        user_id=user_id, delivery_status=delivery_status, read_status=read_status
+    )
+    result = await db.scalars(stmt)
+    return list(result.all())
+
+
 def get_notification(db: Session, notification_id: int) -> NotificationOutbox:
     record = db.get(NotificationOutbox, notification_id)
     if not record:
@@ -95,6 +121,52 @@ def enqueue_notifications(
     return records
 
 
+def enqueue_notifications_bulk(
+    db: Session,
+    *,
+    user_ids: Iterable[int],
+    payload: dict,
+    delivery_status: str = "queued",
+    read_status: str = "unread",
+) -> int:
+    """Queue one notification per user with a single bulk INSERT in the caller's transaction.
+
+    Unlike `enqueue_notifications` no ORM objects are returned; use it for fan-out on write paths.
+    """
+    return enqueue_notification_batch(
+        db,
+        payloads={uid: payload for uid in user_ids if uid is not None},
+        delivery_status=delivery_status,
+        read_status=read_status,
+    )
+
+
+def enqueue_notification_batch(
+    db: Session,
+    *,
+    payloads: Mapping[int, dict],
+    delivery_status: str = "queued",
+    read_status: str = "unread",
+) -> int:
+    """Queue a (possibly different) payload per user with a single bulk INSERT."""
+    now = datetime.now(timezone.utc)
+    rows = [
+        {
+            "user_id": user_id,
+            "payload": payloads[user_id],
+            "delivery_status": delivery_status,
+            "read_status": read_status,
+            "read_at": now if read_status == "read" else None,
+            "attempts": 0,
+            "created_at": now,
+        }
+        for user_id in sorted(payloads)
+    ]
+    if rows:
+        db.execute(insert(NotificationOutbox), rows)
+    return len(rows)
+
+
 def create_notification(
     db: Session,
     *,
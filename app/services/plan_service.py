@@ -17,7 +17,9 @@ from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.models import Lesson, User
+from app.services import recurrence_service
 from app.services.lesson_service import _with_relations
+from app.services.recurrence_service import LessonOccurrence
 
 
 _FONT_NAME: str | None = None
@@ -57,7 +59,7 @@ def list_lecturer_lessons(
     lecturer_user_id: int,
     start_at: datetime,
     end_at: datetime,
-) -> list[Lesson]:
+) -> list[Lesson | LessonOccurrence]:
     stmt = (
         select(Lesson)
         .options(*_with_relations())
@@ -68,12 +70,18 @@ def list_lecturer_lessons(
         )
         .order_by(Lesson.starts_at, Lesson.id)
     )
-    return list(db.scalars(stmt).all())
+    occurrences = recurrence_service.list_occurrences(
+        db,
+        lecturer_user_id=lecturer_user_id,
+        date_from=start_at,
+        date_to=end_at - timedelta(microseconds=1),
+    )
+    return recurrence_service.merge(db.scalars(stmt).all(), occurrences)
 
 
 def build_lecturer_plan_pdf(
     lecturer: User,
-    lessons: Sequence[Lesson],
+    lessons: Sequence[Lesson | LessonOccurrence],
     *,
     date_from: date,
     date_to: date,
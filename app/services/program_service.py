@@ -3,36 +3,47 @@ from __future__ import annotations
 from typing import Any
 
 from fastapi import HTTPException, status
-from sqlalchemy import select
+from sqlalchemy import Select, exists, select
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload, selectinload
 
 from app.models import Group, Program, ProgramYear, Specialization, GroupType
+from app.services import reference_service, version_service
 from app.services.audit_service import record_change, serialize_model
+from app.services.reference_service import Reference, Rule
 
 
-def list_programs(db: Session) -> list[Program]:
-    stmt = (
+def _list_programs_stmt() -> Select:
+    return (
         select(Program)
         .options(
-            joinedload(Program.years),
-            joinedload(Program.specializations),
+            selectinload(Program.years),
+            selectinload(Program.specializations),
         )
         .order_by(Program.id)
     )
-    return list(db.execute(stmt).unique().scalars().all())
+
+
+def list_programs(db: Session) -> list[Program]:
+    return list(db.scalars(_list_programs_stmt()).all())
+
+
+async def list_programs_async(db: AsyncSession) -> list[Program]:
+    result = await db.scalars(_list_programs_stmt())
+    return list(result.all())
 
 
 def get_program(db: Session, program_id: int) -> Program:
     stmt = (
         select(Program)
         .options(
-            joinedload(Program.years),
-            joinedload(Program.specializations),
+            selectinload(Program.years),
+            selectinload(Program.specializations),
         )
         .where(Program.id == program_id)
     )
-    program = db.execute(stmt).unique().scalar_one_or_none()
+    program = db.execute(stmt).scalar_one_or_none()
     if not program:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Program not found")
     return program
@@ -75,6 +86,7 @@ def update_program(
         old_data=before,
         new_data=serialize_model(program),
     )
+    version_service.bump_catalog_version(db)
     db.commit()
     db.refresh(program)
     return get_program(db, program.id)
@@ -100,9 +112,17 @@ def delete_program(db: Session, program_id: int, *, actor_user_id: int) -> None:
     )
 
 
+def _list_program_years_stmt() -> Select:
+    return select(ProgramYear).options(joinedload(ProgramYear.program)).order_by(ProgramYear.id)
+
+
 def list_program_years(db: Session) -> list[ProgramYear]:
-    stmt = select(ProgramYear).options(joinedload(ProgramYear.program)).order_by(ProgramYear.id)
-    return list(db.scalars(stmt).all())
+    return list(db.scalars(_list_program_years_stmt()).all())
+
+
+async def list_program_years_async(db: AsyncSession) -> list[ProgramYear]:
+    result = await db.scalars(_list_program_years_stmt())
+    return list(result.all())
 
 
 def get_program_year(db: Session, year_id: int) -> ProgramYear:
@@ -172,6 +192,7 @@ def update_program_year(
         old_data=before,
         new_data=serialize_model(record),
     )
+    version_service.bump_catalog_version(db)
     db.commit()
     db.refresh(record)
     return get_program_year(db, record.id)
@@ -197,9 +218,17 @@ def delete_program_year(db: Session, year_id: int, *, actor_user_id: int) -> Non
     )
 
 
+def _list_specializations_stmt() -> Select:
+    return select(Specialization).options(joinedload(Specialization.program)).order_by(Specialization.id)
+
+
 def list_specializations(db: Session) -> list[Specialization]:
-    stmt = select(Specialization).options(joinedload(Specialization.program)).order_by(Specialization.id)
-    return list(db.scalars(stmt).all())
+    return list(db.scalars(_list_specializations_stmt()).all())
+
+
+async def list_specializations_async(db: AsyncSession) -> list[Specialization]:
+    result = await db.scalars(_list_specializations_stmt())
+    return list(result.all())
 
 
 def get_specialization(db: Session, spec_id: int) -> Specialization:
@@ -271,6 +300,7 @@ def update_specialization(
         old_data=before,
         new_data=serialize_model(spec),
     )
+    version_service.bump_catalog_version(db)
     db.commit()
     db.refresh(spec)
     return get_specialization(db, spec.id)
@@ -296,14 +326,13 @@ def delete_specialization(db: Session, spec_id: int, *, actor_user_id: int) -> N
     )
 
 
-def list_groups(
-    db: Session,
+def _list_groups_stmt(
     *,
     program_id: int | None = None,
     program_year_id: int | None = None,
     specialization_id: int | None = None,
     group_type: str | None = None,
-) -> list[Group]:
+) -> Select:
     stmt = select(Group).options(
         joinedload(Group.program),
         joinedload(Group.program_year),
@@ -320,10 +349,44 @@ def list_groups(
     if group_type is not None:
         stmt = stmt.where(Group.group_type_code == group_type)
 
-    stmt = stmt.order_by(Group.id)
+    return stmt.order_by(Group.id)
+
+
+def list_groups(
+    db: Session,
+    *,
+    program_id: int | None = None,
+    program_year_id: int | None = None,
+    specialization_id: int | None = None,
+    group_type: str | None = None,
+) -> list[Group]:
+    stmt = _list_groups_stmt(
+        program_id=program_id,
+        program_year_id=program_year_id,
+        specialization_id=specialization_id,
+        group_type=group_type,
+    )
     return list(db.scalars(stmt).all())
 
 
+async def list_groups_async(
+    db: AsyncSession,
+    *,
+    program_id: int | None = None,
+    program_year_id: int | None = None,
+    specialization_id: int | None = None,
+    group_type: str | None = None,
+) -> list[Group]:
+    stmt = _list_groups_stmt(
+        program_id=program_id,
+        program_year_id=program_year_id,
+        specialization_id=specialization_id,
+        group_type=group_type,
+    )
+    result = await db.scalars(stmt)
+    return list(result.all())
+
+
 def get_group(db: Session, group_id: int) -> Group:
     stmt = (
         select(Group)
@@ -342,11 +405,6 @@ def get_group(db: Session, group_id: int) -> Group:
     return group
 
 
-def _ensure_group_type(db: Session, code: str) -> None:
-    if db.get(GroupType, code) is None:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Group type not found")
-
-
 def _safe_delete(
     db: Session, record, *, detail: str, audit_log: dict[str, Any] | None = None
 ) -> None:
@@ -360,22 +418,39 @@ def _safe_delete(
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=detail)
 
 
-def _validate_group_relationships(
+def _ensure_group_references(
+    db: Session,
     *,
     program_id: int,
-    program_year: ProgramYear,
-    specialization: Specialization,
+    program_year_id: int,
+    specialization_id: int,
+    group_type_code: str | None,
 ) -> None:
-    if program_year.program_id != program_id:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Program year does not belong to the specified program",
-        )
-    if specialization.program_id != program_id:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Specialization does not belong to the specified program",
-        )
+    """Check that all group references exist and belong to the same program, in one query."""
+    reference_service.ensure_references(
+        db,
+        [
+            Reference("Program", Program.id, program_id),
+            Reference("Program year", ProgramYear.id, program_year_id),
+            Reference("Specialization", Specialization.id, specialization_id),
+            Reference("Group type", GroupType.code, group_type_code),
+        ],
+        rules=[
+            Rule(
+                "Program year does not belong to the specified program",
+                exists().where(
+                    ProgramYear.id == program_year_id, ProgramYear.program_id == program_id
+                ),
+            ),
+            Rule(
+                "Specialization does not belong to the specified program",
+                exists().where(
+                    Specialization.id == specialization_id,
+                    Specialization.program_id == program_id,
+                ),
+            ),
+        ],
+    )
 
 
 def create_group(
@@ -388,21 +463,13 @@ def create_group(
     code: str,
     actor_user_id: int,
 ) -> Group:
-    program = db.get(Program, program_id)
-    if not program:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Program not found")
-    program_year = db.get(ProgramYear, program_year_id)
-    if not program_year:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Program year not found")
-    specialization = db.get(Specialization, specialization_id)
-    if not specialization:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Specialization not found")
-    _validate_group_relationships(
-        program_id=program.id,
-        program_year=program_year,
-        specialization=specialization,
+    _ensure_group_references(
+        db,
+        program_id=program_id,
+        program_year_id=program_year_id,
+        specialization_id=specialization_id,
+        group_type_code=group_type_code,
     )
-    _ensure_group_type(db, group_type_code)
 
     group = Group(
         program_id=program_id,
@@ -450,25 +517,14 @@ def update_group(
         specialization_id if specialization_id is not None else group.specialization_id
     )
 
-    program = db.get(Program, new_program_id)
-    if not program:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Program not found")
-    program_year = db.get(ProgramYear, new_program_year_id)
-    if not program_year:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Program year not found")
-    specialization = db.get(Specialization, new_specialization_id)
-    if not specialization:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Specialization not found")
-
-    _validate_group_relationships(
-        program_id=program.id,
-        program_year=program_year,
-        specialization=specialization,
+    _ensure_group_references(
+        db,
+        program_id=new_program_id,
+        program_year_id=new_program_year_id,
+        specialization_id=new_specialization_id,
+        group_type_code=group_type_code,
     )
 
-    if group_type_code is not None:
-        _ensure_group_type(db, group_type_code)
-
     if program_id is not None:
         group.program_id = program_id
     if program_year_id is not None:
@@ -490,6 +546,7 @@ def update_group(
         old_data=before,
         new_data=serialize_model(group),
     )
+    version_service.bump_catalog_version(db)
     db.commit()
     db.refresh(group)
     return get_group(db, group.id)
@@ -0,0 +1,294 @@
+from __future__ import annotations
+
+import heapq
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Iterable, Sequence
+
+from fastapi import HTTPException, status
+from sqlalchemy import DateTime, Select, column, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload, selectinload
+
+from app.models import Group, LessonRecurrence, Room, Subject, User
+
+MAX_OCCURRENCES = 520
+
+
+@dataclass
+class LessonOccurrence:
+    """A not-yet-materialized occurrence of a `LessonRecurrence`; quacks like a `Lesson` row."""
+
+    recurrence_id: int
+    series_id: uuid.UUID
+    subject_id: int
+    lecturer_user_id: int
+    room_id: int
+    group_id: int
+    starts_at: datetime
+    ends_at: datetime
+    status: str
+    lesson_type: str
+    subject: Subject
+    room: Room
+    group: Group
+    lecturer: User
+    id: None = None
+
+
+def sort_key(item: Any) -> tuple[datetime, int]:
+    """(starts_at, id) ordering shared with lesson keyset pages.
+
+    Occurrences sort by the negated rule id, so they have a stable, unique position among
+    lessons that start at the same time and can be addressed by the same cursors.
+    """
+    if item.id is None:
+        return item.starts_at, -item.recurrence_id
+    return item.starts_at, item.id
+
+
+def last_starts_at(
+    starts_at: datetime, *, interval_days: int, count: int | None, until: datetime | None
+) -> datetime:
+    """Start of the final occurrence allowed by `count` and/or `until` (the earlier wins)."""
+    interval = timedelta(days=interval_days)
+    limits = []
+    if count is not None:
+        limits.append(count - 1)
+    if until is not None:
+        limits.append(max((until - starts_at) // interval, 0))
+    steps = min(limits) if limits else MAX_OCCURRENCES - 1
+    return starts_at + interval * min(steps, MAX_OCCURRENCES - 1)
+
+
+def is_occurrence(rule: LessonRecurrence, starts_at: datetime) -> bool:
+    interval = timedelta(days=rule.interval_days)
+    offset = starts_at - rule.starts_at
+    return (
+        rule.starts_at <= starts_at <= rule.last_starts_at
+        and offset % interval == timedelta(0)
+        and starts_at not in set(rule.exdates)
+    )
+
+
+def _lower_bound(date_from: datetime | None, after: tuple[datetime, int] | None) -> datetime | None:
+    bounds = [value for value in (date_from, after[0] if after else None) if value is not None]
+    return max(bounds) if bounds else None
+
+
+def occurrence_starts(
+    rule: LessonRecurrence,
+    *,
+    date_from: datetime | None = None,
+    date_to: datetime | None = None,
+    after: tuple[datetime, int] | None = None,
+    limit: int | None = None,
+) -> list[datetime]:
+    """Start times of the occurrences within [date_from, date_to] (like the lesson filters)."""
+    interval = timedelta(days=rule.interval_days)
+    lower = max(_lower_bound(date_from, after) or rule.starts_at, rule.starts_at)
+    index = max(-((rule.starts_at - lower) // interval), 0)
+    upper = rule.last_starts_at if date_to is None else min(rule.last_starts_at, date_to)
+    excluded = set(rule.exdates)
+    starts: list[datetime] = []
+    while limit is None or len(starts) < limit:
+        starts_at = rule.starts_at + interval * index
+        if starts_at > upper:
+            break
+        index += 1
+        if starts_at in excluded or (after and (starts_at, -rule.id) <= after):
+            continue
+        starts.append(starts_at)
+    return starts
+
+
+def occurrence_intervals(
+    rule: LessonRecurrence, *, date_from: datetime, date_to: datetime
+) -> list[tuple[datetime, datetime]]:
+    """(starts_at, ends_at) of the occurrences overlapping [date_from, date_to)."""
+    duration = rule.ends_at - rule.starts_at
+    return [
+        (starts_at, starts_at + duration)
+        for starts_at in occurrence_starts(rule, date_from=date_from - duration, date_to=date_to)
+        if starts_at + duration > date_from and starts_at < date_to
+    ]
+
+
+def expand(
+    rule: LessonRecurrence,
+    *,
+    date_from: datetime | None = None,
+    date_to: datetime | None = None,
+    after: tuple[datetime, int] | None = None,
+    limit: int | None = None,
+) -> list[LessonOccurrence]:
+    """Occurrences as `Lesson`-like objects; the rule's relationships should be loaded."""
+    duration = rule.ends_at - rule.starts_at
+    return [
+        LessonOccurrence(
+            recurrence_id=rule.id,
+            series_id=rule.series_id,
+            subject_id=rule.subject_id,
+            lecturer_user_id=rule.lecturer_user_id,
+            room_id=rule.room_id,
+            group_id=rule.group_id,
+            starts_at=starts_at,
+            ends_at=starts_at + duration,
+            status=rule.status,
+            lesson_type=rule.lesson_type,
+            subject=rule.subject,
+            room=rule.room,
+            group=rule.group,
+            lecturer=rule.lecturer,
+        )
+        for starts_at in occurrence_starts(
+            rule, date_from=date_from, date_to=date_to, after=after, limit=limit
+        )
+    ]
+
+
+def merge(lessons: Iterable[Any], occurrences: Iterable[Any], *, limit: int | None = None) -> list[Any]:
+    """Merge two `sort_key`-ordered sequences, optionally keeping only the first `limit`."""
+    merged = heapq.merge(lessons, occurrences, key=sort_key)
+    if limit is None:
+        return list(merged)
+    return [item for _, item in zip(range(limit), merged)]
+
+
+def occurrence_series(name: str = "occurrence"):
+    """Lateral `generate_series` of every occurrence start of the outer `LessonRecurrence` row,
+    for expanding rules in SQL; callers still exclude `exdates` and apply their window.
+
+    The step is a whole number of hours rather than days: a `days` interval follows the
+    session TimeZone across DST changes, while the Python expansion uses fixed `timedelta`s.
+    """
+    rule = LessonRecurrence
+    return (
+        func.generate_series(
+            rule.starts_at, rule.last_starts_at, func.make_interval(0, 0, 0, 0, rule.interval_days * 24)
+        )
+        .table_valued(column("starts_at", DateTime(timezone=True)))
+        .render_derived()
+        .lateral(name)
+    )
+
+
+def _with_relations() -> Iterable:
+    return (
+        selectinload(LessonRecurrence.subject),
+        selectinload(LessonRecurrence.room),
+        selectinload(LessonRecurrence.lecturer),
+        selectinload(LessonRecurrence.group).options(
+            joinedload(Group.program),
+            joinedload(Group.program_year),
+            joinedload(Group.specialization),
+            joinedload(Group.group_type),
+        ),
+    )
+
+
+def get_recurrence(db: Session, recurrence_id: int) -> LessonRecurrence:
+    stmt = select(LessonRecurrence).options(*_with_relations()).where(LessonRecurrence.id == recurrence_id)
+    rule = db.scalars(stmt).first()
+    if not rule:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Recurrence not found")
+    return rule
+
+
+async def get_recurrences_async(
+    db: AsyncSession, recurrence_ids: Iterable[int]
+) -> list[LessonRecurrence]:
+    """Existing rules among `recurrence_ids`, with relationships loaded for `expand`."""
+    stmt = (
+        select(LessonRecurrence)
+        .options(*_with_relations())
+        .where(LessonRecurrence.id.in_(list(recurrence_ids)))
+        .order_by(LessonRecurrence.id)
+    )
+    return list((await db.scalars(stmt)).all())
+
+
+def _recurrences_stmt(
+    *,
+    group_id: int | None = None,
+    lecturer_user_id: int | None = None,
+    room_ids: Sequence[int] | None = None,
+    date_from: datetime | None = None,
+    date_to: datetime | None = None,
+    with_relations: bool = True,
+) -> Select:
+    stmt = select(LessonRecurrence)
+    if with_relations:
+        stmt = stmt.options(*_with_relations())
+    if group_id is not None:
+        stmt = stmt.where(LessonRecurrence.group_id == group_id)
+    if lecturer_user_id is not None:
+        stmt = stmt.where(LessonRecurrence.lecturer_user_id == lecturer_user_id)
+    if room_ids is not None:
+        stmt = stmt.where(LessonRecurrence.room_id.in_(room_ids))
+    if date_from is not None:
+        stmt = stmt.where(LessonRecurrence.last_starts_at >= date_from)
+    if date_to is not None:
+        stmt = stmt.where(LessonRecurrence.starts_at <= date_to)
+    return stmt.order_by(LessonRecurrence.id)
+
+
+def _expand_all(
+    rules: Iterable[LessonRecurrence],
+    *,
+    date_from: datetime | None,
+    date_to: datetime | None,
+    after: tuple[datetime, int] | None,
+    limit: int | None,
+) -> list[LessonOccurrence]:
+    occurrences = [
+        occurrence
+        for rule in rules
+        for occurrence in expand(rule, date_from=date_from, date_to=date_to, after=after, limit=limit)
+    ]
+    occurrences.sort(key=sort_key)
+    return occurrences[:limit] if limit is not None else occurrences
+
+
+def list_occurrences(
+    db: Session,
+    *,
+    group_id: int | None = None,
+    lecturer_user_id: int | None = None,
+    date_from: datetime | None = None,
+    date_to: datetime | None = None,
+    after: tuple[datetime, int] | None = None,
+    limit: int | None = None,
+) -> list[LessonOccurrence]:
+    """Expand every matching rule into the occurrences a lesson query with the same filters
+    would return; `after`/`limit` follow the keyset page semantics."""
+    stmt = _recurrences_stmt(
+        group_id=group_id,
+        lecturer_user_id=lecturer_user_id,
+        date_from=_lower_bound(date_from, after),
+        date_to=date_to,
+    )
+    return _expand_all(
+        db.scalars(stmt).all(), date_from=date_from, date_to=date_to, after=after, limit=limit
+    )
+
+
+async def list_occurrences_async(
+    db: AsyncSession,
+    *,
+    group_id: int | None = None,
+    lecturer_user_id: int | None = None,
+    date_from: datetime | None = None,
+    date_to: datetime | None = None,
+    after: tuple[datetime, int] | None = None,
+    limit: int | None = None,
+) -> list[LessonOccurrence]:
+    stmt = _recurrences_stmt(
+        group_id=group_id,
+        lecturer_user_id=lecturer_user_id,
+        date_from=_lower_bound(date_from, after),
+        date_to=date_to,
+    )
+    result = await db.scalars(stmt)
+    return _expand_all(result.all(), date_from=date_from, date_to=date_to, after=after, limit=limit)
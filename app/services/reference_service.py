@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from typing import Any, Iterable, NamedTuple, Sequence
+
+from fastapi import HTTPException, status
+from sqlalchemy import ColumnElement, exists, select
+from sqlalchemy.orm import Session
+
+
+class Reference(NamedTuple):
+    """A foreign key value that must exist, e.g. `Reference("Room", Room.id, room_id)`."""
+
+    label: str
+    column: Any
+    value: Any
+
+
+class Rule(NamedTuple):
+    """A consistency condition between existing references, e.g. a year belonging to a program."""
+
+    detail: str
+    condition: ColumnElement[bool]
+
+
+def check_references(
+    db: Session, references: Iterable[Reference], rules: Sequence[Rule] = ()
+) -> tuple[list[str], list[str]]:
+    """Evaluate every reference and rule in one round trip.
+
+    Returns the labels of missing references and the details of violated rules; references
+    whose value is None are skipped.
+    """
+    present = [reference for reference in references if reference.value is not None]
+    if not present and not rules:
+        return [], []
+    checks = [exists().where(reference.column == reference.value) for reference in present]
+    checks.extend(rule.condition for rule in rules)
+    row = db.execute(select(*checks)).one()
+    missing = [reference.label for reference, found in zip(present, row) if not found]
+    violated = [rule.detail for rule, ok in zip(rules, row[len(present):]) if not ok]
+    return missing, violated
+
+
+def ensure_references(
+    db: Session, references: Iterable[Reference], rules: Sequence[Rule] = ()
+) -> None:
+    """Raise 404 naming every missing reference, else 400 for the first violated rule."""
+    missing, violated = check_references(db, references, rules)
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail=f"{', '.join(missing)} not found"
+        )
+    if violated:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=violated[0])
@@ -2,12 +2,13 @@ from __future__ import annotations
 
 from datetime import datetime, timezone
 
-from fastapi import HTTPException, status
 from sqlalchemy import delete, select
 from sqlalchemy.orm import Session, joinedload
 
 from app.models import Group, StudentGroupSelection, User
+from app.services import reference_service, version_service
 from app.services.audit_service import record_change, serialize_model
+from app.services.reference_service import Reference
 
 
 def list_selections(db: Session, *, user_id: int) -> list[StudentGroupSelection]:
@@ -38,10 +39,9 @@ def list_selected_groups(db: Session, *, user_id: int) -> list[Group]:
 def create_selection(
     db: Session, *, user_id: int, group_id: int, actor_user_id: int
 ) -> StudentGroupSelection:
-    if db.get(Group, group_id) is None:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Group not found")
-    if db.get(User, user_id) is None:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+    reference_service.ensure_references(
+        db, [Reference("Group", Group.id, group_id), Reference("User", User.id, user_id)]
+    )
 
     existing = db.execute(
         select(StudentGroupSelection).where(StudentGroupSelection.user_id == user_id)
@@ -66,6 +66,7 @@ def create_selection(
         old_data=old_snapshot,
         new_data=serialize_model(selection),
     )
+    version_service.queue_invalidation(db, [(version_service.SELECTION, user_id)])
 
     db.commit()
     db.refresh(selection)
@@ -87,4 +88,5 @@ def delete_selection(db: Session, *, user_id: int, actor_user_id: int) -> None:
             old_data=serialize_model(existing),
             new_data=None,
         )
+        version_service.queue_invalidation(db, [(version_service.SELECTION, user_id)])
     db.commit()
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import NamedTuple
+
+from app.core.config import get_settings
+from app.services import version_service
+from app.services.version_service import AUTH_SESSION, USER, InvalidationKey
+
+
+class CachedSession(NamedTuple):
+    user_id: int
+    email: str
+    name: str
+    role: str
+    expires_at: datetime
+    revoked: bool
+
+
+class SessionCache:
+    """Bounded TTL/LRU cache of validated auth sessions keyed by session JTI.
+
+    Entries are only a shortcut for `get_current_actor`; the database stays the source of truth.
+    Revocations and role changes queue `(AUTH_SESSION, jti)` / `(USER, user_id)` invalidations,
+    applied on commit here and in every other worker.
+    """
+
+    def __init__(self, *, max_entries: int, ttl_seconds: float) -> None:
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, tuple[float, CachedSession]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self._max_entries > 0 and self._ttl_seconds > 0
+
+    def get(self, jti: str) -> CachedSession | None:
+        if not self.enabled:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            item = self._entries.get(jti)
+            if item is None:
+                self._misses += 1
+                return None
+            stored_until, entry = item
+            if stored_until <= now:
+                del self._entries[jti]
+                self._misses += 1
+                return None
+            self._entries.move_to_end(jti)
+            self._hits += 1
+            return entry
+
+    def put(self, jti: str, entry: CachedSession) -> None:
+        if not self.enabled:
+            return
+        stored_until = time.monotonic() + self._ttl_seconds
+        with self._lock:
+            self._entries[jti] = (stored_until, entry)
+            self._entries.move_to_end(jti)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def revoke(self, jti: str) -> None:
+        """Keep the entry but flag it revoked so reuse is rejected without a database trip."""
+        with self._lock:
+            item = self._entries.get(jti)
+            if item is not None:
+                stored_until, entry = item
+                self._entries[jti] = (stored_until, entry._replace(revoked=True))
+
+    def invalidate(self, jti: str) -> None:
+        with self._lock:
+            self._entries.pop(jti, None)
+
+    def invalidate_user(self, user_id: int) -> None:
+        with self._lock:
+            stale = [jti for jti, (_, entry) in self._entries.items() if entry.user_id == user_id]
+            for jti in stale:
+                del self._entries[jti]
+
+    def apply_invalidations(self, keys: set[InvalidationKey]) -> None:
+        for key in keys:
+            if key[0] == AUTH_SESSION:
+                self.revoke(key[1])
+            elif key[0] == USER:
+                self.invalidate_user(key[1])
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_entries": self._max_entries,
+                "ttl_seconds": int(self._ttl_seconds),
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+            }
+
+
+_settings = get_settings()
+session_cache = SessionCache(
+    max_entries=_settings.auth_session_cache_size,
+    ttl_seconds=_settings.auth_session_cache_ttl_seconds,
+)
+version_service.add_commit_listener(session_cache.apply_invalidations, reset=session_cache.clear)
@@ -0,0 +1,394 @@
+from __future__ import annotations
+
+import heapq
+from datetime import datetime, time, timedelta, timezone
+from typing import Any, Iterable, Sequence
+
+from fastapi import HTTPException, status
+from sqlalchemy import Select, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models import Lesson, LessonRecurrence, Room
+from app.services import recurrence_service
+
+Interval = tuple[datetime, datetime]
+
+SLOT_STEP = timedelta(minutes=15)
+DEFAULT_DAY_START = time(8, 0)
+DEFAULT_DAY_END = time(20, 0)
+MAX_SEARCH_DAYS = 31
+
+
+def merge_intervals(intervals: Iterable[Interval]) -> list[Interval]:
+    """Sort and coalesce overlapping or touching intervals."""
+    merged: list[Interval] = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def subtract_intervals(free: Sequence[Interval], busy: Sequence[Interval]) -> list[Interval]:
+    """Remove `busy` from `free`; both must be sorted and disjoint (see `merge_intervals`)."""
+    result: list[Interval] = []
+    first = 0
+    for start, end in free:
+        while first < len(busy) and busy[first][1] <= start:
+            first += 1
+        cursor = start
+        index = first
+        while index < len(busy) and busy[index][0] < end:
+            if busy[index][0] > cursor:
+                result.append((cursor, busy[index][0]))
+            cursor = max(cursor, busy[index][1])
+            index += 1
+        if cursor < end:
+            result.append((cursor, end))
+    return result
+
+
+def working_windows(
+    date_from: datetime,
+    date_to: datetime,
+    *,
+    day_start: time = DEFAULT_DAY_START,
+    day_end: time = DEFAULT_DAY_END,
+    include_weekends: bool = False,
+) -> list[Interval]:
+    """Daily [day_start, day_end) windows clipped to [date_from, date_to), in date_from's zone."""
+    tz = date_from.tzinfo or timezone.utc
+    date_from = date_from.replace(tzinfo=tz)
+    date_to = date_to.replace(tzinfo=date_to.tzinfo or tz)
+    windows: list[Interval] = []
+    day = date_from.astimezone(tz).date()
+    last_day = date_to.astimezone(tz).date()
+    while day <= last_day:
+        if include_weekends or day.weekday() < 5:
+            start = max(datetime.combine(day, day_start, tz), date_from)
+            end = min(datetime.combine(day, day_end, tz), date_to)
+            if start < end:
+                windows.append((start, end))
+        day += timedelta(days=1)
+    return windows
+
+
+def _align(value: datetime) -> datetime:
+    """Round up to the next SLOT_STEP boundary counted from local midnight."""
+    offset = value - value.replace(hour=0, minute=0, second=0, microsecond=0)
+    remainder = offset % SLOT_STEP
+    return value + (SLOT_STEP - remainder) if remainder else value
+
+
+def top_slots(
+    start_windows: Iterable[tuple[datetime, datetime, int]],
+    *,
+    duration: timedelta,
+    limit: int,
+    room_order: dict[int, Any] | None = None,
+) -> list[dict[str, Any]]:
+    """Sweep line over per-room start windows `(earliest start, latest start, room_id)`.
+
+    Returns the `limit` earliest non-overlapping slots, each with every room free for it.
+    """
+    windows = sorted(start_windows)
+    active: list[tuple[datetime, int]] = []
+    slots: list[dict[str, Any]] = []
+    index = 0
+    current: datetime | None = None
+    while len(slots) < limit:
+        if not active:
+            if index == len(windows):
+                break
+            earliest = _align(windows[index][0])
+            current = earliest if current is None else max(current, earliest)
+        while index < len(windows) and windows[index][0] <= current:
+            latest, room_id = windows[index][1], windows[index][2]
+            heapq.heappush(active, (latest, room_id))
+            index += 1
+        while active and active[0][0] < current:
+            heapq.heappop(active)
+        if not active:
+            continue
+        room_ids = sorted({room_id for _, room_id in active})
+        if room_order:
+            room_ids.sort(key=lambda room_id: room_order[room_id])
+        slots.append({"starts_at": current, "ends_at": current + duration, "room_ids": room_ids})
+        current = _align(current + duration)
+    return slots
+
+
+def _overlaps(date_from: datetime, date_to: datetime):
+    # Same shape as the ex_lessons_*_overlap exclusion constraints, so their GiST indexes apply.
+    return (
+        func.tstzrange(Lesson.starts_at, Lesson.ends_at).op("&&")(func.tstzrange(date_from, date_to)),
+        Lesson.status != "cancelled",
+    )
+
+
+def _busy_stmt(
+    column, value: int, *, date_from: datetime, date_to: datetime, exclude_lesson_id: int | None
+) -> Select:
+    stmt = select(Lesson.starts_at, Lesson.ends_at).where(column == value, *_overlaps(date_from, date_to))
+    if exclude_lesson_id is not None:
+        stmt = stmt.where(Lesson.id != exclude_lesson_id)
+    return stmt
+
+
+def _rooms_stmt(*, min_capacity: int | None, building: str | None) -> Select:
+    stmt = select(Room.id, Room.capacity)
+    if min_capacity is not None:
+        stmt = stmt.where(Room.capacity >= min_capacity)
+    if building is not None:
+        stmt = stmt.where(Room.building == building)
+    return stmt
+
+
+def _room_busy_stmt(
+    *,
+    date_from: datetime,
+    date_to: datetime,
+    min_capacity: int | None,
+    building: str | None,
+    exclude_lesson_id: int | None,
+) -> Select:
+    rooms = _rooms_stmt(min_capacity=min_capacity, building=building).subquery()
+    stmt = (
+        select(Lesson.room_id, Lesson.starts_at, Lesson.ends_at)
+        .join(rooms, rooms.c.id == Lesson.room_id)
+        .where(*_overlaps(date_from, date_to))
+    )
+    if exclude_lesson_id is not None:
+        stmt = stmt.where(Lesson.id != exclude_lesson_id)
+    return stmt
+
+
+def _recurrences_stmt(
+    *,
+    lecturer_user_id: int,
+    group_id: int,
+    date_from: datetime,
+    date_to: datetime,
+    min_capacity: int | None,
+    building: str | None,
+) -> Select:
+    rooms = _rooms_stmt(min_capacity=min_capacity, building=building).with_only_columns(Room.id)
+    return select(LessonRecurrence).where(
+        (LessonRecurrence.lecturer_user_id == lecturer_user_id)
+        | (LessonRecurrence.group_id == group_id)
+        | LessonRecurrence.room_id.in_(rooms.scalar_subquery()),
+        LessonRecurrence.status != "cancelled",
+        LessonRecurrence.starts_at < date_to,
+        LessonRecurrence.last_starts_at + (LessonRecurrence.ends_at - LessonRecurrence.starts_at)
+        > date_from,
+    )
+
+
+def _add_recurrence_busy(
+    rules: Iterable[LessonRecurrence],
+    *,
+    lecturer_user_id: int,
+    group_id: int,
+    date_from: datetime,
+    date_to: datetime,
+    lecturer_busy: list[Interval],
+    group_busy: list[Interval],
+    room_busy: list[tuple[int, datetime, datetime]],
+) -> None:
+    """Add the rule occurrences overlapping the window to the busy lists they block."""
+    for rule in rules:
+        intervals = recurrence_service.occurrence_intervals(rule, date_from=date_from, date_to=date_to)
+        if rule.lecturer_user_id == lecturer_user_id:
+            lecturer_busy.extend(intervals)
+        if rule.group_id == group_id:
+            group_busy.extend(intervals)
+        room_busy.extend((rule.room_id, starts_at, ends_at) for starts_at, ends_at in intervals)
+
+
+def _validate_search(date_from: datetime, date_to: datetime, duration: timedelta) -> None:
+    if date_to <= date_from:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="date_to must be after date_from"
+        )
+    if date_to - date_from > timedelta(days=MAX_SEARCH_DAYS):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Search range must not exceed {MAX_SEARCH_DAYS} days",
+        )
+    if duration <= timedelta(0):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="duration must be positive"
+        )
+
+
+def _statements(
+    *,
+    lecturer_user_id: int,
+    group_id: int,
+    date_from: datetime,
+    date_to: datetime,
+    min_capacity: int | None,
+    building: str | None,
+    exclude_lesson_id: int | None,
+) -> tuple[Select, Select, Select, Select, Select]:
+    window = {"date_from": date_from, "date_to": date_to, "exclude_lesson_id": exclude_lesson_id}
+    return (
+        _busy_stmt(Lesson.lecturer_user_id, lecturer_user_id, **window),
+        _busy_stmt(Lesson.group_id, group_id, **window),
+        _rooms_stmt(min_capacity=min_capacity, building=building),
+        _room_busy_stmt(min_capacity=min_capacity, building=building, **window),
+        _recurrences_stmt(
+            lecturer_user_id=lecturer_user_id,
+            group_id=group_id,
+            date_from=date_from,
+            date_to=date_to,
+            min_capacity=min_capacity,
+            building=building,
+        ),
+    )
+
+
+def _compute_slots(
+    lecturer_busy: list[Interval],
+    group_busy: list[Interval],
+    rooms: Iterable[tuple[int, int]],
+    room_busy: list[tuple[int, datetime, datetime]],
+    rules: Iterable[LessonRecurrence],
+    *,
+    lecturer_user_id: int,
+    group_id: int,
+    date_from: datetime,
+    date_to: datetime,
+    duration: timedelta,
+    limit: int,
+    day_start: time,
+    day_end: time,
+    include_weekends: bool,
+) -> list[dict[str, Any]]:
+    _add_recurrence_busy(
+        rules,
+        lecturer_user_id=lecturer_user_id,
+        group_id=group_id,
+        date_from=date_from,
+        date_to=date_to,
+        lecturer_busy=lecturer_busy,
+        group_busy=group_busy,
+        room_busy=room_busy,
+    )
+    windows = working_windows(
+        date_from, date_to, day_start=day_start, day_end=day_end, include_weekends=include_weekends
+    )
+    people_free = subtract_intervals(windows, merge_intervals([*lecturer_busy, *group_busy]))
+    if not people_free:
+        return []
+
+    capacity = dict(rooms)
+    busy_by_room: dict[int, list[Interval]] = {room_id: [] for room_id in capacity}
+    for room_id, starts_at, ends_at in room_busy:
+        if room_id in busy_by_room:
+            busy_by_room[room_id].append((starts_at, ends_at))
+
+    start_windows: list[tuple[datetime, datetime, int]] = []
+    for room_id, busy in busy_by_room.items():
+        for start, end in subtract_intervals(people_free, merge_intervals(busy)):
+            if end - start >= duration:
+                start_windows.append((start, end - duration, room_id))
+    # Smallest room that fits first, so large halls stay available.
+    return top_slots(
+        start_windows,
+        duration=duration,
+        limit=limit,
+        room_order={room_id: (seats, room_id) for room_id, seats in capacity.items()},
+    )
+
+
+def find_free_slots(
+    db: Session,
+    *,
+    lecturer_user_id: int,
+    group_id: int,
+    date_from: datetime,
+    date_to: datetime,
+    duration: timedelta,
+    limit: int = 5,
+    min_capacity: int | None = None,
+    building: str | None = None,
+    exclude_lesson_id: int | None = None,
+    day_start: time = DEFAULT_DAY_START,
+    day_end: time = DEFAULT_DAY_END,
+    include_weekends: bool = False,
+) -> list[dict[str, Any]]:
+    """Earliest slots where the lecturer, the group and at least one suitable room are all free."""
+    _validate_search(date_from, date_to, duration)
+    lecturer_stmt, group_stmt, rooms_stmt, room_busy_stmt, rules_stmt = _statements(
+        lecturer_user_id=lecturer_user_id,
+        group_id=group_id,
+        date_from=date_from,
+        date_to=date_to,
+        min_capacity=min_capacity,
+        building=building,
+        exclude_lesson_id=exclude_lesson_id,
+    )
+    return _compute_slots(
+        list(db.execute(lecturer_stmt).tuples().all()),
+        list(db.execute(group_stmt).tuples().all()),
+        db.execute(rooms_stmt).tuples().all(),
+        list(db.execute(room_busy_stmt).tuples().all()),
+        db.scalars(rules_stmt).all(),
+        lecturer_user_id=lecturer_user_id,
+        group_id=group_id,
+        date_from=date_from,
+        date_to=date_to,
+        duration=duration,
+        limit=limit,
+        day_start=day_start,
+        day_end=day_end,
+        include_weekends=include_weekends,
+    )
+
+
+async def find_free_slots_async(
+    db: AsyncSession,
+    *,
+    lecturer_user_id: int,
+    group_id: int,
+    date_from: datetime,
+    date_to: datetime,
+    duration: timedelta,
+    limit: int = 5,
+    min_capacity: int | None = None,
+    building: str | None = None,
+    exclude_lesson_id: int | None = None,
+    day_start: time = DEFAULT_DAY_START,
+    day_end: time = DEFAULT_DAY_END,
+    include_weekends: bool = False,
+) -> list[dict[str, Any]]:
+    _validate_search(date_from, date_to, duration)
+    lecturer_stmt, group_stmt, rooms_stmt, room_busy_stmt, rules_stmt = _statements(
+        lecturer_user_id=lecturer_user_id,
+        group_id=group_id,
+        date_from=date_from,
+        date_to=date_to,
+        min_capacity=min_capacity,
+        building=building,
+        exclude_lesson_id=exclude_lesson_id,
+    )
+    return _compute_slots(
+        list((await db.execute(lecturer_stmt)).tuples().all()),
+        list((await db.execute(group_stmt)).tuples().all()),
+        (await db.execute(rooms_stmt)).tuples().all(),
+        list((await db.execute(room_busy_stmt)).tuples().all()),
+        (await db.scalars(rules_stmt)).all(),
+        lecturer_user_id=lecturer_user_id,
+        group_id=group_id,
+        date_from=date_from,
+        date_to=date_to,
+        duration=duration,
+        limit=limit,
+        day_start=day_start,
+        day_end=day_end,
+        include_weekends=include_weekends,
+    )
@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import sys
+import threading
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict, defaultdict
+from datetime import date, datetime, timedelta
+from typing import Any, Iterable, NamedTuple
+
+from app.core.config import get_settings
+from app.services import version_service
+from app.services.version_service import (
+    CATALOG_KEY,
+    GROUP_WEEK,
+    ROOM,
+    SUBJECT,
+    USER_NAME,
+    InvalidationKey,
+)
+
+WeekKey = tuple[int, date]
+
+# Longer ranges are served by the regular query path instead of assembling many weeks.
+MAX_CACHED_WEEKS = 6
+
+# Per-lesson bookkeeping on top of the JSON bytes (datetime, list slots, bytes header).
+_ENTRY_OVERHEAD = 256
+_LESSON_OVERHEAD = sys.getsizeof(b"") + 64
+
+
+class WeekTimetable(NamedTuple):
+    """One group's lessons of one ISO week, each pre-serialized as a `Lesson` JSON object."""
+
+    starts: list[datetime]
+    chunks: list[bytes]
+    room_ids: frozenset[int]
+    subject_ids: frozenset[int]
+    lecturer_ids: frozenset[int]
+    size: int
+
+
+def build_week(lessons: Iterable[Any], encode) -> WeekTimetable:
+    """`lessons` in (starts_at, id) order; `encode` renders one lesson as JSON bytes."""
+    starts: list[datetime] = []
+    chunks: list[bytes] = []
+    room_ids: set[int] = set()
+    subject_ids: set[int] = set()
+    lecturer_ids: set[int] = set()
+    for lesson in lessons:
+        starts.append(lesson.starts_at)
+        chunks.append(encode(lesson))
+        room_ids.add(lesson.room_id)
+        subject_ids.add(lesson.subject_id)
+        lecturer_ids.add(lesson.lecturer_user_id)
+    size = _ENTRY_OVERHEAD + sum(len(chunk) + _LESSON_OVERHEAD for chunk in chunks)
+    return WeekTimetable(
+        starts, chunks, frozenset(room_ids), frozenset(subject_ids), frozenset(lecturer_ids), size
+    )
+
+
+class TimetableCache:
+    """Process-local LRU of serialized (group_id, week) timetables, capped by size in bytes.
+
+    Invalidation is precise: a lesson write drops the (group, week) entries of its before/after
+    snapshots, and a room, subject or lecturer rename drops only the entries that embed it
+    (tracked in reverse indexes). Other catalog changes (groups, programs) clear everything.
+    Loads that overlap an invalidation are not cached.
+    """
+
+    def __init__(self, *, max_bytes: int) -> None:
+        self._max_bytes = max_bytes
+        self._entries: OrderedDict[WeekKey, WeekTimetable] = OrderedDict()
+        self._by_room: defaultdict[int, set[WeekKey]] = defaultdict(set)
+        self._by_subject: defaultdict[int, set[WeekKey]] = defaultdict(set)
+        self._by_lecturer: defaultdict[int, set[WeekKey]] = defaultdict(set)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self._max_bytes > 0
+
+    @property
+    def generation(self) -> int:
+        with self._lock:
+            return self._generation
+
+    def get(self, key: WeekKey) -> WeekTimetable | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry
+
+    def put(self, key: WeekKey, entry: WeekTimetable, *, generation: int) -> None:
+        """Store `entry` unless an invalidation happened since `generation` was read."""
+        if not self.enabled or entry.size > self._max_bytes:
+            return
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._discard(key)
+            self._entries[key] = entry
+            self._bytes += entry.size
+            for room_id in entry.room_ids:
+                self._by_room[room_id].add(key)
+            for subject_id in entry.subject_ids:
+                self._by_subject[subject_id].add(key)
+            for lecturer_id in entry.lecturer_ids:
+                self._by_lecturer[lecturer_id].add(key)
+            while self._bytes > self._max_bytes:
+                oldest = next(iter(self._entries))
+                self._discard(oldest)
+                self._evictions += 1
+
+    def _discard(self, key: WeekKey) -> None:
+        """Caller holds the lock."""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self._bytes -= entry.size
+        for index, ids in (
+            (self._by_room, entry.room_ids),
+            (self._by_subject, entry.subject_ids),
+            (self._by_lecturer, entry.lecturer_ids),
+        ):
+            for entity_id in ids:
+                keys = index.get(entity_id)
+                if keys is not None:
+                    keys.discard(key)
+                    if not keys:
+                        del index[entity_id]
+
+    def invalidate(self, keys: set[InvalidationKey]) -> None:
+        with self._lock:
+            self._generation += 1
+            if CATALOG_KEY in keys:
+                self._invalidations += len(self._entries)
+                self._entries.clear()
+                self._by_room.clear()
+                self._by_subject.clear()
+                self._by_lecturer.clear()
+                self._bytes = 0
+                return
+            stale: set[WeekKey] = set()
+            for key in keys:
+                if key[0] == GROUP_WEEK:
+                    stale.add((key[1], date.fromordinal(key[2])))
+                elif key[0] == ROOM:
+                    stale.update(self._by_room.get(key[1], ()))
+                elif key[0] == SUBJECT:
+                    stale.update(self._by_subject.get(key[1], ()))
+                elif key[0] == USER_NAME:
+                    stale.update(self._by_lecturer.get(key[1], ()))
+            for key in stale:
+                if key in self._entries:
+                    self._invalidations += 1
+                    self._discard(key)
+
+    def clear(self) -> None:
+        self.invalidate({CATALOG_KEY})
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "size": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self._max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0,
+                "evictions": self._evictions,
+                "invalidations": self._invalidations,
+            }
+
+
+def covers(date_from: datetime | None, date_to: datetime | None) -> bool:
+    """Whether a group-scoped `GET /lessons` range can be assembled from cached weeks."""
+    if not timetable_cache.enabled or date_from is None or date_to is None:
+        return False
+    if date_from.tzinfo is None or date_to.tzinfo is None or date_to < date_from:
+        return False
+    return len(weeks_between(date_from, date_to)) <= MAX_CACHED_WEEKS
+
+
+def weeks_between(date_from: datetime, date_to: datetime) -> list[date]:
+    """Mondays of every ISO week overlapping [date_from, date_to]."""
+    first = version_service.week_start(date_from)
+    last = version_service.week_start(date_to)
+    return [first + timedelta(weeks=index) for index in range((last - first).days // 7 + 1)]
+
+
+def slice_week(entry: WeekTimetable, date_from: datetime, date_to: datetime) -> list[bytes]:
+    """Chunks of the lessons starting within [date_from, date_to] (the `GET /lessons` filters)."""
+    return entry.chunks[bisect_left(entry.starts, date_from) : bisect_right(entry.starts, date_to)]
+
+
+timetable_cache = TimetableCache(max_bytes=get_settings().timetable_cache_max_bytes)
+version_service.add_commit_listener(timetable_cache.invalidate, reset=timetable_cache.clear)
@@ -5,6 +5,7 @@ from sqlalchemy import select
 from sqlalchemy.orm import Session, joinedload
 
 from app.models import Role, User
+from app.services import version_service
 from app.services.audit_service import record_change, serialize_model
 
 
@@ -87,6 +88,7 @@ def set_user_role(db: Session, user_id: int, target_role_id: int, *, actor_user_
         old_data=before,
         new_data=serialize_model(user),
     )
+    version_service.queue_invalidation(db, [(version_service.USER, user.id)])
     db.commit()
     db.refresh(user)
     return get_user_profile(db, user.id)
@@ -0,0 +1,273 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Callable, Iterable, NamedTuple
+
+from sqlalchemy import event, func, select, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.models import TimetableVersion
+
+GROUP = "group"
+LECTURER = "lecturer"
+CATALOG = "catalog"
+# Subjects, rooms, programs and groups are embedded in every lesson payload, so any change to
+# them invalidates all timetable ETags through this single global row. A lecturer's name only
+# bumps that lecturer's and their groups' versions.
+CATALOG_KEY = (CATALOG, 0)
+# Invalidation-only scopes (not stored in timetable_versions) for in-process caches: a student's
+# selection, a user's cached auth sessions, one revoked session (by JTI), one renamed
+# room/subject/user, and one (group, ISO week) of lessons.
+SELECTION = "selection"
+USER = "user"
+AUTH_SESSION = "auth_session"
+ROOM = "room"
+SUBJECT = "subject"
+USER_NAME = "user_name"
+GROUP_WEEK = "group_week"
+# Keys in these scopes mean catalog data embedded in lesson payloads changed.
+CATALOG_SCOPES = frozenset({CATALOG, ROOM, SUBJECT})
+
+VersionKey = tuple[str, int]
+# A VersionKey, (ROOM|SUBJECT|USER_NAME|SELECTION|USER, id), (AUTH_SESSION, jti) or
+# (GROUP_WEEK, group_id, week ordinal).
+InvalidationKey = tuple[Any, ...]
+
+# Committed invalidations are also published here so other workers/replicas drop their caches.
+INVALIDATION_CHANNEL = "cache_invalidation"
+# Identifies this process's own notifications, which it has already applied on commit.
+PROCESS_ID = uuid.uuid4().hex
+# pg_notify payloads must stay below 8000 bytes; larger batches ask listeners to reset everything.
+_MAX_PAYLOAD_BYTES = 7900
+
+_PENDING_INVALIDATIONS = "pending_invalidations"
+_commit_listeners: list[Callable[[set[InvalidationKey]], None]] = []
+_reset_listeners: list[Callable[[], None]] = []
+
+
+class VersionStamp(NamedTuple):
+    version: int
+    updated_at: datetime | None
+
+
+def lesson_version_keys(*snapshots: dict[str, Any] | None) -> set[VersionKey]:
+    """Group and lecturer scopes touched by the given lesson snapshots (before and/or after)."""
+    keys: set[VersionKey] = set()
+    for snapshot in snapshots:
+        if not snapshot:
+            continue
+        if snapshot.get("group_id"):
+            keys.add((GROUP, int(snapshot["group_id"])))
+        if snapshot.get("lecturer_user_id"):
+            keys.add((LECTURER, int(snapshot["lecturer_user_id"])))
+    return keys
+
+
+def _as_datetime(value: Any) -> datetime:
+    return datetime.fromisoformat(value) if isinstance(value, str) else value
+
+
+def week_start(value: datetime) -> date:
+    """Monday (UTC) of the ISO week containing `value`."""
+    day = value.astimezone(timezone.utc).date()
+    return day - timedelta(days=day.weekday())
+
+
+def group_week_keys(*snapshots: dict[str, Any] | None) -> set[InvalidationKey]:
+    """(GROUP_WEEK, group_id, week) keys touched by lesson snapshots; recurrence rule snapshots
+    (with `interval_days`/`last_starts_at`) cover the week of every occurrence."""
+    keys: set[InvalidationKey] = set()
+    for snapshot in snapshots:
+        if not snapshot or not snapshot.get("group_id") or not snapshot.get("starts_at"):
+            continue
+        group_id = int(snapshot["group_id"])
+        starts_at = _as_datetime(snapshot["starts_at"])
+        last = _as_datetime(snapshot.get("last_starts_at") or starts_at)
+        step = timedelta(days=int(snapshot.get("interval_days") or 1))
+        while starts_at <= last:
+            keys.add((GROUP_WEEK, group_id, week_start(starts_at).toordinal()))
+            starts_at += step
+    return keys
+
+
+def bump_versions(
+    db: Session,
+    keys: Iterable[VersionKey],
+    *,
+    invalidate: Iterable[InvalidationKey] | None = None,
+) -> None:
+    """Increment the given versions inside the caller's transaction (committed with the change).
+
+    Keys are upserted in a stable order so concurrent writers lock rows consistently. In-process
+    caches are told about `invalidate` on commit (default: the bumped keys themselves).
+    """
+    ordered = sorted(set(keys))
+    if not ordered:
+        return
+    stmt = insert(TimetableVersion).values(
+        [{"scope": scope, "entity_id": entity_id} for scope, entity_id in ordered]
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[TimetableVersion.scope, TimetableVersion.entity_id],
+        set_={"version": TimetableVersion.version + 1, "updated_at": func.now()},
+    )
+    db.execute(stmt)
+    queue_invalidation(db, ordered if invalidate is None else invalidate)
+
+
+def add_commit_listener(
+    listener: Callable[[set[InvalidationKey]], None], *, reset: Callable[[], None] | None = None
+) -> None:
+    """Call `listener` with the keys invalidated by each committed transaction, in this process
+    or (through the invalidation bus) any other. `reset` drops everything, for when
+    notifications may have been missed."""
+    _commit_listeners.append(listener)
+    if reset is not None:
+        _reset_listeners.append(reset)
+
+
+def queue_invalidation(db: Session, keys: Iterable[InvalidationKey]) -> None:
+    """Remember keys whose in-process caches must be dropped once this transaction commits.
+
+    Dropping them earlier would let a concurrent reader re-cache the pre-commit state.
+    """
+    db.info.setdefault(_PENDING_INVALIDATIONS, set()).update(keys)
+
+
+def apply_invalidations(keys: set[InvalidationKey]) -> None:
+    for listener in _commit_listeners:
+        listener(keys)
+
+
+def reset_caches() -> None:
+    for reset in _reset_listeners:
+        reset()
+
+
+def encode_invalidations(keys: Iterable[InvalidationKey]) -> str:
+    payload = json.dumps(
+        {"origin": PROCESS_ID, "keys": sorted(list(key) for key in keys)}, separators=(",", ":")
+    )
+    if len(payload.encode("utf-8")) > _MAX_PAYLOAD_BYTES:
+        return json.dumps({"origin": PROCESS_ID, "reset": True}, separators=(",", ":"))
+    return payload
+
+
+def decode_invalidations(payload: str) -> tuple[str | None, set[InvalidationKey] | None]:
+    """(origin, keys) of a bus message; keys are None when the receiver must reset everything."""
+    try:
+        message = json.loads(payload)
+        if message.get("reset"):
+            return message.get("origin"), None
+        return message.get("origin"), {tuple(key) for key in message["keys"]}
+    except (ValueError, TypeError, KeyError, AttributeError):
+        return None, None
+
+
+@event.listens_for(Session, "before_commit")
+def _publish_invalidations(session: Session) -> None:
+    # NOTIFY is transactional: it is delivered on commit and dropped on rollback.
+    keys = session.info.get(_PENDING_INVALIDATIONS)
+    if not keys or not get_settings().cache_invalidation_bus:
+        return
+    session.execute(select(func.pg_notify(INVALIDATION_CHANNEL, encode_invalidations(keys))))
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_invalidations(session: Session) -> None:
+    keys = session.info.pop(_PENDING_INVALIDATIONS, None)
+    if keys:
+        apply_invalidations(keys)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_invalidations(session: Session) -> None:
+    session.info.pop(_PENDING_INVALIDATIONS, None)
+
+
+def bump_lesson_versions(db: Session, *snapshots: dict[str, Any] | None) -> None:
+    bump_versions(db, lesson_version_keys(*snapshots))
+    queue_invalidation(db, group_week_keys(*snapshots))
+
+
+def bump_catalog_version(db: Session, *entities: InvalidationKey) -> None:
+    """Bump the global catalog version (so every timetable ETag changes).
+
+    `entities` such as `(ROOM, room_id)` narrow what in-process caches drop; without them a
+    catalog change drops everything derived from catalog data.
+    """
+    bump_versions(db, [CATALOG_KEY], invalidate=entities or None)
+
+
+async def get_version_stamps_async(
+    db: AsyncSession, keys: Iterable[VersionKey]
+) -> dict[VersionKey, VersionStamp]:
+    """Current versions and their last bump times; scopes never written so far are (0, None)."""
+    wanted = sorted(set(keys))
+    stmt = select(
+        TimetableVersion.scope,
+        TimetableVersion.entity_id,
+        TimetableVersion.version,
+        TimetableVersion.updated_at,
+    ).where(tuple_(TimetableVersion.scope, TimetableVersion.entity_id).in_(wanted))
+    rows = (await db.execute(stmt)).all()
+    stamps = {key: VersionStamp(0, None) for key in wanted}
+    stamps.update(
+        {(row.scope, row.entity_id): VersionStamp(row.version, row.updated_at) for row in rows}
+    )
+    return stamps
+
+
+async def get_versions_async(db: AsyncSession, keys: Iterable[VersionKey]) -> dict[VersionKey, int]:
+    """Current versions for the given keys; scopes never written so far are reported as 0."""
+    stamps = await get_version_stamps_async(db, keys)
+    return {key: stamp.version for key, stamp in stamps.items()}
+
+
+async def timetable_etag_async(
+    db: AsyncSession,
+    *,
+    group_id: int | None = None,
+    lecturer_user_id: int | None = None,
+    **params: Any,
+) -> str | None:
+    """Strong ETag for a lesson query scoped to a group and/or lecturer, or None if unscoped.
+
+    Read the versions *before* running the lesson query: a concurrent write can then only make
+    the body newer than its ETag, which costs the client one extra download but never a stale 304.
+    """
+    keys = [CATALOG_KEY]
+    if group_id is not None:
+        keys.append((GROUP, group_id))
+    if lecturer_user_id is not None:
+        keys.append((LECTURER, lecturer_user_id))
+    if len(keys) == 1:
+        return None
+    versions = await get_versions_async(db, keys)
+    raw = json.dumps(
+        {
+            "versions": sorted([scope, entity_id, version] for (scope, entity_id), version in versions.items()),
+            "group_id": group_id,
+            "lecturer_user_id": lecturer_user_id,
+            "params": params,
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return '"' + hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """If-None-Match uses the weak comparison function, so a `W/` prefix is ignored."""
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return any(
+        candidate == "*" or candidate.removeprefix("W/") == etag for candidate in candidates
+    )